@@ -0,0 +1,106 @@
+"""
+Block apply and undo throughput for both chain states, vs. per-output adds.
+
+    uv run python benchmarks/bench_chain_apply.py --blocks 200 --txs 50
+
+Txs carry random keys and key images but no proofs: apply_block trusts its
+caller to have verified them, so only state updates are timed.
+"""
+
+import argparse
+import random
+import time
+
+from common import setup
+from fcmp.chain import ChainState as FcmpChain
+from fcmp.tx import Tx as FTx, TxIn as FTxIn, TxOut as FTxOut
+from fcmp.verify import add_utxo as fcmp_add_utxo, live_tree
+from monero.chain import ChainState as RingChain
+from monero.transaction import Tx as MTx, TxIn as MTxIn, TxOut as MTxOut
+from monero.utxo import UTXO, add_utxo, clear_utxos
+
+
+def ring_blocks(rng, blocks, txs, outs):
+    def tx():
+        ins = [MTxIn([], [], rng.getrandbits(250), None, 0, None)]
+        keys = [(rng.getrandbits(250), rng.getrandbits(250)) for _ in range(outs)]
+        return MTx(ins, [MTxOut(P, C, None) for P, C in keys], 0, b"")
+
+    return [[tx() for _ in range(txs)] for _ in range(blocks)]
+
+
+def fcmp_blocks(rng, blocks, txs, outs):
+    def tx():
+        ins = [FTxIn(0, rng.getrandbits(250), 0, 0, None, None)]
+        keys = [(rng.getrandbits(250), rng.getrandbits(250)) for _ in range(outs)]
+        return FTx(ins, [FTxOut(P, C, None) for P, C in keys], 0, b"")
+
+    return [[tx() for _ in range(txs)] for _ in range(blocks)]
+
+
+def report(name, n_txs, t_naive, t_apply, t_undo, depth):
+    print(
+        f"{name:>6}: per-output {n_txs / t_naive:>9,.0f} tx/s   "
+        f"apply_block {n_txs / t_apply:>9,.0f} tx/s   "
+        f"undo depth {depth}: {t_undo * 1e3:.1f}ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--blocks", type=int, default=200)
+    ap.add_argument("--txs", type=int, default=50, help="txs per block")
+    ap.add_argument("--outs", type=int, default=2, help="outputs per tx")
+    ap.add_argument("--depth", type=int, default=10, help="reorg depth to undo")
+    args = ap.parse_args()
+
+    pp = setup()
+    rng = random.Random(1)
+    n_txs = args.blocks * args.txs
+
+    # Ring chain: one add_utxo / spent.add per output and image, as main did
+    blocks = ring_blocks(rng, args.blocks, args.txs, args.outs)
+    clear_utxos()
+    spent = set()
+    t0 = time.perf_counter()
+    for block in blocks:
+        for tx in block:
+            spent.update(tin.I for tin in tx.ins)
+            for o in tx.outs:
+                add_utxo(UTXO(P=o.P, C=o.C, v=0, r=0, sk=0))
+    t_naive = time.perf_counter() - t0
+
+    clear_utxos()
+    chain = RingChain(max_undo=args.depth)
+    t0 = time.perf_counter()
+    for block in blocks:
+        chain.apply_block(block)
+    t_apply = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    chain.undo_blocks(args.depth)
+    report("ring", n_txs, t_naive, t_apply, time.perf_counter() - t0, args.depth)
+
+    # FCMP chain: the live tree is extended per output vs. once per block
+    blocks = fcmp_blocks(rng, args.blocks, args.txs, args.outs)
+    live_tree(pp)
+    spent = set()
+    t0 = time.perf_counter()
+    for block in blocks:
+        for tx in block:
+            spent.update(txin.I for txin in tx.inputs)
+            for o in tx.outputs:
+                fcmp_add_utxo(pp, o.P, o.C)
+    t_naive = time.perf_counter() - t0
+
+    chain = FcmpChain(pp, max_undo=args.depth)
+    t0 = time.perf_counter()
+    for block in blocks:
+        chain.apply_block(block)
+    t_apply = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    chain.undo_blocks(args.depth)
+    report("fcmp", n_txs, t_naive, t_apply, time.perf_counter() - t0, args.depth)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Decoy sampling throughput over a large output set.
+
+    uv run python benchmarks/bench_decoys.py --outputs 10000000 --ring-size 16
+"""
+
+import argparse
+import random
+import time
+
+from monero.decoys import DecoySelector
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--outputs", type=int, default=10_000_000)
+    ap.add_argument("--mean-per-block", type=int, default=40)
+    ap.add_argument("--ring-size", type=int, default=16)
+    ap.add_argument("--rings", type=int, default=10_000)
+    args = ap.parse_args()
+
+    # Skewed block sizes: most blocks small, a few very full
+    rng = random.Random(1)
+    sel = DecoySelector(rng=random.Random(2))
+    t0 = time.perf_counter()
+    while len(sel) < args.outputs:
+        sel.new_block()
+        k = int(rng.expovariate(1 / args.mean_per_block))
+        sel.add_output(min(k, args.outputs - len(sel)))
+    t_index = time.perf_counter() - t0
+    print(f"{len(sel)} outputs in {sel.height} blocks, index built in {t_index:.2f}s")
+
+    reals = [rng.randrange(len(sel)) for _ in range(args.rings)]
+    t0 = time.perf_counter()
+    rings = sel.sample_rings(reals, args.ring_size)
+    dt = time.perf_counter() - t0
+    draws = sum(len(r) - 1 for r in rings)
+    print(
+        f"{args.rings} rings of {args.ring_size}: {dt:.2f}s, "
+        f"{args.rings / dt:,.0f} rings/s, {draws / dt:,.0f} decoys/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Per-output memory of the fcmp UTXO columns: three lists of ints (before)
+vs. three 32-byte-per-entry Columns (after).
+
+    uv run python benchmarks/bench_fcmp_columns.py --sizes 1000000 10000000 50000000
+
+The list layout is only measured up to --list-max outputs (default 1M) and
+extrapolated beyond that, since it grows linearly and does not fit in RAM at
+the larger sizes.
+"""
+
+import argparse
+import secrets
+import time
+import tracemalloc
+
+from fcmp.columns import Column
+
+
+def measure(fn) -> tuple[int, float]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    keep = fn()
+    elapsed = time.perf_counter() - t0
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return used, elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000_000])
+    ap.add_argument("--list-max", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    q = (1 << 255) - 19
+    pool = [secrets.randbelow(q) for _ in range(4096)]
+
+    def as_lists(n: int):
+        # Fresh int objects, as add_utxo would create
+        return [[pool[i & 4095] + i for i in range(n)] for _ in range(3)]
+
+    def as_columns(n: int):
+        cols = [Column() for _ in range(3)]
+        for col in cols:
+            for i in range(n):
+                col.append(pool[i & 4095] + i)
+        return cols
+
+    print(f"{'outputs':>10} {'lists B/out':>12} {'columns B/out':>14} {'col append s':>13}")
+    for n in args.sizes:
+        m = min(n, args.list_max)
+        list_bytes, _ = measure(lambda: as_lists(m))
+        col_bytes, t_col = measure(lambda: as_columns(n))
+        print(f"{n:>10} {list_bytes / m:>12.1f} {col_bytes / n:>14.1f} {t_col:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+KeyImageStore bulk insert and lookup at large sizes, compared with a set[int].
+
+    uv run python benchmarks/bench_keyimages.py --images 10000000
+"""
+
+import argparse
+import os
+import secrets
+import tempfile
+import time
+import tracemalloc
+
+from common.keyimages import KeyImageStore
+
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, n)) for n in os.listdir(path))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--images", type=int, default=1_000_000)
+    ap.add_argument("--batch", type=int, default=1_000_000)
+    ap.add_argument("--lookups", type=int, default=100_000)
+    args = ap.parse_args()
+
+    q = (1 << 255) - 19
+    n = args.images
+
+    tracemalloc.start()
+    baseline = set()
+    for _ in range(min(n, 1_000_000)):
+        baseline.add(secrets.randbelow(q))
+    set_bytes = tracemalloc.get_traced_memory()[0] / len(baseline)
+    tracemalloc.stop()
+    del baseline
+
+    with tempfile.TemporaryDirectory() as d:
+        store = KeyImageStore(d, memtable_limit=args.batch, bloom_capacity=2 * n)
+        spent = []
+        t0 = time.perf_counter()
+        done = 0
+        while done < n:
+            batch = [secrets.randbelow(q) for _ in range(min(args.batch, n - done))]
+            store.update(batch)
+            spent.extend(batch[:: max(1, n // args.lookups)])
+            done += len(batch)
+        store.flush()
+        t_insert = time.perf_counter() - t0
+
+        fresh = [secrets.randbelow(q) for _ in range(args.lookups)]
+        t0 = time.perf_counter()
+        hits_fresh = sum(I in store for I in fresh)
+        t_fresh = time.perf_counter() - t0
+
+        spent = spent[: args.lookups]
+        t0 = time.perf_counter()
+        hits_spent = sum(I in store for I in spent)
+        t_spent = time.perf_counter() - t0
+        assert hits_spent == len(spent)
+
+        print(f"images            {len(store):>12}")
+        print(f"insert            {n / t_insert:>12.0f} images/s")
+        print(f"fresh lookup      {t_fresh / len(fresh) * 1e6:>12.2f} us   (false hits {hits_fresh})")
+        print(f"spent lookup      {t_spent / len(spent) * 1e6:>12.2f} us")
+        print(f"bloom rejects     {store.bloom_rejects:>12}")
+        print(f"disk lookups      {store.disk_lookups:>12}")
+        print(f"disk bytes/image  {dir_size(d) / n:>12.1f}")
+        print(f"set[int] bytes/image {set_bytes:>9.1f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
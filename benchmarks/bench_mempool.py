@@ -0,0 +1,85 @@
+"""
+Mempool bookkeeping cost: admission, templates, eviction and block updates.
+
+    uv run python benchmarks/bench_mempool.py --txs 50000 --cap-mb 8
+
+Crypto checks are replaced by a constant so only the pool's own indexes and
+heaps are timed; txs are synthetic blobs of realistic size.
+"""
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+from common.mempool import Mempool
+
+
+@dataclass
+class SynthTx:
+    images: Tuple[int, ...]
+    fee: int
+    blob: bytes
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--txs", type=int, default=50_000)
+    ap.add_argument("--cap-mb", type=float, default=8.0)
+    ap.add_argument("--block-bytes", type=int, default=300_000)
+    ap.add_argument("--blocks", type=int, default=20)
+    args = ap.parse_args()
+
+    rng = random.Random(1)
+    txs = []
+    for t in range(args.txs):
+        n_in = rng.choice((1, 1, 2, 2, 4))
+        size = 600 + 700 * n_in + rng.randrange(200)
+        images = tuple(rng.getrandbits(250) for _ in range(n_in))
+        blob = t.to_bytes(8, "big") * (size // 8)
+        txs.append(SynthTx(images, rng.randrange(1, 20) * size, blob))
+
+    pool = Mempool(
+        lambda tx: tx.blob,
+        lambda tx: tx.images,
+        lambda batch: [True] * len(batch),
+        max_bytes=int(args.cap_mb * (1 << 20)),
+    )
+    t0 = time.perf_counter()
+    for tx in txs:
+        pool.add(tx)
+    dt = time.perf_counter() - t0
+    s = pool.stats()
+    print(
+        f"add: {args.txs} txs in {dt:.2f}s ({args.txs / dt:,.0f} tx/s), "
+        f"{len(pool)} pooled, {pool.nbytes / (1 << 20):.1f} MiB, "
+        f"{s.evicted} evicted, {s.low_fee} refused"
+    )
+
+    # Double-spend attempts against pooled txs
+    probes = [
+        SynthTx(tx.images[:1], tx.fee * 2, tx.blob[::-1]) for tx in txs[-10_000:]
+    ]
+    t0 = time.perf_counter()
+    for tx in probes:
+        pool.add(tx)
+    dt = time.perf_counter() - t0
+    print(f"conflict probes: {len(probes) / dt:,.0f} tx/s")
+
+    t0 = time.perf_counter()
+    mined = 0
+    for _ in range(args.blocks):
+        block = pool.block_template(args.block_bytes)
+        pool.on_block(block)
+        mined += len(block)
+    dt = time.perf_counter() - t0
+    print(
+        f"{args.blocks} templates + on_block: "
+        f"{dt * 1e3 / args.blocks:.1f}ms per block, "
+        f"{mined} txs mined, {len(pool)} left"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Merkle multiproofs vs. independent membership proofs: size and latency.
+
+    uv run python benchmarks/bench_multiproof.py --log-leaves 20 --batch 2 16 128
+"""
+
+import argparse
+import random
+import time
+
+from common import setup
+from fcmp.tree import build, hash_leaf, root
+from fcmp.zkproof import prove, prove_many, verify, verify_many
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--log-leaves", type=int, default=16)
+    ap.add_argument("--batch", type=int, nargs="+", default=[2, 8, 32, 128])
+    ap.add_argument("--reps", type=int, default=5)
+    args = ap.parse_args()
+
+    pp = setup()
+    n = 1 << args.log_leaves
+    outputs = [(random.randrange(1, pp.q), random.randrange(1, pp.q)) for _ in range(n)]
+    tree = build(pp, [hash_leaf(pp, P, C) for P, C in outputs])
+    root_val, ctx = root(tree), b"BENCH"
+
+    print(f"{n} leaves")
+    print(
+        f"{'batch':>6} {'N x B':>8} {'multi B':>8} {'N prove ms':>10} "
+        f"{'m prove ms':>10} {'N verify ms':>11} {'m verify ms':>11}"
+    )
+    for k in args.batch:
+        idxs = random.sample(range(n), k)
+        outs = [outputs[i] for i in idxs]
+
+        t0 = time.perf_counter()
+        for _ in range(args.reps):
+            singles = [prove(pp, tree, P, C, i, ctx) for (P, C), i in zip(outs, idxs)]
+        t_prove = (time.perf_counter() - t0) / args.reps
+        t0 = time.perf_counter()
+        for _ in range(args.reps):
+            multi = prove_many(pp, tree, outs, idxs, ctx)
+        t_mprove = (time.perf_counter() - t0) / args.reps
+
+        t0 = time.perf_counter()
+        for _ in range(args.reps):
+            assert all(
+                verify(pp, root_val, P, C, prf, ctx)
+                for (P, C), prf in zip(outs, singles)
+            )
+        t_verify = (time.perf_counter() - t0) / args.reps
+        t0 = time.perf_counter()
+        for _ in range(args.reps):
+            assert verify_many(pp, root_val, outs, multi, ctx)
+        t_mverify = (time.perf_counter() - t0) / args.reps
+
+        size = sum(len(p.blob) for p in singles)
+        print(
+            f"{k:>6} {size:>8} {len(multi.blob):>8} {t_prove * 1e3:>10.2f} "
+            f"{t_mprove * 1e3:>10.2f} {t_verify * 1e3:>11.2f} {t_mverify * 1e3:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Signing latency of a many-input monero transaction vs. worker count.
+
+    uv run python benchmarks/bench_prove_inputs.py --inputs 50 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from common import setup, keygen, commit
+from monero import UTXO, add_utxo, clear_utxos, prove_inputs
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--inputs", type=int, default=50)
+    ap.add_argument("--ring", type=int, default=16)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = ap.parse_args()
+
+    pp = setup()
+    clear_utxos()
+    for _ in range(max(args.inputs, args.ring) * 4):
+        kp = keygen(pp)
+        r = secrets.randbelow(pp.q - 1) + 1
+        add_utxo(UTXO(P=kp.P, C=commit(pp, 10, r), v=10, r=r, sk=kp.sk))
+    spend = list(range(args.inputs))
+
+    print(f"{args.inputs} inputs, ring {args.ring}, {os.cpu_count()} cpus")
+    base = None
+    for w in args.workers:
+        # Pool start-up is paid once per wallet session, not per transaction
+        with ProcessPoolExecutor(max_workers=w) as ex:
+            ex.submit(int).result()
+            t0 = time.perf_counter()
+            ex_w = ex if w > 1 else None
+            prove_inputs(pp, b"BENCH", spend, args.ring, workers=w, executor=ex_w)
+            dt = time.perf_counter() - t0
+        base = base or dt
+        print(f"workers={w:<3} {dt * 1e3:>9.1f} ms {base / dt:>6.2f}x")
+    clear_utxos()
+
+
+if __name__ == "__main__":
+    main()
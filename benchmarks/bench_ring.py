@@ -0,0 +1,54 @@
+"""
+LSAG signing / verification time vs. ring size.
+
+With the incremental transcript the per-member cost should stay flat, i.e.
+total time grows linearly in the ring size.
+
+    uv run python benchmarks/bench_ring.py --sizes 8 16 32 64 128 256
+"""
+
+import argparse
+import secrets
+import time
+
+from common import setup, keygen, key_image, commit
+from monero.ring import ring_prove, ring_verify
+
+
+def bench(n: int, reps: int) -> tuple[float, float]:
+    pp = setup()
+    keys = [keygen(pp) for _ in range(n)]
+    ring_P = [kp.P for kp in keys]
+    ring_C = [commit(pp, 1, secrets.randbelow(pp.q - 1) + 1) for _ in range(n)]
+    real_idx = n // 2
+    I = key_image(pp, keys[real_idx])
+
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        sig = ring_prove(pp, b"bench", ring_P, ring_C, real_idx, keys[real_idx], I)
+    t_sign = (time.perf_counter() - t0) / reps
+
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        assert ring_verify(pp, b"bench", ring_P, ring_C, I, sig)
+    t_verify = (time.perf_counter() - t0) / reps
+    return t_sign, t_verify
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[8, 16, 32, 64, 128, 256])
+    ap.add_argument("--reps", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'ring':>6} {'sign ms':>10} {'verify ms':>10} {'sign us/mem':>12} {'verify us/mem':>14}")
+    for n in args.sizes:
+        t_sign, t_verify = bench(n, args.reps)
+        print(
+            f"{n:>6} {t_sign * 1e3:>10.3f} {t_verify * 1e3:>10.3f} "
+            f"{t_sign * 1e6 / n:>12.2f} {t_verify * 1e6 / n:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
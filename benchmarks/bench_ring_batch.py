@@ -0,0 +1,66 @@
+"""
+Block-style ring verification: ring_verify_many vs. a loop over ring_verify.
+
+Decoys are drawn from a shared pool, as they would be within a block.
+
+    uv run python benchmarks/bench_ring_batch.py --jobs 100 400 --ring 16
+"""
+
+import argparse
+import random
+import secrets
+import time
+
+from common import setup, keygen, key_image, commit, hp_cache_clear
+from monero.ring import ring_prove, ring_verify, ring_verify_many
+
+
+def make_jobs(pp, n_jobs: int, ring_size: int, pool_size: int):
+    pool = [keygen(pp) for _ in range(pool_size)]
+    commits = {kp.P: commit(pp, 1, secrets.randbelow(pp.q - 1) + 1) for kp in pool}
+    jobs = []
+    for _ in range(n_jobs):
+        members = random.sample(pool, ring_size)
+        ring_P = [kp.P for kp in members]
+        ring_C = [commits[P] for P in ring_P]
+        real_idx = random.randrange(ring_size)
+        I = key_image(pp, members[real_idx])
+        sig = ring_prove(pp, b"bench", ring_P, ring_C, real_idx, members[real_idx], I)
+        jobs.append((b"bench", ring_P, ring_C, I, sig))
+    return jobs
+
+
+def best_of(reps: int, fn) -> float:
+    best = float("inf")
+    for _ in range(reps):
+        hp_cache_clear()
+        t0 = time.perf_counter()
+        assert all(fn())
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--jobs", type=int, nargs="+", default=[10, 100, 400])
+    ap.add_argument("--ring", type=int, default=16)
+    ap.add_argument("--pool", type=int, default=2000)
+    ap.add_argument("--reps", type=int, default=5)
+    args = ap.parse_args()
+
+    pp = setup()
+    print(f"{'jobs':>6} {'loop ms':>10} {'many ms':>10} {'speedup':>8}")
+    for n_jobs in args.jobs:
+        jobs = make_jobs(pp, n_jobs, args.ring, args.pool)
+
+        t_loop = best_of(args.reps, lambda: [ring_verify(pp, *job) for job in jobs])
+        t_many = best_of(args.reps, lambda: ring_verify_many(pp, jobs))
+
+        print(
+            f"{n_jobs:>6} {t_loop * 1e3:>10.2f} {t_many * 1e3:>10.2f} "
+            f"{t_loop / t_many:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
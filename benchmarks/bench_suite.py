@@ -0,0 +1,340 @@
+"""
+Benchmark suite: scaling of the core operations as JSON, with regression checks.
+
+    uv run python benchmarks/bench_suite.py --out bench.json
+    uv run python benchmarks/bench_suite.py --baseline bench.json --threshold 0.25
+    uv run python benchmarks/bench_suite.py --full --cases tree --out tree.json
+
+Cases:
+    ring    ring_prove / ring_verify over ring sizes 2..1024
+    tree    fcmp.tree.build, path and zkproof.verify over 2^10.. leaves
+            (up to 2^18 by default, 2^24 with --full)
+    tx      monero and fcmp verify_tx over input x output counts
+    memory  Python heap retained by the filled UTXO structures, and the
+            peak while filling them (mapped files are not heap and are
+            not counted). Packed tree layers start at 1024 records each,
+            so they only pay off once the layers outgrow that
+
+Each record is {"case", "params", "metric", "value", "unit"}, and lower is
+better for every metric. Times are the best of --repeat runs of a loop
+long enough to take 0.2s. With --baseline, the records whose value grew by
+more than --threshold (relative) against the saved run are listed and the
+exit status is 1; --load compares a saved run instead of measuring.
+"""
+
+import argparse
+import json
+import platform
+import random
+import secrets
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from common import commit, gen_key, key_image, keygen, setup
+import fcmp
+from fcmp.columns import Column
+from fcmp.tree import IncrementalTree, build, hash_leaf, packed_layers, path
+from fcmp.zkproof import prove as zk_prove, verify as zk_verify
+import monero
+from monero import UTXO, UtxoStore, add_utxo, clear_utxos, prove_inputs
+from monero.range_proof import range_prove_stub
+from monero.ring import ring_prove, ring_verify
+
+Record = Dict[str, object]
+
+RING_SIZES = [2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+TX_SHAPES = [(1, 2), (2, 2), (4, 2), (8, 2), (2, 8)]
+MEM_CHUNK = 4096  # UTXOs built per UtxoStore.extend() in the memory case
+
+
+def seconds(fn: Callable[[], object], repeat: int) -> float:
+    """Best per-call time of fn over repeat timing loops."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def record(case: str, params: dict, metric: str, value: float, unit: str) -> Record:
+    return {
+        "case": case,
+        "params": params,
+        "metric": metric,
+        "value": value,
+        "unit": unit,
+    }
+
+
+def bench_ring(pp, args) -> List[Record]:
+    out = []
+    for n in args.ring_sizes:
+        keys = [keygen(pp) for _ in range(n)]
+        ring_P = [kp.P for kp in keys]
+        ring_C = [commit(pp, 1, secrets.randbelow(pp.q - 1) + 1) for _ in range(n)]
+        real = n // 2
+        I = key_image(pp, keys[real])
+
+        def sign():
+            return ring_prove(pp, b"SUITE", ring_P, ring_C, real, keys[real], I)
+
+        sig = sign()
+        assert ring_verify(pp, b"SUITE", ring_P, ring_C, I, sig)
+        p = {"ring": n}
+        out.append(record("ring", p, "ring_prove", seconds(sign, args.repeat), "s"))
+        t = seconds(
+            lambda: ring_verify(pp, b"SUITE", ring_P, ring_C, I, sig), args.repeat
+        )
+        out.append(record("ring", p, "ring_verify", t, "s"))
+    return out
+
+
+def bench_tree(pp, args) -> List[Record]:
+    out = []
+    rng = random.Random(1)
+    for log_n in args.tree_logs:
+        n = 1 << log_n
+        leaves = [rng.randrange(1, pp.q) for _ in range(n - 1)]
+        key = gen_key(pp)
+        C = commit(pp, 1, 2)
+        idx = rng.randrange(n)
+        leaves.insert(idx, hash_leaf(pp, key.P, C))
+        p = {"log_leaves": log_n}
+
+        # Large trees are built once: a timing loop would rebuild them for
+        # minutes, and one build is already well above timer noise
+        if log_n > 16:
+            t0 = time.perf_counter()
+            tree = build(pp, leaves)
+            t_build = time.perf_counter() - t0
+        else:
+            t_build = seconds(lambda: build(pp, leaves), args.repeat)
+            tree = build(pp, leaves)
+        out.append(record("tree", p, "build", t_build, "s"))
+
+        idxs = [rng.randrange(n) for _ in range(64)]
+        t = seconds(lambda: [path(pp, tree, i) for i in idxs], args.repeat)
+        out.append(record("tree", p, "path", t / len(idxs), "s"))
+
+        proof = zk_prove(pp, tree, key.P, C, idx, b"SUITE")
+        root_val = tree.layers[-1][0]
+        assert zk_verify(pp, root_val, key.P, C, proof, b"SUITE")
+        t = seconds(
+            lambda: zk_verify(pp, root_val, key.P, C, proof, b"SUITE"), args.repeat
+        )
+        out.append(record("tree", p, "zk_verify", t, "s"))
+        del tree, leaves
+    return out
+
+
+def _split(total: int, k: int) -> List[int]:
+    return [total // k + (j < total % k) for j in range(k)]
+
+
+def monero_tx(pp, n_in: int, n_out: int, ring: int) -> "monero.Tx":
+    clear_utxos()
+    for _ in range(max(n_in, ring)):
+        kp = keygen(pp)
+        r = secrets.randbelow(pp.q - 1) + 1
+        add_utxo(UTXO(P=kp.P, C=commit(pp, 10, r), v=10, r=r, sk=kp.sk))
+    fee = 1
+    values = _split(10 * n_in - fee, n_out)
+    blinds = [secrets.randbelow(pp.q - 1) + 1 for _ in values]
+    ins, _ = prove_inputs(pp, b"SUITE", range(n_in), ring, out_blinds=blinds)
+    outs = [
+        monero.TxOut(keygen(pp).P, commit(pp, v, r), range_prove_stub(v))
+        for v, r in zip(values, blinds)
+    ]
+    return monero.Tx(ins=ins, outs=outs, fee=fee, ctx=b"SUITE")
+
+
+def fcmp_tx(pp, n_in: int, n_out: int) -> Tuple[fcmp.Tree, "fcmp.Tx"]:
+    keys = [gen_key(pp) for _ in range(n_in)]
+    in_blinds = [secrets.randbelow(pp.q - 1) + 1 for _ in range(n_in)]
+    commits = [commit(pp, 10, r) for r in in_blinds]
+    leaves = [hash_leaf(pp, k.P, C) for k, C in zip(keys, commits)]
+    leaves += [secrets.randbelow(pp.q) for _ in range(1024 - n_in)]
+    tree = build(pp, leaves)
+    ins = [
+        fcmp.prove_input(pp, tree, keys[i], commits[i], i, b"SUITE")
+        for i in range(n_in)
+    ]
+    fee = 1
+    values = _split(10 * n_in - fee, n_out)
+    blinds = [secrets.randbelow(pp.q - 1) + 1 for _ in values[:-1]]
+    blinds.append((sum(in_blinds) - sum(blinds)) % pp.q)
+    outs = [
+        fcmp.TxOut(gen_key(pp).P, commit(pp, v, r), fcmp.prove_range(v))
+        for v, r in zip(values, blinds)
+    ]
+    return tree, fcmp.Tx(ins, outs, fee, b"SUITE")
+
+
+def bench_tx(pp, args) -> List[Record]:
+    out = []
+    for n_in, n_out in args.tx_shapes:
+        p = {"inputs": n_in, "outputs": n_out, "ring": args.tx_ring}
+        tx = monero_tx(pp, n_in, n_out, args.tx_ring)
+        assert monero.verify_tx(pp, tx, set())
+        t = seconds(lambda: monero.verify_tx(pp, tx, set()), args.repeat)
+        out.append(record("tx", p, "monero_verify_tx", t, "s"))
+
+        p = {"inputs": n_in, "outputs": n_out, "log_leaves": 10}
+        tree, ftx = fcmp_tx(pp, n_in, n_out)
+        assert fcmp.verify_tx(pp, ftx, tree, set())
+        t = seconds(lambda: fcmp.verify_tx(pp, ftx, tree, set()), args.repeat)
+        out.append(record("tx", p, "fcmp_verify_tx", t, "s"))
+    clear_utxos()
+    return out
+
+
+def _heap(fill: Callable[[], object]) -> Tuple[int, int]:
+    """Heap bytes (retained, peak) of fill(), whose result is kept alive."""
+    tracemalloc.start()
+    kept = fill()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return retained, peak
+
+
+def bench_memory(pp, args) -> List[Record]:
+    out = []
+    rng = random.Random(2)
+    for n in args.mem_outputs:
+        keys = [(rng.randrange(1, pp.q), rng.randrange(1, pp.q)) for _ in range(n)]
+
+        def utxo_store():
+            # In chunks, so the peak is not a list of n UTXO objects
+            store = UtxoStore(wallet=False)
+            for i in range(0, n, MEM_CHUNK):
+                chunk = keys[i : i + MEM_CHUNK]
+                store.extend([UTXO(P=P, C=C, v=0, r=0, sk=0) for P, C in chunk])
+            return store
+
+        def columns():
+            cols = Column(), Column(), Column()
+            cols[0].extend(P for P, _ in keys)
+            cols[1].extend(C for _, C in keys)
+            cols[2].extend(hash_leaf(pp, P, C) for P, C in keys)
+            return cols
+
+        def packed_tree():
+            return IncrementalTree(
+                pp, (hash_leaf(pp, P, C) for P, C in keys), storage=packed_layers()
+            )
+
+        def list_tree():
+            return build(pp, [hash_leaf(pp, P, C) for P, C in keys])
+
+        p = {"outputs": n}
+        for metric, fill in [
+            ("monero_utxo_store", utxo_store),
+            ("fcmp_columns", columns),
+            ("fcmp_tree_packed", packed_tree),
+            ("fcmp_tree_lists", list_tree),
+        ]:
+            retained, peak = _heap(fill)
+            out.append(record("memory", p, metric, retained, "bytes"))
+            out.append(record("memory", p, metric + "_peak", peak, "bytes"))
+    return out
+
+
+CASES = {
+    "ring": bench_ring,
+    "tree": bench_tree,
+    "tx": bench_tx,
+    "memory": bench_memory,
+}
+
+
+def _key(r: Record) -> Tuple[str, str, str]:
+    return r["case"], json.dumps(r["params"], sort_keys=True), r["metric"]
+
+
+def compare(
+    current: List[Record], baseline: List[Record], threshold: float
+) -> List[Tuple[Record, float]]:
+    """(record, new / old) for every record that grew by more than threshold."""
+    base = {_key(r): r["value"] for r in baseline}
+    worse = []
+    for r in current:
+        old = base.get(_key(r))
+        if old:
+            ratio = r["value"] / old
+            if ratio > 1 + threshold:
+                worse.append((r, ratio))
+    return worse
+
+
+def _fmt(r: Record) -> str:
+    params = " ".join(f"{k}={v}" for k, v in r["params"].items())
+    if r["unit"] == "s":
+        value = f"{r['value'] * 1e3:.4f} ms"
+    else:
+        value = f"{r['value'] / (1 << 20):.2f} MiB"
+    return f"{r['case']:>6} {r['metric']:<22} {params:<32} {value:>14}"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    ap.add_argument("--full", action="store_true", help="trees up to 2^24 leaves")
+    ap.add_argument("--ring-sizes", type=int, nargs="+", default=RING_SIZES)
+    ap.add_argument("--tree-logs", type=int, nargs="+", default=None)
+    ap.add_argument("--tx-ring", type=int, default=16)
+    ap.add_argument("--mem-outputs", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", help="write results as JSON here ('-': stdout)")
+    ap.add_argument("--baseline", help="saved results to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25)
+    ap.add_argument("--load", help="compare these saved results, don't measure")
+    args = ap.parse_args()
+    if args.tree_logs is None:
+        args.tree_logs = list(range(10, 25 if args.full else 19, 2))
+    args.tx_shapes = TX_SHAPES
+
+    if args.load:
+        with open(args.load) as f:
+            results = json.load(f)["results"]
+    else:
+        pp = setup()
+        results = []
+        for name in args.cases:
+            for r in CASES[name](pp, args):
+                print(_fmt(r), file=sys.stderr)
+                results.append(r)
+        doc = {
+            "meta": {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "argv": sys.argv[1:],
+            },
+            "results": results,
+        }
+        if args.out == "-":
+            json.dump(doc, sys.stdout, indent=1)
+            print()
+        elif args.out:
+            with open(args.out, "w") as f:
+                json.dump(doc, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        worse = compare(results, baseline, args.threshold)
+        for r, ratio in worse:
+            print(f"REGRESSION {_fmt(r)}  x{ratio:.2f}", file=sys.stderr)
+        print(
+            f"{len(worse)} regressions over {args.threshold:.0%} "
+            f"in {len(results)} results",
+            file=sys.stderr,
+        )
+        if worse:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
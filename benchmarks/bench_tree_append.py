@@ -0,0 +1,47 @@
+"""
+IncrementalTree append cost as the tree grows, vs. a full build().
+
+    uv run python benchmarks/bench_tree_append.py --log-max 24
+"""
+
+import argparse
+import time
+
+from common import setup
+from fcmp.tree import IncrementalTree, build
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--log-max", type=int, default=18)
+    ap.add_argument("--sample", type=int, default=1000, help="appends timed per size")
+    ap.add_argument(
+        "--rebuild-max", type=int, default=16, help="largest log2 size to time build()"
+    )
+    args = ap.parse_args()
+
+    pp = setup()
+    tree = IncrementalTree(pp)
+    print(f"{'leaves':>10} {'append us':>10} {'build ms':>10}")
+    next_leaf = 1
+    for k in range(10, args.log_max + 1):
+        target = 1 << k
+        tree.extend(range(next_leaf, target - args.sample + 1))
+        next_leaf = target - args.sample + 1
+
+        t0 = time.perf_counter()
+        for leaf in range(next_leaf, target + 1):
+            tree.append(leaf)
+        t_append = (time.perf_counter() - t0) / args.sample
+        next_leaf = target + 1
+
+        t_build = ""
+        if k <= args.rebuild_max:
+            t0 = time.perf_counter()
+            build(pp, tree.layers[0])
+            t_build = f"{(time.perf_counter() - t0) * 1e3:.1f}"
+        print(f"{len(tree):>10} {t_append * 1e6:>10.2f} {t_build:>10}")
+
+
+if __name__ == "__main__":
+    main()
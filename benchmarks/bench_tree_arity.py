@@ -0,0 +1,58 @@
+"""
+Tree arity trade-offs: build time, path depth, proof size and verify time.
+
+    uv run python benchmarks/bench_tree_arity.py --log-leaves 20 --arity 2 4 16 256
+"""
+
+import argparse
+import random
+import time
+
+from common import commit, gen_key, setup
+from fcmp.tree import build, hash_leaf, root
+from fcmp.zkproof import prove, verify
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--log-leaves", type=int, default=16)
+    ap.add_argument("--arity", type=int, nargs="+", default=[2, 4, 16, 256])
+    ap.add_argument("--proofs", type=int, default=200, help="proofs timed per arity")
+    args = ap.parse_args()
+
+    pp = setup()
+    n = 1 << args.log_leaves
+    key, C = gen_key(pp), commit(pp, 5, 7)
+    leaves = [random.randrange(1, pp.q) for _ in range(n)]
+    idx = random.randrange(n)
+    leaves[idx] = hash_leaf(pp, key.P, C)
+    ctx = b"BENCH"
+
+    print(f"{n} leaves")
+    print(
+        f"{'arity':>6} {'depth':>6} {'build s':>8} {'proof B':>8} "
+        f"{'prove us':>9} {'verify us':>10}"
+    )
+    for a in args.arity:
+        t0 = time.perf_counter()
+        tree = build(pp, leaves, arity=a)
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for _ in range(args.proofs):
+            proof = prove(pp, tree, key.P, C, idx, ctx)
+        t_prove = (time.perf_counter() - t0) / args.proofs
+
+        root_val = root(tree)
+        t0 = time.perf_counter()
+        for _ in range(args.proofs):
+            assert verify(pp, root_val, key.P, C, proof, ctx)
+        t_verify = (time.perf_counter() - t0) / args.proofs
+        print(
+            f"{a:>6} {len(tree.layers) - 1:>6} {t_build:>8.2f} {len(proof.blob):>8} "
+            f"{t_prove * 1e6:>9.1f} {t_verify * 1e6:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Full tree rebuild time: build() vs. build_parallel() across worker counts.
+
+    uv run python benchmarks/bench_tree_build.py --log-leaves 22 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import random
+import time
+
+from common import setup
+from fcmp.tree import build, build_parallel, root
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--log-leaves", type=int, default=18)
+    ap.add_argument("--extra", type=int, default=12345, help="leaves past 2^log")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = ap.parse_args()
+
+    pp = setup()
+    n = (1 << args.log_leaves) + args.extra
+    leaves = [random.randrange(1, pp.q) for _ in range(n)]
+    print(f"{n} leaves, {os.cpu_count()} cpus")
+
+    t0 = time.perf_counter()
+    expect = root(build(pp, leaves))
+    base = time.perf_counter() - t0
+    print(f"{'build':>10} {base:>8.2f}s")
+
+    for w in args.workers:
+        t0 = time.perf_counter()
+        got = root(build_parallel(pp, leaves, workers=w))
+        dt = time.perf_counter() - t0
+        assert got == expect
+        print(f"{f'workers={w}':>10} {dt:>8.2f}s {base / dt:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
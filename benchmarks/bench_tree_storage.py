@@ -0,0 +1,67 @@
+"""
+Tree layer storage: memory and path-extraction latency, lists vs. packed,
+memory-mapped and pruned layers.
+
+    uv run python benchmarks/bench_tree_storage.py --log-leaves 20
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+
+from common import setup
+from fcmp.tree import PrunedTree, build, packed_layers, path
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--log-leaves", type=int, default=16)
+    ap.add_argument("--paths", type=int, default=2000, help="paths timed per layout")
+    ap.add_argument(
+        "--prune-k", type=int, nargs="*", default=[2, 4, 6], help="PrunedTree k values"
+    )
+    args = ap.parse_args()
+
+    pp = setup()
+    n = 1 << args.log_leaves
+    raw = [random.randrange(1, pp.q).to_bytes(32, "big") for _ in range(n)]
+    idxs = [random.randrange(n) for _ in range(args.paths)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        layouts = [
+            ("list", partial(build, pp)),
+            ("packed", partial(build, pp, storage=packed_layers())),
+            ("mmap", partial(build, pp, storage=packed_layers(tmp))),
+        ] + [(f"prune{k}", partial(PrunedTree, pp, k=k)) for k in args.prune_k]
+        print(f"{n} leaves")
+        print(f"{'layout':>8} {'heap MiB':>10} {'build s':>8} {'path us':>8}")
+        for name, make in layouts:
+            # Leaves are materialised inside the trace, so the list layout is
+            # charged for the leaf ints it keeps alive
+            tracemalloc.start()
+            tree = make([int.from_bytes(b, "big") for b in raw])
+            heap, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del tree
+
+            leaves = [int.from_bytes(b, "big") for b in raw]
+            t0 = time.perf_counter()
+            tree = make(leaves)
+            t_build = time.perf_counter() - t0
+            del leaves
+
+            t0 = time.perf_counter()
+            for i in idxs:
+                path(pp, tree, i)
+            t_path = (time.perf_counter() - t0) / len(idxs)
+            print(
+                f"{name:>8} {heap / 2**20:>10.1f} {t_build:>8.2f} {t_path * 1e6:>8.1f}"
+            )
+            del tree
+
+
+if __name__ == "__main__":
+    main()
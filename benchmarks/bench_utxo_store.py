@@ -0,0 +1,72 @@
+"""
+UtxoStore vs. a list of UTXO dataclasses: bytes per output, append rate,
+random ring-member access and reopen time.
+
+    uv run python benchmarks/bench_utxo_store.py --outputs 50000000 --no-wallet
+"""
+
+import argparse
+import os
+import random
+import secrets
+import tempfile
+import time
+import tracemalloc
+
+from monero.utxo import UTXO, UtxoStore
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--outputs", type=int, default=1_000_000)
+    ap.add_argument("--lookups", type=int, default=100_000)
+    ap.add_argument("--no-wallet", action="store_true", help="store only P and C")
+    args = ap.parse_args()
+
+    q = (1 << 255) - 19
+    n = args.outputs
+    # A fixed pool of random values keeps generation out of the timings
+    pool = [secrets.randbelow(q) for _ in range(4096)]
+
+    def utxo(i: int) -> UTXO:
+        P, C, r = pool[i & 4095], pool[(i * 7) & 4095], pool[(i * 3) & 4095]
+        return UTXO(P=P, C=C, v=i, r=r, sk=0)
+
+    m = min(n, 1_000_000)
+    tracemalloc.start()
+    rnd = secrets.randbelow
+    lst = [UTXO(P=rnd(q), C=rnd(q), v=i, r=rnd(q), sk=0) for i in range(m)]
+    list_bytes = tracemalloc.get_traced_memory()[0] / m
+    tracemalloc.stop()
+    del lst
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "utxos.bin")
+        store = UtxoStore(path, wallet=not args.no_wallet)
+        t0 = time.perf_counter()
+        for i in range(n):
+            store.append(utxo(i))
+        t_append = time.perf_counter() - t0
+        store.close()
+
+        t0 = time.perf_counter()
+        store = UtxoStore(path)
+        t_open = time.perf_counter() - t0
+
+        idxs = [random.randrange(n) for _ in range(args.lookups)]
+        t0 = time.perf_counter()
+        for i in idxs:
+            store.P(i), store.C(i)
+        t_get = time.perf_counter() - t0
+
+        print(f"outputs              {len(store):>12}")
+        print(f"append               {n / t_append:>12.0f} outputs/s")
+        print(f"reopen               {t_open * 1e3:>12.3f} ms")
+        print(f"random P+C lookup    {t_get / len(idxs) * 1e6:>12.3f} us")
+        print(f"store bytes/output   {store.record_size:>12}")
+        print(f"list bytes/output    {list_bytes:>12.1f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
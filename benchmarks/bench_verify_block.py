@@ -0,0 +1,75 @@
+"""
+verify_block throughput (tx/s) vs. worker count, for monero and fcmp.
+
+    uv run python benchmarks/bench_verify_block.py --txs 400 --workers 1 2 4 8
+"""
+
+import argparse
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+from common import setup, keygen, gen_key, commit
+import monero
+from monero import UTXO, add_utxo, clear_utxos, prove_input, range_prove_stub
+import fcmp
+from fcmp.tree import build, hash_leaf
+from fcmp.tx import prove_range
+
+
+def monero_block(pp, n_txs: int, ring: int):
+    clear_utxos()
+    for _ in range(max(n_txs, ring)):
+        kp = keygen(pp)
+        r = secrets.randbelow(pp.q - 1) + 1
+        add_utxo(UTXO(P=kp.P, C=commit(pp, 10, r), v=10, r=r, sk=kp.sk))
+    txs = []
+    for i in range(n_txs):
+        txin, r_pseudo = prove_input(pp, b"BENCH", i, ring)
+        out = monero.TxOut(keygen(pp).P, commit(pp, 9, r_pseudo), range_prove_stub(9))
+        txs.append(monero.Tx(ins=[txin], outs=[out], fee=1, ctx=b"BENCH"))
+    return txs
+
+
+def fcmp_block(pp, n_txs: int):
+    keys = [gen_key(pp) for _ in range(n_txs)]
+    blinds = [secrets.randbelow(pp.q - 1) + 1 for _ in range(n_txs)]
+    commits = [commit(pp, 10, r) for r in blinds]
+    leaves = [hash_leaf(pp, k.P, C) for k, C in zip(keys, commits)]
+    # Unrelated outputs fill the tree up to a power of two
+    leaves += [secrets.randbelow(pp.q) for _ in range((1 << (n_txs - 1).bit_length()) - n_txs)]
+    tree = build(pp, leaves)
+    txs = []
+    for i in range(n_txs):
+        txin = fcmp.prove_input(pp, tree, keys[i], commits[i], i, b"BENCH")
+        out = fcmp.TxOut(gen_key(pp).P, commit(pp, 9, blinds[i]), prove_range(9))
+        txs.append(fcmp.Tx([txin], [out], 1, b"BENCH"))
+    return tree, txs
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--txs", type=int, default=400)
+    ap.add_argument("--ring", type=int, default=16)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = ap.parse_args()
+
+    pp = setup()
+    m_txs = monero_block(pp, args.txs, args.ring)
+    tree, f_txs = fcmp_block(pp, args.txs)
+
+    print(f"{'workers':>7} {'monero tx/s':>12} {'fcmp tx/s':>10}")
+    for w in args.workers:
+        # Reuse one pool per worker count so start-up cost is not measured
+        with ProcessPoolExecutor(max_workers=w) as ex:
+            pool = ex if w > 1 else None
+            if pool is not None:
+                list(ex.map(abs, range(w)))  # warm up
+            m = monero.verify_block(pp, m_txs, set(), workers=w, executor=pool)
+            f = fcmp.verify_block(pp, f_txs, tree, set(), workers=w, executor=pool)
+        assert m.ok and f.ok
+        print(f"{w:>7} {m.tx_per_sec:>12.0f} {f.tx_per_sec:>10.0f}")
+    clear_utxos()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+verify_block with and without a VerifyCache warmed by mempool admission.
+
+    uv run python benchmarks/bench_verify_cache.py --txs 400 --ring 16
+
+Every tx is admitted to a mempool first, which fills the cache; the block
+check then only runs key-image and root checks plus the tx hashing.
+"""
+
+import argparse
+
+from bench_verify_block import fcmp_block, monero_block
+from common import VerifyCache, setup
+import fcmp
+import monero
+from monero import clear_utxos
+
+
+def report(name, cold, warm, cache):
+    s = cache.stats()
+    print(
+        f"{name:>6}: cold {cold.tx_per_sec:>9,.0f} tx/s  warm {warm.tx_per_sec:>9,.0f}"
+        f" tx/s  hit rate {s.hit_rate:.2f}  saved {s.saved * 1e3:.0f}ms"
+        f" of {s.spent * 1e3:.0f}ms checking"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--txs", type=int, default=400)
+    ap.add_argument("--ring", type=int, default=16)
+    args = ap.parse_args()
+
+    pp = setup()
+    m_txs = monero_block(pp, args.txs, args.ring)
+    cold = monero.verify_block(pp, m_txs, set())
+    cache = VerifyCache()
+    pool = monero.new_mempool(pp, set(), cache=cache)
+    assert all(pool.add_many(m_txs))
+    warm = monero.verify_block(pp, pool.block_template(), set(), cache=cache)
+    assert cold.ok and warm.ok
+    report("monero", cold, warm, cache)
+    clear_utxos()
+
+    tree, f_txs = fcmp_block(pp, args.txs)
+    cold = fcmp.verify_block(pp, f_txs, tree, set())
+    cache = VerifyCache()
+    pool = fcmp.new_mempool(pp, tree, set(), cache=cache)
+    assert all(pool.add_many(f_txs))
+    warm = fcmp.verify_block(pp, pool.block_template(), tree, set(), cache=cache)
+    assert cold.ok and warm.ok
+    report("fcmp", cold, warm, cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+monero verify_tx over transactions with many inputs.
+
+    uv run python benchmarks/bench_verify_tx.py --inputs 1 4 16 --ring 16
+    uv run python benchmarks/bench_verify_tx.py --inputs 16 --profile
+"""
+
+import argparse
+import cProfile
+import pstats
+import secrets
+import time
+
+from common import setup, keygen, commit
+from monero import (
+    UTXO,
+    Tx,
+    TxOut,
+    add_utxo,
+    clear_utxos,
+    prove_input,
+    range_prove_stub,
+    verify_tx,
+)
+
+
+def make_tx(pp, n_in: int, ring_size: int, n_utxos: int) -> Tx:
+    clear_utxos()
+    for _ in range(n_utxos):
+        kp = keygen(pp)
+        r = secrets.randbelow(pp.q - 1) + 1
+        add_utxo(UTXO(P=kp.P, C=commit(pp, 10, r), v=10, r=r, sk=kp.sk))
+
+    ctx = b"BENCH"
+    step = n_utxos // n_in
+    ins, r_total = [], 0
+    for k in range(n_in):
+        txin, r_pseudo = prove_input(pp, ctx, k * step, ring_size)
+        ins.append(txin)
+        r_total = (r_total + r_pseudo) % pp.q
+
+    fee = 1
+    v_out = 10 * n_in - fee
+    out = TxOut(keygen(pp).P, commit(pp, v_out, r_total), range_prove_stub(v_out))
+    return Tx(ins=ins, outs=[out], fee=fee, ctx=ctx)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--inputs", type=int, nargs="+", default=[1, 4, 16])
+    ap.add_argument("--ring", type=int, default=16)
+    ap.add_argument("--utxos", type=int, default=1024)
+    ap.add_argument("--reps", type=int, default=5)
+    ap.add_argument("--profile", action="store_true", help="cProfile the last size")
+    args = ap.parse_args()
+
+    pp = setup()
+    print(f"{'inputs':>6} {'verify ms':>10} {'ms/input':>9}")
+    for n_in in args.inputs:
+        tx = make_tx(pp, n_in, args.ring, args.utxos)
+        best = float("inf")
+        for _ in range(args.reps):
+            t0 = time.perf_counter()
+            assert verify_tx(pp, tx, set())
+            best = min(best, time.perf_counter() - t0)
+        print(f"{n_in:>6} {best * 1e3:>10.3f} {best * 1e3 / n_in:>9.3f}")
+
+    if args.profile:
+        prof = cProfile.Profile()
+        prof.runcall(verify_tx, pp, tx, set())
+        pstats.Stats(prof).sort_stats("cumulative").print_stats(15)
+    clear_utxos()
+
+
+if __name__ == "__main__":
+    main()
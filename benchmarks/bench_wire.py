@@ -0,0 +1,98 @@
+"""
+Encode / decode throughput of the monero and fcmp wire formats.
+
+"header" only reads fee + key images through TxView, which is what a node
+needs to reject double-spends.
+
+    uv run python benchmarks/bench_wire.py --txs 2000 --inputs 2 --ring 16
+"""
+
+import argparse
+import secrets
+import time
+
+from common import SpendProof
+from monero.range_proof import RangeProofStub
+from monero.ring import RingSig
+from monero.transaction import Tx as MTx, TxIn as MTxIn, TxOut as MTxOut
+from monero.zklink import ZKLink
+from monero import wire as mwire
+from fcmp.tx import RangeProof, Tx as FTx, TxIn as FTxIn, TxOut as FTxOut
+from fcmp.zkproof import ZKProof
+from fcmp import wire as fwire
+
+
+def rnd() -> int:
+    return secrets.randbits(255)
+
+
+def monero_tx(n_in: int, ring: int) -> MTx:
+    ins = [
+        MTxIn(
+            ring_P=[rnd() for _ in range(ring)],
+            ring_C=[rnd() for _ in range(ring)],
+            I=rnd(),
+            sig=RingSig(c0=rnd(), s=[rnd() for _ in range(ring)]),
+            C_pseudo=rnd(),
+            link_proof=ZKLink(secrets.token_bytes(108)),
+        )
+        for _ in range(n_in)
+    ]
+    outs = [MTxOut(rnd(), rnd(), RangeProofStub(b"OK")) for _ in range(2)]
+    return MTx(ins=ins, outs=outs, fee=3, ctx=b"BENCH")
+
+
+def fcmp_tx(n_in: int, depth: int) -> FTx:
+    ins = [
+        FTxIn(
+            P=rnd(),
+            I=rnd(),
+            C=rnd(),
+            root=rnd(),
+            spend_proof=SpendProof(rnd(), rnd(), rnd()),
+            zk_proof=ZKProof(secrets.token_bytes(40 + 33 * depth)),
+        )
+        for _ in range(n_in)
+    ]
+    outs = [FTxOut(rnd(), rnd(), RangeProof(b"OK")) for _ in range(2)]
+    return FTx(inputs=ins, outputs=outs, fee=3, ctx=b"BENCH")
+
+
+def run(name: str, wire, txs) -> None:
+    t0 = time.perf_counter()
+    blobs = [wire.encode_tx(tx) for tx in txs]
+    t_enc = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for b in blobs:
+        view = wire.TxView(b)
+        view.fee, view.key_images
+    t_hdr = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for b in blobs:
+        wire.decode_tx(b)
+    t_dec = time.perf_counter() - t0
+
+    n = len(txs)
+    size = sum(map(len, blobs)) / n
+    print(
+        f"{name:>7} {size:>9.0f} {n / t_enc:>12.0f} {n / t_hdr:>12.0f} {n / t_dec:>12.0f}"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--txs", type=int, default=2000)
+    ap.add_argument("--inputs", type=int, default=2)
+    ap.add_argument("--ring", type=int, default=16)
+    ap.add_argument("--depth", type=int, default=24)
+    args = ap.parse_args()
+
+    print(f"{'format':>7} {'bytes/tx':>9} {'encode tx/s':>12} {'header tx/s':>12} {'decode tx/s':>12}")
+    run("monero", mwire, [monero_tx(args.inputs, args.ring) for _ in range(args.txs)])
+    run("fcmp", fwire, [fcmp_tx(args.inputs, args.depth) for _ in range(args.txs)])
+
+
+if __name__ == "__main__":
+    main()
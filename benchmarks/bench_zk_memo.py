@@ -0,0 +1,53 @@
+"""
+Membership checks for a block of inputs under one root, with and without a
+NodeMemo of already-proven nodes.
+
+    uv run python benchmarks/bench_zk_memo.py --log-leaves 20 --inputs 1000
+"""
+
+import argparse
+import random
+import time
+
+from common import setup
+from fcmp.tree import build, hash_leaf, root
+from fcmp.zkproof import NodeMemo, prove, verify
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--log-leaves", type=int, default=16)
+    ap.add_argument("--inputs", type=int, nargs="+", default=[100, 1000, 5000])
+    args = ap.parse_args()
+
+    pp = setup()
+    n = 1 << args.log_leaves
+    outputs = [(random.randrange(1, pp.q), random.randrange(1, pp.q)) for _ in range(n)]
+    tree = build(pp, [hash_leaf(pp, P, C) for P, C in outputs])
+    root_val, ctx = root(tree), b"BENCH"
+
+    print(f"{n} leaves, depth {len(tree.layers) - 1}")
+    print(f"{'inputs':>7} {'plain ms':>9} {'memo ms':>8} {'hits':>6} {'saved':>8}")
+    for k in args.inputs:
+        idxs = random.sample(range(n), min(k, n))
+        proofs = [prove(pp, tree, *outputs[i], i, ctx) for i in idxs]
+
+        t0 = time.perf_counter()
+        for i, prf in zip(idxs, proofs):
+            assert verify(pp, root_val, *outputs[i], prf, ctx)
+        t_plain = time.perf_counter() - t0
+
+        memo = NodeMemo(nodes_per_root=1 << 20)
+        t0 = time.perf_counter()
+        for i, prf in zip(idxs, proofs):
+            assert verify(pp, root_val, *outputs[i], prf, ctx, memo)
+        t_memo = time.perf_counter() - t0
+        s = memo.stats()
+        print(
+            f"{len(idxs):>7} {t_plain * 1e3:>9.1f} {t_memo * 1e3:>8.1f} "
+            f"{s.hits:>6} {s.saved:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 """Common utilities for Mock Monero project."""
 
-from common.crypto import to_bytes, hash_mod
+from common.crypto import to_bytes, hash_mod, Transcript
+from common.cache import LRUCache, CacheStats, VerifyCache, VerifyStats
+from common.keyimages import KeyImageStore, SpentSet
+from common.parallel import BlockResult, map_chunks, mark_conflicts
+from common.mempool import Mempool, PoolEntry, PoolStats
+from common.chain import BaseChainState, BlockUndo
 from common.group import CryptoParams, setup, commit
 from common.keys import (
     Keypair,
@@ -9,15 +14,39 @@ from common.keys import (
     keygen,
     gen_key,
     Hp,
+    hp_cache_invalidate,
+    hp_cache_clear,
+    hp_cache_stats,
     key_image,
     prove_spend,
     verify_spend,
+    verify_spend_batch,
 )
 
 __all__ = [
     # Crypto utilities
     "to_bytes",
     "hash_mod",
+    "Transcript",
+    # Caching
+    "LRUCache",
+    "CacheStats",
+    "VerifyCache",
+    "VerifyStats",
+    # Spent key images
+    "KeyImageStore",
+    "SpentSet",
+    # Parallel verification
+    "BlockResult",
+    "map_chunks",
+    "mark_conflicts",
+    # Transaction pool
+    "Mempool",
+    "PoolEntry",
+    "PoolStats",
+    # Block application
+    "BaseChainState",
+    "BlockUndo",
     # Group operations
     "CryptoParams",
     "setup",
@@ -29,7 +58,11 @@ __all__ = [
     "keygen",
     "gen_key",
     "Hp",
+    "hp_cache_invalidate",
+    "hp_cache_clear",
+    "hp_cache_stats",
     "key_image",
     "prove_spend",
     "verify_spend",
+    "verify_spend_batch",
 ]
@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, List, Optional, Sequence, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe, size-bounded LRU cache with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError("maxsize must be non-negative")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value (marking it recently used) or None."""
+        with self._lock:
+            try:
+                val = self._data[key]
+            except KeyError:
+                self._stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+            return val
+
+    def put(self, key: K, val: V) -> None:
+        with self._lock:
+            self._put(key, val)
+
+    def get_or_compute(self, key: K, fn: Callable[[], V]) -> V:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        fn runs outside the lock, so concurrent misses may compute it twice.
+        """
+        val = self.get(key)
+        if val is None:
+            val = fn()
+            self.put(key, val)
+        return val
+
+    def invalidate(self, key: K) -> bool:
+        """Drop a single entry. Returns whether it was present."""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept, see reset_stats)."""
+        with self._lock:
+            self._data.clear()
+
+    def resize(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be non-negative")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            s = self._stats
+            return CacheStats(s.hits, s.misses, s.evictions)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = CacheStats()
+
+    def _put(self, key: K, val: V) -> None:
+        self._data[key] = val
+        self._data.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._stats.evictions += 1
+
+
+@dataclass
+class VerifyStats(CacheStats):
+    # Seconds spent on checks that missed, and the recorded cost of hits
+    spent: float = 0.0
+    saved: float = 0.0
+
+
+class VerifyCache:
+    """
+    Bounded set of txs whose state-independent checks passed, keyed by a
+    canonical tx hash, with what each check cost. A tx checked on its way
+    into the mempool then only needs its state checks when it shows up in
+    a block. Failures are not cached. Use one cache per set of parameters.
+    """
+
+    def __init__(self, maxsize: int = 1 << 16):
+        self._lru: LRUCache[bytes, float] = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._spent = 0.0
+        self._saved = 0.0
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._lru
+
+    def hit(self, key: bytes) -> bool:
+        """Whether key passed before, counting a hit or miss."""
+        cost = self._lru.get(key)
+        if cost is None:
+            return False
+        with self._lock:
+            self._saved += cost
+        return True
+
+    def add(self, key: bytes, cost: float) -> None:
+        """Record that key passed, taking cost seconds to check."""
+        self._lru.put(key, cost)
+
+    def check(self, key: bytes, fn: Callable[[], bool]) -> bool:
+        """fn(), unless key already passed."""
+        return self.check_many([key], [None], lambda items: [fn()])[0]
+
+    def check_many(
+        self,
+        keys: Sequence[bytes],
+        items: Sequence[T],
+        fn: Callable[[List[T]], List[bool]],
+    ) -> List[bool]:
+        """
+        Results of fn over items, calling it once on just the items whose
+        key has not passed before. The batch's time is split evenly over its
+        items as their cost.
+        """
+        todo = [i for i, key in enumerate(keys) if not self.hit(key)]
+        results = [True] * len(keys)
+        if not todo:
+            return results
+        t0 = time.perf_counter()
+        checked = fn([items[i] for i in todo])
+        dt = time.perf_counter() - t0
+        with self._lock:
+            self._spent += dt
+        cost = dt / len(todo)
+        for i, ok in zip(todo, checked):
+            results[i] = ok
+            if ok:
+                self.add(keys[i], cost)
+        return results
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def stats(self) -> VerifyStats:
+        s = self._lru.stats()
+        with self._lock:
+            return VerifyStats(s.hits, s.misses, s.evictions, self._spent, self._saved)
+
+    def reset_stats(self) -> None:
+        self._lru.reset_stats()
+        with self._lock:
+            self._spent = self._saved = 0.0
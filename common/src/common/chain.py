@@ -0,0 +1,108 @@
+"""
+Applying blocks to chain state, with undo records for reorgs.
+
+A block's effect is two appends: its outputs go to the end of the output
+set and its key images into the spent set. BlockUndo records just enough to
+reverse that, the output count before the block and the images it spent,
+so undoing d blocks costs O(changes in those blocks), not a rebuild.
+monero.chain and fcmp.chain fill in where outputs live.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from common.keyimages import SpentSet
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class BlockUndo:
+    height: int  # blocks applied before this one
+    n_outputs: int  # output count before this one
+    key_images: Tuple[int, ...]
+
+
+class BaseChainState(ABC, Generic[T]):
+    """
+    Spent set, height and undo log; subclasses store the outputs.
+
+    apply_block() checks only what depends on state (key images unspent and
+    not repeated inside the block); the txs' proofs must have been verified
+    already. Either the whole block is applied or, on error, none of it.
+    The last max_undo blocks can be undone (None: all of them).
+    """
+
+    def __init__(
+        self, spent: Optional[SpentSet] = None, max_undo: Optional[int] = 128
+    ):
+        self.spent: SpentSet = spent if spent is not None else set()
+        self.height = 0
+        self._undo: Deque[BlockUndo] = deque(maxlen=max_undo)
+
+    @property
+    def undo_depth(self) -> int:
+        """How many blocks undo_block() can still take back."""
+        return len(self._undo)
+
+    def apply_block(self, txs: Sequence[T]) -> BlockUndo:
+        images = [I for tx in txs for I in self._key_images(tx)]
+        if len(set(images)) != len(images):
+            raise ValueError("Block spends a key image twice")
+        if any(I in self.spent for I in images):
+            raise ValueError("Block spends a spent key image")
+
+        undo = self._undo_record(tuple(images))
+        try:
+            self._append_outputs(txs)
+            self.spent.update(images)
+        except BaseException:
+            self._rewind(undo)
+            raise
+        self.height += 1
+        self._undo.append(undo)
+        return undo
+
+    def apply_blocks(self, blocks: Iterable[Sequence[T]]) -> List[BlockUndo]:
+        return [self.apply_block(txs) for txs in blocks]
+
+    def undo_block(self) -> BlockUndo:
+        """Take back the newest block and return its undo record."""
+        if not self._undo:
+            raise IndexError("No block to undo")
+        undo = self._undo.pop()
+        self._rewind(undo)
+        self.height = undo.height
+        return undo
+
+    def undo_blocks(self, depth: int) -> List[BlockUndo]:
+        """Take back the newest depth blocks, newest first."""
+        if depth > len(self._undo):
+            raise IndexError(f"Can only undo {len(self._undo)} blocks")
+        return [self.undo_block() for _ in range(depth)]
+
+    def _rewind(self, undo: BlockUndo) -> None:
+        for I in undo.key_images:
+            self.spent.discard(I)
+        self._truncate_outputs(undo)
+
+    def _undo_record(self, images: Tuple[int, ...]) -> BlockUndo:
+        return BlockUndo(self.height, self._n_outputs(), images)
+
+    @abstractmethod
+    def _key_images(self, tx: T) -> Iterable[int]:
+        ...
+
+    @abstractmethod
+    def _n_outputs(self) -> int:
+        ...
+
+    @abstractmethod
+    def _append_outputs(self, txs: Sequence[T]) -> None:
+        ...
+
+    @abstractmethod
+    def _truncate_outputs(self, undo: BlockUndo) -> None:
+        ...
@@ -15,3 +15,40 @@ def hash_mod(*data: bytes, mod: Optional[int] = None) -> int:
         h.update(d)
     val = int.from_bytes(h.digest(), "big")
     return val % mod if mod else val
+
+
+class Transcript:
+    """
+    Incremental SHA256 transcript.
+
+    Absorbs a fixed prefix once and forks the hash state for each suffix, so
+    ``Transcript(a, b).challenge(c, mod=q) == hash_mod(a, b, c, mod=q)``
+    without re-hashing ``a`` and ``b`` every time.
+    """
+
+    __slots__ = ("_h",)
+
+    def __init__(self, *data: bytes):
+        self._h = hashlib.sha256()
+        for d in data:
+            self._h.update(d)
+
+    def absorb(self, *data: bytes) -> "Transcript":
+        """Append data to the transcript prefix."""
+        for d in data:
+            self._h.update(d)
+        return self
+
+    def fork(self) -> "Transcript":
+        """Return an independent copy of the current transcript state."""
+        t = Transcript.__new__(Transcript)
+        t._h = self._h.copy()
+        return t
+
+    def challenge(self, *data: bytes, mod: Optional[int] = None) -> int:
+        """Hash prefix + data and optionally apply modulo. Leaves the prefix intact."""
+        h = self._h.copy()
+        for d in data:
+            h.update(d)
+        val = int.from_bytes(h.digest(), "big")
+        return val % mod if mod else val
@@ -0,0 +1,265 @@
+"""
+Persistent spent-key-image store.
+
+Key images are kept as fixed 32-byte big-endian records in sorted segment
+files, each memory-mapped and binary-searched. New images collect in an
+in-memory memtable that is flushed to a new segment when full, and segments
+are merged once there are too many of them. A Bloom filter over every
+stored image sits in front of the segments so that most fresh images are
+answered without touching disk.
+"""
+
+import hashlib
+import heapq
+import math
+import mmap
+import os
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Optional, Set, Union
+
+from common.crypto import to_bytes
+
+RECORD_SIZE = 32
+_SEGMENT_SUFFIX = ".ki"
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float = 0.01):
+        if capacity <= 0 or not 0 < fp_rate < 1:
+            raise ValueError("Bad Bloom filter parameters")
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.m = max(8, int(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def _positions(self, item: bytes) -> Iterator[int]:
+        d = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "big")
+        h2 = int.from_bytes(d[8:], "big") | 1
+        m = self.m
+        return ((h1 + i * h2) % m for i in range(self.k))
+
+    def add(self, item: bytes) -> None:
+        bits = self.bits
+        for p in self._positions(item):
+            bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, item: bytes) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+
+class _Segment:
+    """A read-only, sorted file of 32-byte records, accessed through mmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        size = os.path.getsize(path)
+        if size % RECORD_SIZE:
+            raise ValueError(f"Corrupt segment {path}")
+        self.n = size // RECORD_SIZE
+        self._f = open(path, "rb")
+        self._mm = None
+        if size:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> bytes:
+        off = i * RECORD_SIZE
+        return self._mm[off : off + RECORD_SIZE]
+
+    def __contains__(self, rec: bytes) -> bool:
+        i = bisect_left(self, rec)
+        return i < self.n and self[i] == rec
+
+    def __iter__(self) -> Iterator[bytes]:
+        for i in range(self.n):
+            yield self[i]
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._f.close()
+
+
+class KeyImageStore:
+    """
+    Disk-backed set of spent key images; a drop-in for the Set[int] that
+    verify_tx and verify_block take (supports `in`, add and update).
+
+    Durability: only segments are on disk. Images still in the memtable
+    reach disk at flush() (when it fills, or on close()), and discard()
+    keeps its tombstones in memory until merge() or close() rewrites the
+    segments without them. After a crash, reopening the store loses the
+    unflushed adds and brings back the discarded images that are still in
+    a segment. Call flush() and merge() where that matters, e.g. after
+    undoing blocks.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        memtable_limit: int = 1 << 16,
+        max_segments: int = 8,
+        bloom_capacity: int = 1 << 20,
+        fp_rate: float = 0.01,
+    ):
+        self.path = path
+        self.memtable_limit = memtable_limit
+        self.max_segments = max_segments
+        self.fp_rate = fp_rate
+        self._mem: Set[bytes] = set()
+        # Discarded images still present in some segment
+        self._dead: Set[bytes] = set()
+        self._segments: List[_Segment] = []
+        self._next_id = 0
+        # Bloom-filter outcomes for lookups that miss the memtable
+        self.bloom_rejects = 0
+        self.disk_lookups = 0
+
+        os.makedirs(path, exist_ok=True)
+        names = sorted(n for n in os.listdir(path) if n.endswith(_SEGMENT_SUFFIX))
+        for name in names:
+            self._segments.append(_Segment(os.path.join(path, name)))
+            self._next_id = max(self._next_id, int(name[: -len(_SEGMENT_SUFFIX)]) + 1)
+        on_disk = sum(len(s) for s in self._segments)
+        self._bloom = BloomFilter(max(bloom_capacity, 2 * on_disk), fp_rate)
+        for seg in self._segments:
+            for rec in seg:
+                self._bloom.add(rec)
+
+    def __enter__(self) -> "KeyImageStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        on_disk = sum(len(s) for s in self._segments)
+        return len(self._mem) + on_disk - len(self._dead)
+
+    def __contains__(self, I: int) -> bool:
+        return self._lookup(to_bytes(I), count=True)
+
+    def contains(self, I: int) -> bool:
+        return I in self
+
+    def add(self, I: int) -> None:
+        rec = to_bytes(I)
+        if rec in self._dead:
+            self._dead.discard(rec)
+            return
+        if self._lookup(rec):
+            return
+        self._mem.add(rec)
+        self._bloom.add(rec)
+        if len(self._mem) >= self.memtable_limit:
+            self.flush()
+
+    def update(self, images: Iterable[int]) -> None:
+        """
+        Bulk insert. Large batches are sorted and written straight to a new
+        segment instead of going through the memtable.
+        """
+        recs = {to_bytes(I) for I in images}
+        if self._dead:
+            self._dead -= recs
+        recs = {rec for rec in recs if not self._lookup(rec)}
+        for rec in recs:
+            self._bloom.add(rec)
+        if len(recs) < self.memtable_limit:
+            self._mem |= recs
+            if len(self._mem) >= self.memtable_limit:
+                self.flush()
+            return
+        self._write_segment(sorted(recs))
+        self._maybe_merge()
+
+    def discard(self, I: int) -> None:
+        """Remove I if present."""
+        rec = to_bytes(I)
+        if rec in self._mem:
+            self._mem.discard(rec)
+        elif self._lookup(rec):
+            self._dead.add(rec)
+
+    def flush(self) -> None:
+        """Write the memtable to a new sorted segment."""
+        if not self._mem:
+            return
+        self._write_segment(sorted(self._mem))
+        self._mem = set()
+        self._maybe_merge()
+
+    def merge(self) -> None:
+        """Merge all segments into one, dropping duplicates and discarded images."""
+        if len(self._segments) < 2 and not self._dead:
+            return
+        old, dead = self._segments, self._dead
+        merged: List[bytes] = []
+        last: Optional[bytes] = None
+        for rec in heapq.merge(*old):
+            if rec != last and rec not in dead:
+                merged.append(rec)
+            last = rec
+        self._segments = []
+        self._dead = set()
+        self._write_segment(merged)
+        for seg in old:
+            seg.close()
+            os.remove(seg.path)
+
+    def close(self) -> None:
+        self.flush()
+        if self._dead:
+            self.merge()
+        for seg in self._segments:
+            seg.close()
+        self._segments = []
+
+    def _lookup(self, rec: bytes, count: bool = False) -> bool:
+        if rec in self._mem:
+            return True
+        if rec in self._dead:
+            return False
+        if rec not in self._bloom:
+            if count:
+                self.bloom_rejects += 1
+            return False
+        if count:
+            self.disk_lookups += 1
+        return any(rec in seg for seg in reversed(self._segments))
+
+    def _write_segment(self, recs: List[bytes]) -> None:
+        name = f"{self._next_id:08d}{_SEGMENT_SUFFIX}"
+        self._next_id += 1
+        final = os.path.join(self.path, name)
+        tmp = final + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"".join(recs))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, final)
+        self._segments.append(_Segment(final))
+
+    def _maybe_merge(self) -> None:
+        if len(self._segments) > self.max_segments:
+            self.merge()
+        # Grow the filter by doubling to keep the false-positive rate bounded
+        if len(self) > self._bloom.capacity:
+            self._rebuild_bloom(2 * len(self))
+
+    def _rebuild_bloom(self, capacity: int) -> None:
+        self._bloom = BloomFilter(capacity, self.fp_rate)
+        for rec in self._mem:
+            self._bloom.add(rec)
+        for seg in self._segments:
+            for rec in seg:
+                self._bloom.add(rec)
+
+
+# What verify_tx and friends accept as the double-spend set
+SpentSet = Union[Set[int], KeyImageStore]
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from typing import List, Sequence, Tuple
 from common.group import CryptoParams
 import secrets
+from common.cache import CacheStats, LRUCache
 from common.crypto import hash_mod, to_bytes
 
 
@@ -34,33 +36,66 @@ def gen_key(pp: CryptoParams) -> FCMPKey:
     return FCMPKey(sk=sk, P=(pp.g * sk) % pp.q, I=(pp.U * sk) % pp.q)
 
 
-def Hp(pp: CryptoParams, P: int) -> int:
+# Hp results keyed on (q, U, P) -- the only parameters Hp depends on.
+# Decoys repeat across the rings in a block, so most lookups hit.
+HP_CACHE: LRUCache = LRUCache(maxsize=1 << 16)
+
+
+def _Hp(pp: CryptoParams, P: int) -> int:
     return ((hash_mod(b"KI", to_bytes(P), mod=pp.q) or 1) * pp.U) % pp.q
 
 
+def Hp(pp: CryptoParams, P: int) -> int:
+    key = (pp.q, pp.U, P)
+    val = HP_CACHE.get(key)
+    if val is None:
+        val = _Hp(pp, P)
+        HP_CACHE.put(key, val)
+    return val
+
+
+def hp_cache_invalidate(pp: CryptoParams, P: int) -> bool:
+    """Drop the cached Hp(pp, P). Returns whether it was cached."""
+    return HP_CACHE.invalidate((pp.q, pp.U, P))
+
+
+def hp_cache_clear() -> None:
+    HP_CACHE.clear()
+
+
+def hp_cache_stats() -> CacheStats:
+    return HP_CACHE.stats()
+
+
 def key_image(pp: CryptoParams, kp: Keypair) -> int:
     return (Hp(pp, kp.P) * kp.sk) % pp.q
 
 
-def prove_spend(
-    pp: CryptoParams, key: FCMPKey, root: int, ctx: bytes = b""
-) -> SpendProof:
-    r = secrets.randbelow(pp.q - 1) + 1
-    A1 = (pp.g * r) % pp.q
-    A2 = (pp.U * r) % pp.q
-    e = (
+def _spend_challenge(
+    pp: CryptoParams, P: int, I: int, root: int, A1: int, A2: int, ctx: bytes
+) -> int:
+    return (
         hash_mod(
             b"DL-EQ",
             ctx,
             to_bytes(root),
-            to_bytes(key.P),
-            to_bytes(key.I),
+            to_bytes(P),
+            to_bytes(I),
             to_bytes(A1),
             to_bytes(A2),
             mod=pp.q,
         )
         or 1
     )
+
+
+def prove_spend(
+    pp: CryptoParams, key: FCMPKey, root: int, ctx: bytes = b""
+) -> SpendProof:
+    r = secrets.randbelow(pp.q - 1) + 1
+    A1 = (pp.g * r) % pp.q
+    A2 = (pp.U * r) % pp.q
+    e = _spend_challenge(pp, key.P, key.I, root, A1, A2, ctx)
     z = (r + e * key.sk) % pp.q
     return SpendProof(A1, A2, z)
 
@@ -68,19 +103,58 @@ def prove_spend(
 def verify_spend(
     pp: CryptoParams, P: int, I: int, root: int, proof: SpendProof, ctx: bytes = b""
 ) -> bool:
-    e = (
-        hash_mod(
-            b"DL-EQ",
-            ctx,
-            to_bytes(root),
-            to_bytes(P),
-            to_bytes(I),
-            to_bytes(proof.A1),
-            to_bytes(proof.A2),
-            mod=pp.q,
-        )
-        or 1
-    )
+    e = _spend_challenge(pp, P, I, root, proof.A1, proof.A2, ctx)
     return (pp.g * proof.z) % pp.q == (proof.A1 + e * P) % pp.q and (
         pp.U * proof.z
     ) % pp.q == (proof.A2 + e * I) % pp.q
+
+
+# (P, I, root, proof, ctx)
+SpendItem = Tuple[int, int, int, SpendProof, bytes]
+
+
+def verify_spend_batch(pp: CryptoParams, items: Sequence[SpendItem]) -> List[bool]:
+    """
+    Verify many spend proofs with one randomized linear-combination check.
+
+    Both equations of every proof are folded into
+        g * sum(w_i z_i) + U * sum(v_i z_i)
+            == sum(w_i (A1_i + e_i P_i) + v_i (A2_i + e_i I_i))
+    with fresh random 128-bit weights. If the combined check fails, the batch
+    is bisected to locate the offending proofs. Returns one result per item.
+    """
+    q = pp.q
+    # (P, I, proof, e) with challenges computed once up front
+    terms = [
+        (P, I, prf, _spend_challenge(pp, P, I, root, prf.A1, prf.A2, ctx))
+        for P, I, root, prf, ctx in items
+    ]
+    results = [True] * len(terms)
+
+    def combined_ok(lo: int, hi: int) -> bool:
+        zg = zu = rhs = 0
+        for P, I, prf, e in terms[lo:hi]:
+            w = secrets.randbits(128) | 1
+            v = secrets.randbits(128) | 1
+            zg += w * prf.z
+            zu += v * prf.z
+            rhs += w * (prf.A1 + e * P) + v * (prf.A2 + e * I)
+        return (pp.g * zg + pp.U * zu - rhs) % q == 0
+
+    def single_ok(i: int) -> bool:
+        P, I, prf, e = terms[i]
+        return (pp.g * prf.z - prf.A1 - e * P) % q == 0 and (
+            pp.U * prf.z - prf.A2 - e * I
+        ) % q == 0
+
+    def bisect(lo: int, hi: int) -> None:
+        if hi - lo == 1:
+            results[lo] = single_ok(lo)
+        elif not combined_ok(lo, hi):
+            mid = (lo + hi) // 2
+            bisect(lo, mid)
+            bisect(mid, hi)
+
+    if terms:
+        bisect(0, len(terms))
+    return results
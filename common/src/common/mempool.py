@@ -0,0 +1,346 @@
+"""
+Pool of pending transactions.
+
+Entries are indexed by tx-id (sha256 of the wire encoding) and by key image,
+so duplicates and double-spends against the pool are found with one dict
+lookup each. Two heaps with lazy deletion order the pool by fee per byte:
+a max-heap for building block templates and a min-heap for evicting the
+cheapest txs once the encoded size of the pool passes max_bytes.
+
+The pool is generic over the tx type; monero.mempool and fcmp.mempool plug
+in their encoding and crypto checks. Crypto runs once, on admission. When
+the chain moves on, on_spent() and on_roots() drop only the txs touched by
+the change, through the indexes, so nothing is re-verified.
+"""
+
+import hashlib
+import heapq
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+@dataclass
+class PoolEntry(Generic[T]):
+    txid: bytes
+    tx: T
+    size: int  # encoded bytes
+    fee: int
+    key_images: Tuple[int, ...]
+    roots: Tuple[int, ...]
+    seq: int  # arrival order, breaks fee-rate ties
+
+    @property
+    def fee_rate(self) -> float:
+        return self.fee / self.size
+
+
+@dataclass
+class PoolStats:
+    added: int = 0
+    duplicate: int = 0
+    conflict: int = 0
+    spent: int = 0
+    stale_root: int = 0
+    invalid: int = 0
+    low_fee: int = 0
+    evicted: int = 0
+    # Left the pool because a block included them or spent their images
+    mined: int = 0
+    dropped: int = 0
+
+
+class Mempool(Generic[T]):
+    """
+    Pending txs, first seen wins: a tx reusing a key image already in the
+    pool is rejected, whatever its fee.
+
+    encode gives the canonical bytes (tx-id and size), key_images and roots
+    the inputs' key images and the tree roots they were proven against (none
+    for ring txs), and check runs the state-independent checks on a batch.
+    Admission also requires key images not in spent and, after on_roots(),
+    roots accepted by the current root filter.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[T], bytes],
+        key_images: Callable[[T], Iterable[int]],
+        check: Callable[[List[T]], List[bool]],
+        roots: Callable[[T], Iterable[int]] = lambda tx: (),
+        fee: Callable[[T], int] = attrgetter("fee"),
+        spent: Optional[Collection[int]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.encode = encode
+        self.key_images = key_images
+        self.check = check
+        self.roots = roots
+        self.fee = fee
+        self.spent: Collection[int] = spent if spent is not None else set()
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._root_ok: Optional[Callable[[int], bool]] = None
+        self._seq = 0
+        self._stats = PoolStats()
+        self._entries: Dict[bytes, PoolEntry[T]] = {}
+        self._by_image: Dict[int, bytes] = {}
+        self._by_root: Dict[int, Set[bytes]] = {}
+        # (-rate, seq, txid) and (rate, -seq, txid); entries no longer in
+        # _entries are skipped when met and purged on compaction
+        self._best: List[Tuple[float, int, bytes]] = []
+        self._worst: List[Tuple[float, int, bytes]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, txid: bytes) -> bool:
+        return txid in self._entries
+
+    def get(self, txid: bytes) -> Optional[T]:
+        e = self._entries.get(txid)
+        return e.tx if e is not None else None
+
+    def entry(self, txid: bytes) -> Optional[PoolEntry[T]]:
+        return self._entries.get(txid)
+
+    def txid(self, tx: T) -> bytes:
+        return hashlib.sha256(self.encode(tx)).digest()
+
+    def spender(self, I: int) -> Optional[bytes]:
+        """Tx-id of the pooled tx spending key image I, if any."""
+        return self._by_image.get(I)
+
+    def stats(self) -> PoolStats:
+        return PoolStats(**vars(self._stats))
+
+    def add(self, tx: T) -> bool:
+        """Admit one tx; False if it was rejected (see stats() for why)."""
+        return self.add_many([tx])[0]
+
+    def add_many(self, txs: List[T]) -> List[bool]:
+        """
+        Admit txs in order, running check once on the batch of those that
+        pass the cheap checks. Within the batch, too, the first spender of a
+        key image wins.
+        """
+        results = [False] * len(txs)
+        cands: List[PoolEntry[T]] = []
+        owners: List[int] = []
+        claimed: Set[int] = set()
+        ids: Set[bytes] = set()
+        for t, tx in enumerate(txs):
+            e = self._precheck(tx, claimed, ids)
+            if e is not None:
+                claimed.update(e.key_images)
+                ids.add(e.txid)
+                cands.append(e)
+                owners.append(t)
+
+        for t, e, ok in zip(owners, cands, self.check([e.tx for e in cands])):
+            if not ok:
+                self._stats.invalid += 1
+            elif self._make_room(e):
+                self._insert(e)
+                results[t] = True
+        return results
+
+    def remove(self, txid: bytes) -> Optional[T]:
+        """Take a tx out of the pool, returning it if it was there."""
+        e = self._entries.get(txid)
+        if e is None:
+            return None
+        self._delete(e)
+        self._stats.dropped += 1
+        return e.tx
+
+    def on_block(self, txs: Iterable[T]) -> None:
+        """
+        A block with txs was accepted: drop them, and every pooled tx that
+        spends one of their key images.
+        """
+        images: List[int] = []
+        for tx in txs:
+            e = self._entries.get(self.txid(tx))
+            if e is not None:
+                self._delete(e)
+                self._stats.mined += 1
+            images.extend(self.key_images(tx))
+        self.on_spent(images)
+
+    def on_spent(self, images: Iterable[int]) -> None:
+        """Key images joined the spent set: drop the pooled txs using them."""
+        for I in images:
+            txid = self._by_image.get(I)
+            if txid is not None:
+                self._delete(self._entries[txid])
+                self._stats.mined += 1
+
+    def on_roots(self, root_ok: Callable[[int], bool]) -> None:
+        """
+        The tree moved on: keep root_ok as the admission filter and drop the
+        pooled txs proven against a root it rejects. Each distinct root is
+        tested once.
+        """
+        self._root_ok = root_ok
+        for r in [r for r in self._by_root if not root_ok(r)]:
+            for txid in list(self._by_root.get(r, ())):
+                self._delete(self._entries[txid])
+                self._stats.stale_root += 1
+
+    def block_template(
+        self, max_bytes: Optional[int] = None, max_txs: Optional[int] = None
+    ) -> List[T]:
+        """
+        Highest fee per byte first, greedily skipping txs that do not fit in
+        max_bytes. The pool holds no conflicting txs, so the result can go
+        into a block as it is.
+        """
+        budget = max_bytes if max_bytes is not None else self.nbytes
+        limit = max_txs if max_txs is not None else len(self._entries)
+        heap, out = list(self._best), []
+        entries = self._entries
+        while heap and len(out) < limit and budget > 0:
+            _, seq, txid = heapq.heappop(heap)
+            e = entries.get(txid)
+            if e is not None and e.seq == seq and e.size <= budget:
+                out.append(e.tx)
+                budget -= e.size
+        return out
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_image.clear()
+        self._by_root.clear()
+        self._best.clear()
+        self._worst.clear()
+        self.nbytes = 0
+
+    def _precheck(
+        self, tx: T, claimed: Set[int], ids: Set[bytes]
+    ) -> Optional[PoolEntry[T]]:
+        stats = self._stats
+        blob = self.encode(tx)
+        txid = hashlib.sha256(blob).digest()
+        if txid in self._entries or txid in ids:
+            stats.duplicate += 1
+            return None
+        images = tuple(self.key_images(tx))
+        if len(set(images)) != len(images):
+            stats.invalid += 1
+            return None
+        for I in images:
+            if I in self._by_image or I in claimed:
+                stats.conflict += 1
+                return None
+        for I in images:
+            if I in self.spent:
+                stats.spent += 1
+                return None
+        roots = tuple(set(self.roots(tx)))
+        if self._root_ok is not None and not all(map(self._root_ok, roots)):
+            stats.stale_root += 1
+            return None
+        self._seq += 1
+        e = PoolEntry(txid, tx, len(blob), self.fee(tx), images, roots, self._seq)
+        if not self._may_fit(e):
+            stats.low_fee += 1
+            return None
+        return e
+
+    def _may_fit(self, e: PoolEntry[T]) -> bool:
+        # Cheap pre-check: too big, or full and no better than the cheapest
+        if e.size > self.max_bytes:
+            return False
+        if self.nbytes + e.size <= self.max_bytes:
+            return True
+        worst = self._peek_worst()
+        return worst is not None and worst.fee_rate < e.fee_rate
+
+    def _make_room(self, e: PoolEntry[T]) -> bool:
+        """Evict strictly cheaper txs until e fits, or evict none and say no."""
+        if e.size > self.max_bytes:
+            self._stats.low_fee += 1
+            return False
+        need = self.nbytes + e.size - self.max_bytes
+        if need <= 0:
+            return True
+        # Pop the cheapest txs off the eviction heap, pushing them back if
+        # evicting all that are cheaper than e would still not free enough
+        popped: List[Tuple[float, int, bytes]] = []
+        freed = 0
+        while freed < need:
+            v = self._peek_worst()
+            if v is None or v.fee_rate >= e.fee_rate:
+                break
+            popped.append(heapq.heappop(self._worst))
+            freed += v.size
+        if freed < need:
+            for item in popped:
+                heapq.heappush(self._worst, item)
+            self._stats.low_fee += 1
+            return False
+        for _, _, txid in popped:
+            self._delete(self._entries[txid])
+            self._stats.evicted += 1
+        return True
+
+    def _peek_worst(self) -> Optional[PoolEntry[T]]:
+        heap, entries = self._worst, self._entries
+        while heap:
+            e = entries.get(heap[0][2])
+            if e is not None and e.seq == -heap[0][1]:
+                return e
+            heapq.heappop(heap)
+        return None
+
+    def _insert(self, e: PoolEntry[T]) -> None:
+        self._entries[e.txid] = e
+        for I in e.key_images:
+            self._by_image[I] = e.txid
+        for r in e.roots:
+            self._by_root.setdefault(r, set()).add(e.txid)
+        rate = e.fee_rate
+        heapq.heappush(self._best, (-rate, e.seq, e.txid))
+        heapq.heappush(self._worst, (rate, -e.seq, e.txid))
+        self.nbytes += e.size
+        self._stats.added += 1
+
+    def _delete(self, e: PoolEntry[T]) -> None:
+        del self._entries[e.txid]
+        for I in e.key_images:
+            del self._by_image[I]
+        for r in e.roots:
+            ids = self._by_root[r]
+            ids.discard(e.txid)
+            if not ids:
+                del self._by_root[r]
+        self.nbytes -= e.size
+        # Heap slots are left behind; rebuild once they outnumber live ones
+        if len(self._best) > 2 * len(self._entries) + 64:
+            self._compact()
+
+    def _compact(self) -> None:
+        live = self._entries.values()
+        self._best = [(-e.fee_rate, e.seq, e.txid) for e in live]
+        self._worst = [(e.fee_rate, -e.seq, e.txid) for e in live]
+        heapq.heapify(self._best)
+        heapq.heapify(self._worst)
+
@@ -0,0 +1,77 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BlockResult:
+    """Per-tx verification results (in block order) plus wall-clock time."""
+
+    results: List[bool]
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return all(self.results)
+
+    @property
+    def tx_per_sec(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def map_chunks(
+    fn: Callable[[List[T]], List[R]],
+    items: Sequence[T],
+    workers: int = 1,
+    chunksize: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[R]:
+    """
+    Apply fn to consecutive chunks of items and concatenate the results in order.
+
+    With workers <= 1 and no executor, fn runs inline on the whole sequence.
+    Otherwise chunks are fanned out to executor, or to a ProcessPoolExecutor
+    created for this call; fn must then be picklable (a module-level function
+    or a functools.partial of one).
+    """
+    items = list(items)
+    if not items:
+        return []
+    if executor is None and workers <= 1:
+        return fn(items)
+
+    if chunksize is None:
+        # A few chunks per worker keeps the pool busy when chunk costs vary
+        chunksize = max(1, -(-len(items) // (max(workers, 1) * 4)))
+    chunks = [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+
+    out: List[R] = []
+    if executor is not None:
+        for part in executor.map(fn, chunks):
+            out.extend(part)
+        return out
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for part in ex.map(fn, chunks):
+            out.extend(part)
+    return out
+
+
+def mark_conflicts(key_images: Sequence[Sequence[int]], results: List[bool]) -> None:
+    """
+    Reject, in place, every tx that reuses a key image within the block.
+
+    Txs are taken in block order and only txs still marked valid claim their
+    key images, so the first valid spend of an image wins. A tx that repeats
+    an image among its own inputs is rejected too.
+    """
+    claimed = set()
+    for t, images in enumerate(key_images):
+        if not results[t]:
+            continue
+        if len(set(images)) != len(images) or any(I in claimed for I in images):
+            results[t] = False
+            continue
+        claimed.update(images)
@@ -0,0 +1,221 @@
+"""
+Primitives for the binary wire format.
+
+All integers are big-endian. Scalars and group elements are fixed 32-byte
+fields; variable-length blobs carry a u32 length prefix. Readers work on a
+memoryview so sub-fields can be sliced out without copying.
+"""
+
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Generic, List, Optional, TypeVar, Union
+
+from common.keys import SpendProof
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+SCALAR_SIZE = 32
+
+V = TypeVar("V")  # input view
+O = TypeVar("O")  # output
+T = TypeVar("T")  # transaction
+
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_U64 = struct.Struct(">Q")
+
+
+class DecodeError(ValueError):
+    """Raised when a buffer is truncated, malformed or of an unknown version."""
+
+
+class Writer:
+    def __init__(self):
+        self.buf = bytearray()
+
+    def u8(self, x: int) -> "Writer":
+        self.buf += _U8.pack(x)
+        return self
+
+    def u16(self, x: int) -> "Writer":
+        self.buf += _U16.pack(x)
+        return self
+
+    def u32(self, x: int) -> "Writer":
+        self.buf += _U32.pack(x)
+        return self
+
+    def u64(self, x: int) -> "Writer":
+        self.buf += _U64.pack(x)
+        return self
+
+    def scalar(self, x: int) -> "Writer":
+        self.buf += x.to_bytes(SCALAR_SIZE, "big")
+        return self
+
+    def raw(self, data: Buffer) -> "Writer":
+        self.buf += data
+        return self
+
+    def blob(self, data: Buffer) -> "Writer":
+        """Length-prefixed (u32) byte string."""
+        self.u32(len(data))
+        self.buf += data
+        return self
+
+    def getvalue(self) -> bytes:
+        return bytes(self.buf)
+
+
+class Reader:
+    def __init__(self, data: Buffer, pos: int = 0):
+        self.mv = data if isinstance(data, memoryview) else memoryview(data)
+        self.pos = pos
+
+    def _take(self, n: int) -> memoryview:
+        end = self.pos + n
+        if end > len(self.mv):
+            raise DecodeError("Truncated buffer")
+        out = self.mv[self.pos : end]
+        self.pos = end
+        return out
+
+    def u8(self) -> int:
+        return _U8.unpack(self._take(1))[0]
+
+    def u16(self) -> int:
+        return _U16.unpack(self._take(2))[0]
+
+    def u32(self) -> int:
+        return _U32.unpack(self._take(4))[0]
+
+    def u64(self) -> int:
+        return _U64.unpack(self._take(8))[0]
+
+    def scalar(self) -> int:
+        return int.from_bytes(self._take(SCALAR_SIZE), "big")
+
+    def raw(self, n: int) -> memoryview:
+        return self._take(n)
+
+    def blob(self) -> memoryview:
+        return self._take(self.u32())
+
+    def skip(self, n: int) -> None:
+        self._take(n)
+
+    def skip_blob(self) -> None:
+        self._take(self.u32())
+
+    def at_end(self) -> bool:
+        return self.pos == len(self.mv)
+
+
+def scalars(mv: memoryview, n: int) -> List[int]:
+    """Decode n consecutive 32-byte scalars."""
+    if len(mv) < n * SCALAR_SIZE:
+        raise DecodeError("Truncated buffer")
+    return [
+        int.from_bytes(mv[i * SCALAR_SIZE : (i + 1) * SCALAR_SIZE], "big")
+        for i in range(n)
+    ]
+
+
+def write_header(w: Writer, magic: bytes, version: int) -> None:
+    w.raw(magic).u8(version)
+
+
+def read_header(r: Reader, magic: bytes, version: int) -> None:
+    if bytes(r.raw(len(magic))) != magic:
+        raise DecodeError("Bad magic")
+    v = r.u8()
+    if v != version:
+        raise DecodeError(f"Unsupported version {v}")
+
+
+def write_spend_proof(w: Writer, prf: SpendProof) -> None:
+    w.scalar(prf.A1).scalar(prf.A2).scalar(prf.z)
+
+
+def read_spend_proof(r: Reader) -> SpendProof:
+    return SpendProof(A1=r.scalar(), A2=r.scalar(), z=r.scalar())
+
+
+class BaseTxView(ABC, Generic[V, O, T]):
+    """
+    Zero-copy view over an encoded tx:
+        magic | version u8 | fee u64 | ctx blob | n_in u16 | n_in key images
+        | n_out u16 | n_in input bodies (blob each) | n_out outputs
+
+    Only the fixed header is parsed up front: fee, ctx and key images are
+    available immediately, inputs and outputs are decoded when accessed.
+    Subclasses name the format, the input view class (built from a key image
+    and the input body), the output reader and the tx type; the input and
+    output lists are exposed under the tx type's own field names.
+    """
+
+    MAGIC: bytes
+    VERSION: int
+    TXIN_VIEW: Callable[[int, memoryview], V]
+    TX: Callable[..., T]
+    IN_FIELD = "inputs"
+    OUT_FIELD = "outputs"
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        setattr(cls, cls.IN_FIELD, property(BaseTxView._input_views))
+        setattr(cls, cls.OUT_FIELD, property(BaseTxView._outputs))
+
+    def __init__(self, data: Buffer):
+        r = Reader(data)
+        read_header(r, self.MAGIC, self.VERSION)
+        self._mv = r.mv
+        self.fee = r.u64()
+        self._ctx = r.blob()
+        self.n_in = r.u16()
+        self._ki = r.raw(self.n_in * SCALAR_SIZE)
+        self.n_out = r.u16()
+        self._body_off = r.pos
+        self._ins: Optional[List[V]] = None
+        self._out_off: Optional[int] = None
+
+    @staticmethod
+    @abstractmethod
+    def read_txout(r: Reader) -> O:
+        ...
+
+    @property
+    def ctx(self) -> bytes:
+        return bytes(self._ctx)
+
+    @property
+    def key_images(self) -> List[int]:
+        return scalars(self._ki, self.n_in)
+
+    def _index_inputs(self) -> None:
+        r = Reader(self._mv, self._body_off)
+        images, view = self.key_images, self.TXIN_VIEW
+        self._ins = [view(images[k], r.blob()) for k in range(self.n_in)]
+        self._out_off = r.pos
+
+    def _input_views(self) -> List[V]:
+        if self._ins is None:
+            self._index_inputs()
+        return self._ins
+
+    def _outputs(self) -> List[O]:
+        if self._out_off is None:
+            self._index_inputs()
+        r = Reader(self._mv, self._out_off)
+        outs = [self.read_txout(r) for _ in range(self.n_out)]
+        if not r.at_end():
+            raise DecodeError("Trailing bytes")
+        return outs
+
+    def to_tx(self) -> T:
+        fields = {
+            self.IN_FIELD: [v.to_txin() for v in self._input_views()],
+            self.OUT_FIELD: self._outputs(),
+        }
+        return self.TX(fee=self.fee, ctx=self.ctx, **fields)
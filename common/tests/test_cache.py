@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+from common.cache import LRUCache, VerifyCache, VerifyStats
+
+
+def test_lru_get_put():
+    """Test basic hit/miss accounting."""
+    cache = LRUCache(maxsize=2)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_rate == 0.5
+
+
+def test_lru_eviction_order():
+    """Test that the least recently used entry is evicted first."""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats().evictions == 1
+
+
+def test_lru_invalidate_clear_resize():
+    """Test explicit invalidation and resizing."""
+    cache = LRUCache(maxsize=4)
+    for i in range(4):
+        cache.put(i, i)
+
+    assert cache.invalidate(0)
+    assert not cache.invalidate(0)
+    assert len(cache) == 3
+
+    cache.resize(1)
+    assert len(cache) == 1
+    assert 3 in cache
+
+    cache.clear()
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=-1)
+
+
+def test_lru_concurrent_access():
+    """Test that concurrent use keeps the size bound and counters consistent."""
+    cache = LRUCache(maxsize=64)
+
+    def worker(seed):
+        for i in range(2000):
+            cache.get_or_compute((seed * i) % 100, lambda: i)
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    assert len(cache) <= 64
+    assert stats.hits + stats.misses == 8 * 2000
+
+
+def test_verify_cache_skips_passed_items():
+    """Test only unseen items are checked, failures are retried, costs add up."""
+    cache = VerifyCache(maxsize=8)
+    calls = []
+
+    def check(items):
+        calls.append(list(items))
+        return [x % 2 == 0 for x in items]
+
+    keys = [bytes([x]) for x in range(4)]
+    assert cache.check_many(keys, range(4), check) == [True, False, True, False]
+    assert cache.check_many(keys, range(4), check) == [True, False, True, False]
+    assert calls == [[0, 1, 2, 3], [1, 3]]
+    assert cache.check(keys[0], lambda: False)
+    assert not cache.check(b"x", lambda: False)
+
+    s = cache.stats()
+    assert (s.hits, s.misses) == (3, 7) and len(cache) == 2
+    assert s.spent > 0 and 0 < s.saved <= s.spent
+    assert s.hit_rate == 0.3
+    cache.reset_stats()
+    assert cache.stats() == VerifyStats()
+
+
+def test_verify_cache_is_bounded():
+    cache = VerifyCache(maxsize=2)
+    for k in (b"a", b"b", b"c"):
+        cache.add(k, 1.0)
+    assert b"a" not in cache and len(cache) == 2
+    assert cache.stats().evictions == 1
@@ -0,0 +1,89 @@
+import pytest
+from common.chain import BaseChainState, BlockUndo
+from common.keyimages import KeyImageStore
+
+
+class ListChain(BaseChainState):
+    """Txs are (key images, outputs) pairs; outputs go to a list."""
+
+    def __init__(self, spent=None, max_undo=128, fail_at=None):
+        super().__init__(spent, max_undo)
+        self.outputs = []
+        self.fail_at = fail_at
+
+    def _key_images(self, tx):
+        return tx[0]
+
+    def _n_outputs(self):
+        return len(self.outputs)
+
+    def _append_outputs(self, txs):
+        for tx in txs:
+            for out in tx[1]:
+                if out == self.fail_at:
+                    raise OSError("disk full")
+                self.outputs.append(out)
+
+    def _truncate_outputs(self, undo):
+        del self.outputs[undo.n_outputs :]
+
+
+def test_apply_and_undo():
+    """Test undo records reverse blocks exactly, newest first."""
+    chain = ListChain()
+    u0 = chain.apply_block([((1, 2), ["a", "b"]), ((3,), ["c"])])
+    assert u0 == BlockUndo(0, 0, (1, 2, 3))
+    chain.apply_blocks([[((4,), ["d"])], [((5, 6), [])]])
+    assert chain.height == 3 and chain.spent == {1, 2, 3, 4, 5, 6}
+
+    assert [u.height for u in chain.undo_blocks(2)] == [2, 1]
+    assert chain.outputs == ["a", "b", "c"] and chain.spent == {1, 2, 3}
+    chain.undo_block()
+    assert chain.outputs == [] and chain.spent == set() and chain.height == 0
+    with pytest.raises(IndexError):
+        chain.undo_block()
+
+
+def test_output_hooks_are_abstract():
+    """Test a subclass missing the output hooks cannot be instantiated."""
+
+    class NoOutputs(BaseChainState):
+        def _key_images(self, tx):
+            return tx[0]
+
+    with pytest.raises(TypeError):
+        NoOutputs()
+
+
+def test_apply_rejects_double_spends_untouched():
+    """Test blocks reusing key images are refused before any change."""
+    chain = ListChain()
+    chain.apply_block([((1,), ["a"])])
+    with pytest.raises(ValueError, match="spent"):
+        chain.apply_block([((2,), ["b"]), ((1,), ["c"])])
+    with pytest.raises(ValueError, match="twice"):
+        chain.apply_block([((2,), ["b"]), ((2,), ["c"])])
+    assert chain.outputs == ["a"] and chain.spent == {1} and chain.height == 1
+
+
+def test_failed_apply_rolls_back():
+    """Test an error halfway through a block leaves the state as it was."""
+    chain = ListChain(fail_at="x")
+    chain.apply_block([((1,), ["a"])])
+    with pytest.raises(OSError):
+        chain.apply_block([((2,), ["b", "x"])])
+    assert chain.outputs == ["a"] and chain.spent == {1} and chain.undo_depth == 1
+
+
+def test_undo_depth_and_key_image_store(tmp_path):
+    """Test the undo log is bounded and a KeyImageStore works as spent set."""
+    with KeyImageStore(str(tmp_path), memtable_limit=4) as store:
+        chain = ListChain(spent=store, max_undo=3)
+        for h in range(6):
+            chain.apply_block([((10 * h, 10 * h + 1), [h])])
+        assert chain.undo_depth == 3
+        with pytest.raises(IndexError, match="only undo 3"):
+            chain.undo_blocks(4)
+        chain.undo_blocks(3)
+        assert chain.outputs == [0, 1, 2] and len(store) == 6
+        assert 30 not in store and 21 in store
@@ -1,5 +1,5 @@
 import pytest
-from common.crypto import hash_mod, to_bytes
+from common.crypto import hash_mod, to_bytes, Transcript
 
 
 def test_hash_mod_consistency():
@@ -22,3 +22,21 @@ def test_to_bytes():
     result = to_bytes(123, 4)
     assert result == b"\x00\x00\x00{"
     assert len(result) == 4
+
+
+def test_transcript_matches_hash_mod():
+    """Test that a forked transcript hashes the same bytes as hash_mod."""
+    tr = Transcript(b"prefix", b"more")
+    assert tr.challenge(b"suffix", mod=1000) == hash_mod(
+        b"prefix", b"more", b"suffix", mod=1000
+    )
+    # The prefix is left untouched by challenge()
+    assert tr.challenge(b"other") == hash_mod(b"prefix", b"more", b"other")
+
+
+def test_transcript_fork_is_independent():
+    """Test that absorbing into a fork does not affect the parent."""
+    tr = Transcript(b"a")
+    child = tr.fork().absorb(b"b")
+    assert child.challenge() == hash_mod(b"a", b"b")
+    assert tr.challenge() == hash_mod(b"a")
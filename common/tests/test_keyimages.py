@@ -0,0 +1,80 @@
+import os
+
+from common.keyimages import BloomFilter, KeyImageStore
+
+
+def test_bloom_filter():
+    """Test no false negatives and a bounded false-positive rate."""
+    bf = BloomFilter(capacity=1000, fp_rate=0.01)
+    items = [i.to_bytes(32, "big") for i in range(1000)]
+    for it in items:
+        bf.add(it)
+    assert all(it in bf for it in items)
+
+    fresh = [i.to_bytes(32, "big") for i in range(10**6, 10**6 + 5000)]
+    fp = sum(it in bf for it in fresh)
+    assert fp < 5000 * 0.05
+
+
+def test_store_add_contains(tmp_path):
+    """Test membership across memtable, flushed and merged segments."""
+    store = KeyImageStore(str(tmp_path), memtable_limit=4, max_segments=2)
+    images = [(1 << 250) + 7 * i for i in range(20)]
+    for I in images:
+        store.add(I)
+    store.add(images[0])  # duplicates are ignored
+
+    assert len(store) == 20
+    assert all(I in store for I in images)
+    assert 12345 not in store
+    assert not store.contains(images[0] + 1)
+    assert len(os.listdir(tmp_path)) <= 3
+    store.close()
+
+
+def test_store_bulk_insert_and_reopen(tmp_path):
+    """Test bulk insert persists and the store reopens with the same contents."""
+    images = list(range(1000, 3000, 3))
+    with KeyImageStore(str(tmp_path), memtable_limit=100) as store:
+        store.update(images)
+        store.update(images[:10])
+        store.add(5)
+        assert len(store) == len(images) + 1
+
+    reopened = KeyImageStore(str(tmp_path))
+    assert len(reopened) == len(images) + 1
+    assert all(I in reopened for I in images)
+    assert 5 in reopened
+    assert 1001 not in reopened
+    reopened.close()
+
+
+def test_store_bloom_prefilter(tmp_path):
+    """Test that fresh images are mostly rejected by the Bloom filter."""
+    store = KeyImageStore(str(tmp_path), memtable_limit=64, bloom_capacity=1000)
+    store.update(range(500))
+    store.flush()
+    for I in range(10**6, 10**6 + 1000):
+        assert I not in store
+    assert store.bloom_rejects > 900
+    store.close()
+
+
+def test_store_discard(tmp_path):
+    """Test discarded images leave the memtable and segments, durably."""
+    images = list(range(100, 160))
+    with KeyImageStore(str(tmp_path), memtable_limit=16) as store:
+        store.update(images[:40])
+        for I in images[40:]:
+            store.add(I)
+        for I in images[::3]:
+            store.discard(I)
+        store.discard(5)  # absent
+        assert len(store) == 40
+        assert all((I in store) == (i % 3 != 0) for i, I in enumerate(images))
+        store.add(images[0])
+        store.update([images[3]])
+        assert images[0] in store and images[3] in store and len(store) == 42
+    with KeyImageStore(str(tmp_path)) as store:
+        assert len(store) == 42
+        assert images[6] not in store and images[0] in store
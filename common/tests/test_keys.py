@@ -6,9 +6,13 @@ from common.keys import (
     keygen,
     gen_key,
     Hp,
+    hp_cache_clear,
+    hp_cache_invalidate,
+    hp_cache_stats,
     key_image,
     prove_spend,
     verify_spend,
+    verify_spend_batch,
 )
 from common.group import setup
 
@@ -165,3 +169,45 @@ def test_proof_uniqueness():
     # But both should verify
     assert verify_spend(pp, key.P, key.I, root, proof1)
     assert verify_spend(pp, key.P, key.I, root, proof2)
+
+
+def test_hash_to_point_cache():
+    """Test that Hp is memoized and the cache can be invalidated."""
+    pp = setup()
+    hp_cache_clear()
+    P = 424242
+
+    before = hp_cache_stats()
+    hp = Hp(pp, P)
+    assert Hp(pp, P) == hp
+    after = hp_cache_stats()
+    assert after.misses == before.misses + 1
+    assert after.hits == before.hits + 1
+
+    assert hp_cache_invalidate(pp, P)
+    assert not hp_cache_invalidate(pp, P)
+    assert Hp(pp, P) == hp
+
+
+def test_spend_proof_batch():
+    """Test batch verification agrees with verify_spend and finds bad proofs."""
+    pp = setup()
+    root = 98765
+    items = []
+    for i in range(9):
+        key = gen_key(pp)
+        ctx = b"ctx-%d" % i
+        items.append((key.P, key.I, root, prove_spend(pp, key, root, ctx), ctx))
+
+    assert verify_spend_batch(pp, items) == [True] * 9
+    assert verify_spend_batch(pp, []) == []
+
+    # Corrupt two proofs: wrong key image and wrong context
+    P, I, r, prf, ctx = items[2]
+    items[2] = (P, I + 1, r, prf, ctx)
+    P, I, r, prf, ctx = items[7]
+    items[7] = (P, I, r, prf, b"wrong-context")
+
+    expected = [verify_spend(pp, *item) for item in items]
+    assert verify_spend_batch(pp, items) == expected
+    assert [i for i, ok in enumerate(expected) if not ok] == [2, 7]
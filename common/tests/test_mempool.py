@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+import pytest
+from common.mempool import Mempool
+
+
+@dataclass
+class FakeTx:
+    images: Tuple[int, ...]
+    fee: int
+    size: int = 100
+    root: int = 0
+    valid: bool = True
+
+
+def encode(tx):
+    head = repr((tx.images, tx.fee, tx.root)).encode()
+    return head.ljust(tx.size, b"\0")
+
+
+def make_pool(**kw):
+    return Mempool(
+        encode,
+        lambda tx: tx.images,
+        lambda txs: [tx.valid for tx in txs],
+        roots=lambda tx: (tx.root,),
+        **kw,
+    )
+
+
+def test_add_and_conflicts():
+    """Test duplicates, pool and batch double-spends and spent images are refused."""
+    pool = make_pool(spent={9})
+    a = FakeTx((1, 2), fee=10)
+    assert pool.add(a)
+    assert pool.txid(a) in pool and pool.spender(2) == pool.txid(a)
+    assert not pool.add(a)
+    assert not pool.add(FakeTx((2, 3), fee=99))
+    assert not pool.add(FakeTx((9,), fee=5))
+    assert not pool.add(FakeTx((4,), fee=5, valid=False))
+    assert not pool.add(FakeTx((5, 5), fee=5))
+    assert pool.add_many([FakeTx((6,), 1), FakeTx((6, 7), 2), FakeTx((8,), 3)]) == [
+        True,
+        False,
+        True,
+    ]
+    s = pool.stats()
+    assert (s.added, s.duplicate, s.conflict, s.spent, s.invalid) == (3, 1, 2, 1, 2)
+    assert len(pool) == 3 and pool.nbytes == 300
+
+
+def test_block_template_orders_by_fee_rate():
+    """Test templates take the best fee per byte first and respect the size budget."""
+    pool = make_pool()
+    txs = [
+        FakeTx((1,), fee=10, size=100),  # 0.1
+        FakeTx((2,), fee=30, size=100),  # 0.3
+        FakeTx((3,), fee=40, size=200),  # 0.2
+        FakeTx((4,), fee=30, size=100),  # 0.3, later
+    ]
+    pool.add_many(txs)
+    assert pool.block_template() == [txs[1], txs[3], txs[2], txs[0]]
+    assert pool.block_template(max_txs=2) == [txs[1], txs[3]]
+    # The 200-byte tx does not fit after the first two; the cheap one does
+    assert pool.block_template(max_bytes=300) == [txs[1], txs[3], txs[0]]
+    # Removed and re-added txs appear once
+    pool.remove(pool.txid(txs[1]))
+    pool.add(txs[1])
+    assert pool.block_template() == [txs[3], txs[1], txs[2], txs[0]]
+
+
+def test_eviction_under_cap():
+    """Test a full pool evicts cheaper txs for better ones and refuses the rest."""
+    pool = make_pool(max_bytes=300)
+    low, mid, high = FakeTx((1,), 1), FakeTx((2,), 5), FakeTx((3,), 9)
+    assert pool.add_many([low, mid, high]) == [True, True, True]
+    assert not pool.add(FakeTx((4,), 1))
+    assert not pool.add(FakeTx((5,), 100, size=400))
+    big = FakeTx((6,), 100, size=200)
+    assert pool.add(big)
+    assert pool.block_template() == [big, high]
+    assert pool.nbytes == 300
+    s = pool.stats()
+    assert (s.evicted, s.low_fee) == (2, 2)
+    # Evicted key images are free again
+    assert pool.spender(1) is None and pool.add(FakeTx((1,), 50))
+
+
+def test_incremental_revalidation():
+    """Test new spent images and root changes drop only the affected txs."""
+    pool = make_pool()
+    txs = [FakeTx((i,), fee=i, root=i % 3) for i in range(1, 10)]
+    assert all(pool.add_many(txs))
+    pool.on_block([txs[0], FakeTx((2, 100), fee=1)])
+    assert txs[0] not in pool.block_template()
+    assert txs[1] not in pool.block_template()
+    assert len(pool) == 7 and pool.stats().mined == 2
+
+    pool.on_roots(lambda r: r != 0)
+    assert all(tx.root != 0 for tx in pool.block_template())
+    assert len(pool) == 4
+    assert not pool.add(FakeTx((50,), fee=1, root=0))
+    assert pool.add(FakeTx((50,), fee=1, root=1))
+    assert pool.stats().stale_root == 4
+
+
+def test_heap_compaction():
+    """Test lazy heap slots are purged after many removals."""
+    pool = make_pool()
+    for i in range(500):
+        pool.add(FakeTx((i,), fee=i + 1))
+    pool.on_spent(range(490))
+    pool.add(FakeTx((1000,), fee=1))
+    assert len(pool._best) < 100
+    assert [tx.images[0] for tx in pool.block_template()][:3] == [499, 498, 497]
+
+
+def test_bad_cap():
+    with pytest.raises(ValueError):
+        make_pool(max_bytes=0)
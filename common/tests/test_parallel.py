@@ -0,0 +1,27 @@
+import pytest
+from common.parallel import BlockResult, map_chunks, mark_conflicts
+
+
+def test_map_chunks_preserves_order():
+    """Test inline and process-pool runs return results in input order."""
+    items = list(range(37))
+    assert map_chunks(list, items) == items
+    assert map_chunks(list, items, workers=2, chunksize=5) == items
+    assert map_chunks(list, [], workers=2) == []
+
+
+def test_mark_conflicts():
+    """Test the first valid spend of a key image wins."""
+    images = [[1, 2], [3], [2, 4], [5, 5], [6], [6]]
+    results = [True, True, True, True, False, True]
+    mark_conflicts(images, results)
+    # tx 2 reuses 2, tx 3 repeats 5 itself, tx 5 is fine since tx 4 was invalid
+    assert results == [True, True, False, False, False, True]
+
+
+def test_block_result():
+    """Test aggregate fields."""
+    res = BlockResult([True, True, False, True], elapsed=2.0)
+    assert not res.ok
+    assert res.tx_per_sec == 2.0
+    assert BlockResult([], elapsed=0.0).tx_per_sec == 0.0
@@ -0,0 +1,47 @@
+import pytest
+from common.keys import SpendProof
+from common.wire import (
+    DecodeError,
+    Reader,
+    Writer,
+    read_header,
+    read_spend_proof,
+    scalars,
+    write_header,
+    write_spend_proof,
+)
+
+
+def test_writer_reader_roundtrip():
+    """Test primitive field round-trips."""
+    w = Writer()
+    write_header(w, b"TEST", 1)
+    w.u8(7).u16(513).u32(70000).u64(1 << 40).scalar((1 << 255) - 20).blob(b"abc")
+    write_spend_proof(w, SpendProof(1, 2, 3))
+
+    r = Reader(w.getvalue())
+    read_header(r, b"TEST", 1)
+    assert r.u8() == 7
+    assert r.u16() == 513
+    assert r.u32() == 70000
+    assert r.u64() == 1 << 40
+    assert r.scalar() == (1 << 255) - 20
+    assert bytes(r.blob()) == b"abc"
+    assert read_spend_proof(r) == SpendProof(1, 2, 3)
+    assert r.at_end()
+
+
+def test_reader_errors():
+    """Test truncated buffers, bad magic and unknown versions are rejected."""
+    with pytest.raises(DecodeError, match="Truncated"):
+        Reader(b"\x00").u16()
+
+    w = Writer()
+    write_header(w, b"TEST", 2)
+    with pytest.raises(DecodeError, match="version"):
+        read_header(Reader(w.getvalue()), b"TEST", 1)
+    with pytest.raises(DecodeError, match="magic"):
+        read_header(Reader(w.getvalue()), b"NOPE", 2)
+
+    with pytest.raises(DecodeError):
+        scalars(memoryview(bytes(40)), 2)
@@ -1,19 +1,55 @@
-from fcmp.tree import build, root, Tree
-from fcmp.zkproof import ZKProof
+from fcmp.tree import build, build_parallel, root, Tree, packed_layers
+from fcmp.zkproof import ZKProof, MultiProof, NodeMemo, prove_many, verify_many
+from fcmp.roots import RootHistory, RootStats
 from fcmp.tx import TxIn, TxOut, Tx, prove_range
-from fcmp.verify import verify_tx, prove_input, add_utxo, build_tree
+from fcmp.verify import (
+    verify_tx,
+    verify_txs,
+    verify_txs_crypto,
+    verify_block,
+    prove_input,
+    add_utxo,
+    build_tree,
+    live_tree,
+    root_accepted,
+)
+from fcmp.wire import TxView, encode_tx, decode_tx, tx_hash
+from fcmp.witness import WitnessTracker
+from fcmp.mempool import new_mempool, root_filter
+from fcmp.chain import ChainState
 
 __all__ = [
     "build",
+    "build_parallel",
     "root",
     "Tree",
+    "packed_layers",
     "ZKProof",
+    "MultiProof",
+    "NodeMemo",
+    "prove_many",
+    "verify_many",
+    "RootHistory",
+    "RootStats",
     "TxIn",
     "TxOut",
     "Tx",
     "prove_range",
     "verify_tx",
+    "verify_txs",
+    "verify_txs_crypto",
+    "verify_block",
     "prove_input",
     "add_utxo",
     "build_tree",
+    "live_tree",
+    "root_accepted",
+    "TxView",
+    "encode_tx",
+    "decode_tx",
+    "tx_hash",
+    "WitnessTracker",
+    "new_mempool",
+    "root_filter",
+    "ChainState",
 ]
@@ -0,0 +1,60 @@
+"""Chain state for FCMP transactions: output columns, tree, roots, spent tags."""
+
+from typing import Iterable, Optional, Sequence
+from common import CryptoParams, SpentSet
+from common.chain import BaseChainState, BlockUndo
+from fcmp.roots import RootHistory
+from fcmp.tree import hash_leaf, root
+from fcmp.tx import Tx
+from fcmp.verify import UTXO_C, UTXO_LEAVES, UTXO_P, live_tree
+
+
+class ChainState(BaseChainState[Tx]):
+    """
+    Applies blocks to the output columns of fcmp.verify and to live_tree(),
+    whose leaf layer is UTXO_LEAVES. The tree is extended once per block, so
+    each node on the right edge is rehashed once per block rather than once
+    per output, and its new root is pushed to roots if given. Undo truncates
+    the columns and the tree back to the block's first output.
+    """
+
+    def __init__(
+        self,
+        pp: CryptoParams,
+        spent: Optional[SpentSet] = None,
+        roots: Optional[RootHistory] = None,
+        arity: int = 2,
+        max_undo: Optional[int] = 128,
+    ):
+        super().__init__(spent, max_undo)
+        self.pp = pp
+        self.roots = roots
+        self.tree = live_tree(pp, arity)
+        if roots is not None and len(self.tree) and roots.current != root(self.tree):
+            roots.push(root(self.tree))
+
+    def _key_images(self, tx: Tx) -> Iterable[int]:
+        return (txin.I for txin in tx.inputs)
+
+    def _n_outputs(self) -> int:
+        return len(UTXO_LEAVES)
+
+    def _append_outputs(self, txs: Sequence[Tx]) -> None:
+        pp = self.pp
+        outs = [txout for tx in txs for txout in tx.outputs]
+        leaves = [hash_leaf(pp, txout.P, txout.C) for txout in outs]
+        UTXO_P.extend(txout.P for txout in outs)
+        UTXO_C.extend(txout.C for txout in outs)
+        self.tree.extend(leaves)  # appends to UTXO_LEAVES
+        if self.roots is not None and outs:
+            self.roots.push(root(self.tree))
+
+    def _truncate_outputs(self, undo: BlockUndo) -> None:
+        n = undo.n_outputs
+        for col in (UTXO_P, UTXO_C):
+            col.truncate(n)
+        self.tree.truncate(n)  # and UTXO_LEAVES
+        # The block's root was pushed last, if the block got that far
+        current = root(self.tree) if len(self.tree) else None
+        if self.roots is not None and self.roots.current != current:
+            self.roots.pop()
@@ -0,0 +1,155 @@
+"""
+Columnar storage for fixed-width values.
+
+A Column packs 32-byte big-endian values into one contiguous buffer that
+grows by doubling, either in memory or in a memory-mapped file. view()
+hands out zero-copy, read-only snapshots: growth maps a fresh buffer rather
+than resizing in place, so existing views stay valid and never see later
+appends.
+"""
+
+import mmap
+import os
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, Optional, Sequence, Union
+
+WIDTH = 32
+
+
+def _create(path: str) -> BinaryIO:
+    # Unlink rather than truncate, so mappings of an older file stay readable
+    if os.path.exists(path):
+        os.unlink(path)
+    return open(path, "w+b")
+
+
+class ColumnView(Sequence[int]):
+    """Read-only sequence of ints over a buffer of 32-byte records."""
+
+    __slots__ = ("_mv",)
+
+    def __init__(self, mv: memoryview):
+        self._mv = mv
+
+    def __len__(self) -> int:
+        return len(self._mv) // WIDTH
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[int, "ColumnView"]:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                raise ValueError("ColumnView slices must be contiguous")
+            return ColumnView(self._mv[start * WIDTH : max(start, stop) * WIDTH])
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("Column index out of range")
+        return int.from_bytes(self._mv[i * WIDTH : (i + 1) * WIDTH], "big")
+
+    def __iter__(self) -> Iterator[int]:
+        mv = self._mv
+        for off in range(0, len(mv), WIDTH):
+            yield int.from_bytes(mv[off : off + WIDTH], "big")
+
+    def buffer(self) -> memoryview:
+        """The underlying records, for zero-copy export."""
+        return self._mv
+
+
+class Column(Sequence[int]):
+    """
+    Growable column of 32-byte values. With a path, the records live in a
+    memory-mapped file at that path (created or overwritten) instead of RAM.
+    """
+
+    _CHUNK = 4096  # values packed per write in extend()
+
+    def __init__(self, capacity: int = 1024, path: Optional[str] = None):
+        self.path = path
+        self._f: Optional[BinaryIO] = _create(path) if path else None
+        self._buf = self._alloc(max(capacity, 1))
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[int, ColumnView]:
+        if isinstance(i, slice):
+            return self.view()[i]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("Column index out of range")
+        return int.from_bytes(self._buf[i * WIDTH : (i + 1) * WIDTH], "big")
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.view())
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf) // WIDTH
+
+    def append(self, x: int) -> int:
+        if self._n == self.capacity:
+            self._grow(self._n + 1)
+        off = self._n * WIDTH
+        self._buf[off : off + WIDTH] = x.to_bytes(WIDTH, "big")
+        self._n += 1
+        return self._n - 1
+
+    def extend(self, xs: Iterable[int]) -> None:
+        it = iter(xs)
+        while True:
+            data = b"".join(x.to_bytes(WIDTH, "big") for x in islice(it, self._CHUNK))
+            if not data:
+                return
+            k = len(data) // WIDTH
+            if self._n + k > self.capacity:
+                self._grow(self._n + k)
+            off = self._n * WIDTH
+            self._buf[off : off + len(data)] = data
+            self._n += k
+
+    def truncate(self, n: int) -> None:
+        """
+        Drop everything from index n on. Unlike growth this reuses the buffer,
+        so views taken earlier may observe values written past n afterwards.
+        """
+        self._n = max(0, min(n, self._n))
+
+    def view(self) -> ColumnView:
+        """Zero-copy snapshot of the current contents."""
+        return ColumnView(memoryview(self._buf)[: self._n * WIDTH].toreadonly())
+
+    def buffer(self) -> memoryview:
+        """The current contents as a read-only buffer, for zero-copy sharing."""
+        return self.view().buffer()
+
+    def clear(self) -> None:
+        # A fresh buffer (and file), so outstanding views keep their contents
+        if self._f is not None:
+            self._f.close()
+            self._f = _create(self.path)
+        self._buf = self._alloc(self.capacity)
+        self._n = 0
+
+    def nbytes(self) -> int:
+        """Heap bytes held by the buffer (0 when file-backed)."""
+        return 0 if self._f is not None else len(self._buf)
+
+    def _alloc(self, cap: int) -> Union[bytearray, mmap.mmap]:
+        if self._f is None:
+            return bytearray(cap * WIDTH)
+        # The file only ever grows, so older mappings stay valid
+        self._f.truncate(cap * WIDTH)
+        return mmap.mmap(self._f.fileno(), cap * WIDTH)
+
+    def _grow(self, need: int) -> None:
+        cap = self.capacity
+        while cap < need:
+            cap *= 2
+        buf = self._alloc(cap)
+        if self._f is None:
+            buf[: self._n * WIDTH] = self._buf[: self._n * WIDTH]
+        self._buf = buf
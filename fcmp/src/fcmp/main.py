@@ -1,5 +1,6 @@
 import secrets
 from common import setup, commit, gen_key
+from fcmp.chain import ChainState
 from fcmp.tree import root
 from fcmp.tx import TxOut, Tx, prove_range
 from fcmp.verify import add_utxo, build_tree, prove_input, verify_tx, UTXO_C
@@ -43,21 +44,17 @@ def main():
     txout2 = TxOut(dest2.P, C_out2, prove_range(v2))
     tx = Tx([txin], [txout1, txout2], fee, ctx=b"FCMP-ZK-TX")
 
-    spent_tags: set[int] = set()
-    ok = verify_tx(pp, tx, tree, spent_tags)
+    chain = ChainState(pp)
+    ok = verify_tx(pp, tx, tree, chain.spent)
     print("TX verifies?", ok)
 
     if ok:
-        for txin in tx.inputs:
-            spent_tags.add(txin.I)
-        add_utxo(pp, txout1.P, txout1.C)
-        add_utxo(pp, txout2.P, txout2.C)
+        chain.apply_block([tx])
 
-    tree2 = build_tree(pp)
     print("Root before:", root0)
-    print("Root after :", root(tree2))
+    print("Root after :", root(chain.tree))
 
-    ok2 = verify_tx(pp, tx, tree2, spent_tags)
+    ok2 = verify_tx(pp, tx, chain.tree, chain.spent)
     print("Double-spend blocked?", not ok2)
 
 
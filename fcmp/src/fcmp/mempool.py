@@ -0,0 +1,52 @@
+"""Mempool for FCMP transactions: membership, spend, range and balance on entry."""
+
+from functools import partial
+from typing import Callable, List, Optional
+from common import CryptoParams, SpentSet, VerifyCache
+from common.mempool import DEFAULT_MAX_BYTES, Mempool
+from fcmp.roots import RootHistory
+from fcmp.tree import Tree, root
+from fcmp.tx import Tx
+from fcmp.verify import root_accepted, verify_txs_crypto
+from fcmp.wire import encode_tx
+
+
+def _key_images(tx: Tx) -> List[int]:
+    return [txin.I for txin in tx.inputs]
+
+
+def _roots(tx: Tx) -> List[int]:
+    return [txin.root for txin in tx.inputs]
+
+
+def root_filter(
+    tree: Tree, roots: Optional[RootHistory] = None
+) -> Callable[[int], bool]:
+    """The root acceptance rule of verify_tx, for Mempool.on_roots."""
+    return partial(root_accepted, current_root=root(tree), roots=roots)
+
+
+def new_mempool(
+    pp: CryptoParams,
+    tree: Tree,
+    spent_tags: SpentSet,
+    roots: Optional[RootHistory] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    cache: Optional[VerifyCache] = None,
+) -> Mempool[Tx]:
+    """
+    Pool admitting txs that pass verify_tx(pp, tx, tree, spent_tags, roots).
+    When the tree grows, call pool.on_roots(root_filter(tree, roots)) to drop
+    txs whose root is no longer accepted. Passing the cache given to
+    verify_block lets blocks of pooled txs skip their crypto checks.
+    """
+    pool = Mempool(
+        encode_tx,
+        _key_images,
+        partial(verify_txs_crypto, pp, cache=cache),
+        roots=_roots,
+        spent=spent_tags,
+        max_bytes=max_bytes,
+    )
+    pool.on_roots(root_filter(tree, roots))
+    return pool
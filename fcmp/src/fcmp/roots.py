@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RootStats:
+    current: int = 0  # proofs against the tree's current root
+    stale: int = 0  # proofs against an older root still in the window
+    rejected: int = 0  # proofs against a root outside the window
+
+
+class RootHistory:
+    """
+    Bounded index of recent tree roots and the height each was produced at.
+
+    Keeps the last `window` roots, optionally also dropping roots more than
+    `max_age` heights behind the newest one. Membership is O(1), so inputs
+    proven against a slightly older root stay valid while the tree grows.
+    """
+
+    def __init__(self, window: int = 64, max_age: Optional[int] = None):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.max_age = max_age
+        self._roots: "OrderedDict[int, int]" = OrderedDict()
+        self._stats = RootStats()
+
+    def __len__(self) -> int:
+        return len(self._roots)
+
+    def __contains__(self, root_val: int) -> bool:
+        return root_val in self._roots
+
+    @property
+    def height(self) -> Optional[int]:
+        """Height of the newest root, or None if empty."""
+        return next(reversed(self._roots.values()), None)
+
+    @property
+    def current(self) -> Optional[int]:
+        return next(reversed(self._roots), None)
+
+    def push(self, root_val: int, height: Optional[int] = None) -> None:
+        """Record a new root; height defaults to one past the newest."""
+        if height is None:
+            height = 0 if self.height is None else self.height + 1
+        self._roots.pop(root_val, None)
+        self._roots[root_val] = height
+        self._evict()
+
+    def pop(self) -> Optional[int]:
+        """
+        Forget the newest root (a block was undone) and return it. Roots the
+        window already evicted do not come back.
+        """
+        if not self._roots:
+            return None
+        return self._roots.popitem()[0]
+
+    def height_of(self, root_val: int) -> Optional[int]:
+        return self._roots.get(root_val)
+
+    def check(self, root_val: int, current: Optional[int] = None) -> bool:
+        """
+        Accept root_val if it is `current` (default: the newest root) or
+        still in the window, and count the outcome.
+        """
+        if current is None:
+            current = self.current
+        if root_val == current:
+            self._stats.current += 1
+            return True
+        if root_val in self._roots:
+            self._stats.stale += 1
+            return True
+        self._stats.rejected += 1
+        return False
+
+    def configure(
+        self, window: Optional[int] = None, max_age: Optional[int] = None
+    ) -> None:
+        """Change the eviction policy; evicts immediately if it tightened."""
+        if window is not None:
+            if window < 1:
+                raise ValueError("window must be at least 1")
+            self.window = window
+        if max_age is not None:
+            self.max_age = max_age
+        self._evict()
+
+    def stats(self) -> RootStats:
+        s = self._stats
+        return RootStats(s.current, s.stale, s.rejected)
+
+    def _evict(self) -> None:
+        roots = self._roots
+        while len(roots) > self.window:
+            roots.popitem(last=False)
+        if self.max_age is not None and roots:
+            newest = self.height
+            while roots and newest - next(iter(roots.values())) > self.max_age:
+                roots.popitem(last=False)
@@ -1,41 +1,246 @@
+import os
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import List, Tuple
-from common import CryptoParams, to_bytes, hash_mod
+from functools import partial
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from common import CryptoParams, to_bytes, hash_mod, map_chunks
+from fcmp.columns import Column, ColumnView
+
+# Makes the (empty) storage for layer d; see packed_layers()
+LayerStorage = Callable[[int], Column]
+
+
+# Widest node: path directions are stored one byte per level
+MAX_ARITY = 256
 
 
 @dataclass
 class Tree:
-    layers: List[List[int]]
+    layers: List[Sequence[int]]
+    arity: int = 2
+
+
+def _check_arity(arity: int) -> None:
+    if not 2 <= arity <= MAX_ARITY:
+        raise ValueError(f"Arity must be between 2 and {MAX_ARITY}")
 
 
 def hash_node(pp: CryptoParams, left: int, right: int) -> int:
     return (pp.g * left + pp.h * right) % pp.q
 
 
+_NODE_GENS: Dict[Tuple[int, int, int, int], Tuple[int, ...]] = {}
+
+
+def node_gens(pp: CryptoParams, arity: int) -> Tuple[int, ...]:
+    """Per-position weights of the k-ary node hash; binary nodes use (g, h)."""
+    key = (pp.q, pp.g, pp.h, arity)
+    gens = _NODE_GENS.get(key)
+    if gens is None:
+        extra = (
+            hash_mod(b"NODEGEN", to_bytes(pp.g), to_bytes(pp.h), to_bytes(j), mod=pp.q)
+            or 1
+            for j in range(2, arity)
+        )
+        gens = _NODE_GENS[key] = (pp.g, pp.h, *extra)
+    return gens
+
+
+def hash_children(pp: CryptoParams, children: Sequence[int]) -> int:
+    """k-ary node hash over a full group of children; hash_node when k = 2."""
+    if len(children) == 2:
+        return hash_node(pp, children[0], children[1])
+    gens = node_gens(pp, len(children))
+    return sum(w * c for w, c in zip(gens, children)) % pp.q
+
+
 def hash_leaf(pp: CryptoParams, P: int, C: int) -> int:
     return hash_mod(b"LEAF", to_bytes(P), to_bytes(C), mod=pp.q) or 1
 
 
-def build(pp: CryptoParams, leaves: List[int]) -> Tree:
-    if not leaves:
-        raise ValueError("Empty leaves")
-    layers = [leaves[:]]
-    cur = leaves[:]
+def pad(pp: CryptoParams, level: int, i: int) -> int:
+    """
+    Filler for the empty slot right after the last node i of a layer; level is
+    the parent layer's index. For k > 2 later empty slots follow on i + 1, ...
+    """
+    return hash_mod(b"PAD", to_bytes(level), to_bytes(i), mod=pp.q) or 1
+
+
+def packed_layers(directory: Optional[str] = None) -> LayerStorage:
+    """
+    Layer storage packing nodes as 32-byte records: one Column per layer, in
+    memory, or memory-mapped from directory/layer-NN.bin when a directory is
+    given. Pass it as storage= to build() or IncrementalTree.
+    """
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+
+    def make(d: int) -> Column:
+        if directory is None:
+            return Column()
+        return Column(path=os.path.join(directory, f"layer-{d:02d}.bin"))
+
+    return make
+
+
+def _leaf_layer(
+    leaves: Sequence[int], storage: Optional[LayerStorage]
+) -> Sequence[int]:
+    # Packed leaves are shared as a zero-copy snapshot rather than repacked
+    if storage is None or isinstance(leaves, (Column, ColumnView)):
+        return leaves[:]
+    layer = storage(0)
+    layer.extend(leaves)
+    return layer
+
+
+def _fill(pp: CryptoParams, group: List[int], level: int, base: int, a: int) -> None:
+    """Pad a short last group of children, which starts at index base."""
+    group.extend(pad(pp, level, base + j - 1) for j in range(len(group), a))
+
+
+def _group(
+    pp: CryptoParams, layer: Sequence[int], level: int, j: int, a: int
+) -> List[int]:
+    """The a children of node j of layer `level`, read from the layer below."""
+    base = a * j
+    group = list(layer[base : base + a])
+    _fill(pp, group, level, base, a)
+    return group
+
+
+def _parents(
+    pp: CryptoParams,
+    cur: Sequence[int],
+    level: int,
+    first: int,
+    a: int = 2,
+    off: int = 0,
+) -> Iterable[int]:
+    """
+    Parent layer `level` from index first on, hashed from child layer cur.
+    off is the global index of cur[0] when cur is part of a layer.
+    """
+    # One sequential pass, which is much cheaper than indexing on packed layers
+    it = iter(cur[a * first :])
+    if a == 2:
+        for i, L in enumerate(it, start=first):
+            R = next(it, None)
+            yield hash_node(pp, L, R if R is not None else pad(pp, level, off + 2 * i))
+        return
+    for i in range(first, len(cur)):
+        group = list(islice(it, a))
+        if not group:
+            return
+        _fill(pp, group, level, off + a * i, a)
+        yield hash_children(pp, group)
+
+
+def _build_up(
+    pp: CryptoParams,
+    layers: List[Sequence[int]],
+    storage: Optional[LayerStorage],
+    arity: int,
+) -> Tree:
+    cur = layers[-1]
     while len(cur) > 1:
-        nxt = []
-        for i in range(0, len(cur), 2):
-            L = cur[i]
-            R = (
-                cur[i + 1]
-                if i + 1 < len(cur)
-                else (
-                    hash_mod(b"PAD", to_bytes(len(layers)), to_bytes(i), mod=pp.q) or 1
-                )
-            )
-            nxt.append(hash_node(pp, L, R))
+        nxt = storage(len(layers)) if storage is not None else []
+        nxt.extend(_parents(pp, cur, len(layers), 0, arity))
         layers.append(nxt)
         cur = nxt
-    return Tree(layers)
+    return Tree(layers, arity)
+
+
+def build(
+    pp: CryptoParams,
+    leaves: Sequence[int],
+    storage: Optional[LayerStorage] = None,
+    arity: int = 2,
+) -> Tree:
+    """
+    Build all layers over leaves. The leaf layer is leaves[:], which is a
+    zero-copy snapshot when leaves is a ColumnView. With storage, the layers
+    are packed Columns instead of lists of ints. Nodes have arity children.
+    """
+    _check_arity(arity)
+    if not leaves:
+        raise ValueError("Empty leaves")
+    return _build_up(pp, [_leaf_layer(leaves, storage)], storage, arity)
+
+
+def _subtree(
+    pp: CryptoParams, base: int, leaves: List[int], height: int, arity: int
+) -> List[List[int]]:
+    """
+    Layers 1..height of the aligned subtree whose leaves start at global index
+    base. Short groups are padded with their global index, as build() does.
+    """
+    layers, cur = [], leaves
+    for d in range(height):
+        cur = list(_parents(pp, cur, d + 1, 0, arity, off=base // arity**d))
+        layers.append(cur)
+    return layers
+
+
+def _subtree_batch(
+    pp: CryptoParams, height: int, arity: int, jobs: List[Tuple[int, List[int]]]
+) -> List[List[List[int]]]:
+    return [_subtree(pp, base, leaves, height, arity) for base, leaves in jobs]
+
+
+def build_parallel(
+    pp: CryptoParams,
+    leaves: Sequence[int],
+    workers: int = 1,
+    subtree_log: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    storage: Optional[LayerStorage] = None,
+    arity: int = 2,
+) -> Tree:
+    """
+    build() with the hashing split into aligned subtrees of arity^subtree_log
+    leaves, hashed on a process pool (or executor) and merged at the top.
+    Layers, roots and paths are identical to build(). By default subtrees are
+    sized for a few per worker.
+    """
+    _check_arity(arity)
+    if not leaves:
+        raise ValueError("Empty leaves")
+    n = len(leaves)
+    if subtree_log is None:
+        target, subtree_log = n // (max(workers, 1) * 4), 0
+        while arity ** (subtree_log + 1) <= target:
+            subtree_log += 1
+    size = arity**subtree_log
+    if n <= size or (executor is None and workers <= 1):
+        return build(pp, leaves, storage, arity)
+
+    jobs = [(b, list(leaves[b : b + size])) for b in range(0, n, size)]
+    subtrees = map_chunks(
+        partial(_subtree_batch, pp, subtree_log, arity),
+        jobs,
+        workers=workers,
+        chunksize=1,
+        executor=executor,
+    )
+    layers = [_leaf_layer(leaves, storage)]
+    for d in range(subtree_log):
+        layer = storage(d + 1) if storage is not None else []
+        for sub in subtrees:
+            layer.extend(sub[d])
+        layers.append(layer)
+    del subtrees
+    return _build_up(pp, layers, storage, arity)
 
 
 def root(tree: Tree) -> int:
@@ -43,24 +248,227 @@ def root(tree: Tree) -> int:
 
 
 def path(pp: CryptoParams, tree: Tree, idx: int) -> Tuple[int, List[int], List[int]]:
-    layers = tree.layers
+    """
+    The leaf at idx, its siblings and its position under each parent, bottom
+    up. A k-ary tree gives k - 1 siblings per level, in order, flattened.
+    """
+    layers, a = tree.layers, tree.arity
     if not (0 <= idx < len(layers[0])):
         raise IndexError("Bad leaf index")
     leaf = layers[0][idx]
     siblings, dirs = [], []
     for d in range(len(layers) - 1):
         layer = layers[d]
-        is_right = idx % 2
-        if is_right:
-            sibling = layer[idx - 1]
-            dirs.append(1)
+        pos = idx % a
+        if a == 2:
+            if pos:
+                sibling = layer[idx - 1]
+            elif idx + 1 < len(layer):
+                sibling = layer[idx + 1]
+            else:
+                sibling = pad(pp, d + 1, idx)
+            siblings.append(sibling)
         else:
-            sibling = (
-                layer[idx + 1]
-                if idx + 1 < len(layer)
-                else (hash_mod(b"PAD", to_bytes(d), to_bytes(idx), mod=pp.q) or 1)
-            )
-            dirs.append(0)
-        siblings.append(sibling)
-        idx //= 2
+            group = _group(pp, layer, d + 1, idx // a, a)
+            del group[pos]
+            siblings.extend(group)
+        dirs.append(pos)
+        idx //= a
     return leaf, siblings, dirs
+
+
+class IncrementalTree(Tree):
+    """
+    Append-only tree with the same layout, roots and paths as build().
+    append/extend only recompute the right edge of each layer: O(log n) per
+    appended leaf. root() and path() work on it unchanged. With storage,
+    every layer (leaves included) is a packed Column.
+    """
+
+    def __init__(
+        self,
+        pp: CryptoParams,
+        leaves: Iterable[int] = (),
+        storage: Optional[LayerStorage] = None,
+        arity: int = 2,
+    ):
+        _check_arity(arity)
+        self.pp = pp
+        self.storage = storage
+        super().__init__(layers=[self._new_layer(0)], arity=arity)
+        self.extend(leaves)
+
+    def _new_layer(self, d: int) -> MutableSequence[int]:
+        return self.storage(d) if self.storage is not None else []
+
+    def __len__(self) -> int:
+        return len(self.layers[0])
+
+    def append(self, leaf: int) -> int:
+        """Append a leaf and return its index."""
+        self.extend([leaf])
+        return len(self) - 1
+
+    @classmethod
+    def over(
+        cls,
+        pp: CryptoParams,
+        leaves: MutableSequence[int],
+        storage: Optional[LayerStorage] = None,
+        arity: int = 2,
+    ) -> "IncrementalTree":
+        """
+        Tree using leaves itself as layer 0, not a copy; storage only holds
+        the layers above. From then on leaves must change only through the
+        tree's append, extend and truncate, which write to it.
+        """
+        tree = cls(pp, storage=storage, arity=arity)
+        tree.layers[0] = leaves
+        tree._rehash(0)
+        return tree
+
+    def extend(self, leaves: Iterable[int]) -> None:
+        start = len(self.layers[0])
+        self.layers[0].extend(leaves)
+        self._rehash(start)
+
+    def _rehash(self, start: int) -> None:
+        """Recompute every parent of the leaves from index start on."""
+        pp, layers, a = self.pp, self.layers, self.arity
+        d = 0
+        while len(layers[d]) > 1 and start < len(layers[d]):
+            cur = layers[d]
+            if d + 1 == len(layers):
+                layers.append(self._new_layer(d + 1))
+            nxt = layers[d + 1]
+            # Parents from the first one with a changed child, to the end
+            first = start // a
+            _cut(nxt, first)
+            nxt.extend(_parents(pp, cur, d + 1, first, a))
+            start = first
+            d += 1
+
+    def truncate(self, n: int) -> None:
+        """
+        Drop the leaves from n on, leaving the tree build() gives for the
+        first n. Only the last group of each layer is rehashed: O(log n).
+        """
+        pp, layers, a = self.pp, self.layers, self.arity
+        if n >= len(self):
+            return
+        _cut(layers[0], max(n, 0))
+        d = 0
+        while len(layers[d]) > 1:
+            # The last group may have lost children; parents past it are gone
+            first = (len(layers[d]) - 1) // a
+            nxt = layers[d + 1]
+            _cut(nxt, first)
+            nxt.extend(_parents(pp, layers[d], d + 1, first, a))
+            d += 1
+        del layers[d + 1 :]
+
+
+def _cut(layer: MutableSequence[int], n: int) -> None:
+    if isinstance(layer, list):
+        del layer[n:]
+    else:
+        layer.truncate(n)
+
+
+class _PrunedLayer(Sequence[int]):
+    """
+    A layer that stores only its nodes from offset on. Earlier nodes are
+    rehashed from the layer below whenever they are read.
+    """
+
+    def __init__(
+        self, pp: CryptoParams, level: int, below: Sequence[int], arity: int = 2
+    ):
+        self.pp = pp
+        self.level = level
+        self.below = below
+        self.arity = arity
+        self.offset = 0
+        self.tail: List[int] = []
+
+    def __len__(self) -> int:
+        return self.offset + len(self.tail)
+
+    def __getitem__(self, i):
+        n = len(self)
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("Layer index out of range")
+        if i >= self.offset:
+            return self.tail[i - self.offset]
+        return hash_children(
+            self.pp, _group(self.pp, self.below, self.level, i, self.arity)
+        )
+
+    def extend(self, xs: Iterable[int]) -> None:
+        self.tail.extend(xs)
+
+    def truncate(self, n: int) -> None:
+        if n < self.offset:
+            self.offset, self.tail = n, []
+        else:
+            del self.tail[n - self.offset :]
+
+    def prune(self, keep: int) -> None:
+        """Drop all but the last keep stored nodes."""
+        drop = max(0, len(self.tail) - keep)
+        self.offset += drop
+        del self.tail[:drop]
+
+
+class PrunedTree(IncrementalTree):
+    """
+    IncrementalTree that stores the leaves, every k-th layer and the right
+    frontier of the others. That is all appends need; path() rehashes the
+    missing siblings from the checkpoint layer below, costing up to arity^k
+    hashes per band of k layers. With binary nodes, internal nodes stored drop
+    to about n / (2^k - 1).
+    """
+
+    def __init__(
+        self,
+        pp: CryptoParams,
+        leaves: Iterable[int] = (),
+        k: int = 4,
+        storage: Optional[LayerStorage] = None,
+        arity: int = 2,
+    ):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        super().__init__(pp, leaves, storage, arity)
+
+    def _new_layer(self, d: int) -> MutableSequence[int]:
+        if d % self.k == 0:
+            return super()._new_layer(d)
+        return _PrunedLayer(self.pp, d, self.layers[d - 1], self.arity)
+
+    def _rehash(self, start: int) -> None:
+        super()._rehash(start)
+        self._prune()
+
+    def truncate(self, n: int) -> None:
+        super().truncate(n)
+        self._prune()
+
+    def _prune(self) -> None:
+        # One group of frontier nodes per pruned layer: enough that appends
+        # never rehash
+        for layer in self.layers:
+            if isinstance(layer, _PrunedLayer):
+                layer.prune(self.arity)
+
+    def stored_nodes(self) -> int:
+        """Nodes held in memory, leaves included."""
+        return sum(
+            len(layer.tail) if isinstance(layer, _PrunedLayer) else len(layer)
+            for layer in self.layers
+        )
@@ -1,26 +1,62 @@
-from common import CryptoParams, FCMPKey, prove_spend, verify_spend
-from fcmp.tree import Tree, root, hash_leaf
-from fcmp.zkproof import prove as zk_prove, verify as zk_verify
+import time
+from concurrent.futures import Executor
+from functools import partial
+from typing import List, Optional
+from common import CryptoParams, FCMPKey, prove_spend, verify_spend, verify_spend_batch
+from common import BlockResult, SpentSet, VerifyCache, map_chunks, mark_conflicts
+from fcmp.columns import Column
+from fcmp.roots import RootHistory
+from fcmp.tree import IncrementalTree, Tree, build, packed_layers, root, hash_leaf
+from fcmp.zkproof import NodeMemo, prove as zk_prove, verify as zk_verify
 from fcmp.tx import TxIn, Tx, verify_range
+from fcmp.wire import tx_hash
 
 
-UTXO_P = []
-UTXO_C = []
-UTXO_LEAVES = []
+# Output columns, 32 bytes per entry
+UTXO_P = Column()
+UTXO_C = Column()
+UTXO_LEAVES = Column()
+
+
+# Live tree using UTXO_LEAVES itself as layer 0: created by live_tree(), then
+# add_utxo and fcmp.chain add leaves through it
+_LIVE: Optional[IncrementalTree] = None
 
 
 def add_utxo(pp: CryptoParams, P: int, C: int) -> int:
     leaf = hash_leaf(pp, P, C)
     UTXO_P.append(P)
     UTXO_C.append(C)
-    UTXO_LEAVES.append(leaf)
+    if _LIVE is not None:
+        _LIVE.append(leaf)
+    else:
+        UTXO_LEAVES.append(leaf)
     return len(UTXO_LEAVES) - 1
 
 
-def build_tree(pp: CryptoParams) -> Tree:
-    from fcmp.tree import build
+def build_tree(pp: CryptoParams, arity: int = 2) -> Tree:
+    """
+    Snapshot tree over every output added so far. The leaf layer is a
+    zero-copy view of UTXO_LEAVES and the layers above are built in O(n);
+    later outputs do not change it. See live_tree() for one kept current.
+    """
+    return build(pp, UTXO_LEAVES.view(), storage=packed_layers(), arity=arity)
+
 
-    return build(pp, UTXO_LEAVES)
+def live_tree(pp: CryptoParams, arity: int = 2) -> IncrementalTree:
+    """
+    The one tree over UTXO_LEAVES that add_utxo and ChainState keep current,
+    in O(log n) per output. Its layer 0 is the UTXO_LEAVES column itself.
+    Built on first use; asking again with another pp or arity is an error.
+    """
+    global _LIVE
+    if _LIVE is None:
+        _LIVE = IncrementalTree.over(
+            pp, UTXO_LEAVES, storage=packed_layers(), arity=arity
+        )
+    elif _LIVE.pp != pp or _LIVE.arity != arity:
+        raise ValueError("The live tree was built with another pp or arity")
+    return _LIVE
 
 
 def prove_input(
@@ -34,25 +70,67 @@ def prove_input(
     )
 
 
-def verify_input(pp: CryptoParams, txin: TxIn, current_root: int, ctx: bytes) -> bool:
-    if txin.root != current_root:
-        return False
-    if not verify_spend(pp, txin.P, txin.I, txin.root, txin.spend_proof, ctx):
-        return False
-    if not zk_verify(pp, txin.root, txin.P, txin.C, txin.zk_proof, ctx):
-        return False
-    return True
+def root_accepted(
+    root_val: int, current_root: int, roots: Optional[RootHistory] = None
+) -> bool:
+    """
+    The root rule of verify_tx: the current root, or one still in roots.
+    Unlike verify_tx, it leaves the RootHistory counters alone.
+    """
+    return root_val == current_root or (roots is not None and root_val in roots)
 
 
-def verify_tx(pp: CryptoParams, tx: Tx, tree: Tree, spent_tags: set[int]) -> bool:
-    root_val = root(tree)
+def _root_accepted(
+    root_val: int, current_root: int, roots: Optional[RootHistory]
+) -> bool:
+    if roots is None:
+        return root_val == current_root
+    return roots.check(root_val, current_root)
 
+
+def _verify_tx_state(
+    tx: Tx, current_root: int, spent_tags: SpentSet, roots: Optional[RootHistory]
+) -> bool:
+    """The checks that depend on chain state: double-spends and root acceptance."""
     for txin in tx.inputs:
         if txin.I in spent_tags:
             return False
+    return all(_root_accepted(txin.root, current_root, roots) for txin in tx.inputs)
+
 
+def _verify_membership(
+    pp: CryptoParams, txin: TxIn, ctx: bytes, memo: Optional[NodeMemo] = None
+) -> bool:
+    return zk_verify(pp, txin.root, txin.P, txin.C, txin.zk_proof, ctx, memo)
+
+
+def _retain_roots(
+    memo: Optional[NodeMemo], current: int, roots: Optional[RootHistory]
+) -> None:
+    # Forget memoised nodes of roots that are no longer accepted
+    if memo is not None:
+        memo.retain(roots if roots is not None else (current,))
+
+
+def verify_input(
+    pp: CryptoParams,
+    txin: TxIn,
+    current_root: int,
+    ctx: bytes,
+    roots: Optional[RootHistory] = None,
+) -> bool:
+    if not _root_accepted(txin.root, current_root, roots):
+        return False
+    if not _verify_membership(pp, txin, ctx):
+        return False
+    return verify_spend(pp, txin.P, txin.I, txin.root, txin.spend_proof, ctx)
+
+
+def _verify_tx_except_spend(
+    pp: CryptoParams, tx: Tx, memo: Optional[NodeMemo] = None
+) -> bool:
     for txin in tx.inputs:
-        if not verify_input(pp, txin, root_val, tx.ctx):
+        if not _verify_membership(pp, txin, tx.ctx, memo):
             return False
 
     for txout in tx.outputs:
@@ -63,3 +141,140 @@ def verify_tx(pp: CryptoParams, tx: Tx, tree: Tree, spent_tags: set[int]) -> boo
     sum_out = sum(txout.C for txout in tx.outputs) % pp.q
     balance = (sum_in - sum_out - (pp.Hc * (tx.fee % pp.q)) % pp.q) % pp.q
     return balance == 0
+
+
+def verify_tx(
+    pp: CryptoParams,
+    tx: Tx,
+    tree: Tree,
+    spent_tags: SpentSet,
+    roots: Optional[RootHistory] = None,
+    memo: Optional[NodeMemo] = None,
+    cache: Optional[VerifyCache] = None,
+) -> bool:
+    """
+    Verify a transaction. Inputs must prove membership against the tree's
+    current root or, if roots is given, any root still in that history.
+    A memo lets membership checks reuse nodes proven by earlier calls; with
+    a cache only the state checks run for a tx that already passed.
+    """
+    current = root(tree)
+    _retain_roots(memo, current, roots)
+    if not _verify_tx_state(tx, current, spent_tags, roots):
+        return False
+    if cache is None:
+        return _verify_tx_crypto(pp, tx, memo)
+    return cache.check(tx_hash(tx), partial(_verify_tx_crypto, pp, tx, memo))
+
+
+def _verify_tx_crypto(
+    pp: CryptoParams, tx: Tx, memo: Optional[NodeMemo] = None
+) -> bool:
+    if not _verify_tx_except_spend(pp, tx, memo):
+        return False
+    return all(
+        verify_spend(pp, txin.P, txin.I, txin.root, txin.spend_proof, tx.ctx)
+        for txin in tx.inputs
+    )
+
+
+def verify_txs(
+    pp: CryptoParams,
+    txs: List[Tx],
+    tree: Tree,
+    spent_tags: SpentSet,
+    roots: Optional[RootHistory] = None,
+    memo: Optional[NodeMemo] = None,
+    cache: Optional[VerifyCache] = None,
+) -> List[bool]:
+    """
+    Block-level verify_tx: every tx is checked against the same tree, with all
+    spend proofs folded into a single verify_spend_batch call, and membership
+    paths sharing nodes through memo if given.
+    Returns one result per tx, each equal to verify_tx with the same arguments.
+    """
+    current = root(tree)
+    _retain_roots(memo, current, roots)
+    results = [_verify_tx_state(tx, current, spent_tags, roots) for tx in txs]
+    todo = [t for t, ok in enumerate(results) if ok]
+    pending = [txs[t] for t in todo]
+    for t, ok in zip(todo, verify_txs_crypto(pp, pending, memo, cache)):
+        results[t] = ok
+    return results
+
+
+def verify_txs_crypto(
+    pp: CryptoParams,
+    txs: List[Tx],
+    memo: Optional[NodeMemo] = None,
+    cache: Optional[VerifyCache] = None,
+) -> List[bool]:
+    """
+    The state-independent checks of verify_txs, skipping txs the cache has
+    seen pass.
+    """
+    if cache is None:
+        return _verify_txs_crypto(pp, txs, memo)
+    keys = [tx_hash(tx) for tx in txs]
+    return cache.check_many(keys, txs, partial(_verify_txs_crypto, pp, memo=memo))
+
+
+def _verify_txs_crypto(
+    pp: CryptoParams, txs: List[Tx], memo: Optional[NodeMemo] = None
+) -> List[bool]:
+    """State-independent checks for many txs, spend proofs batched together."""
+    results = [_verify_tx_except_spend(pp, tx, memo) for tx in txs]
+
+    items, owners = [], []
+    for t, tx in enumerate(txs):
+        if not results[t]:
+            continue
+        for txin in tx.inputs:
+            items.append((txin.P, txin.I, txin.root, txin.spend_proof, tx.ctx))
+            owners.append(t)
+
+    for t, ok in zip(owners, verify_spend_batch(pp, items)):
+        if not ok:
+            results[t] = False
+    return results
+
+
+def verify_block(
+    pp: CryptoParams,
+    txs: List[Tx],
+    tree: Tree,
+    spent_tags: SpentSet,
+    workers: int = 1,
+    chunksize: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    roots: Optional[RootHistory] = None,
+    cache: Optional[VerifyCache] = None,
+) -> BlockResult:
+    """
+    Verify a block of transactions, fanning the crypto checks out to workers.
+
+    Double-spends against spent_tags, root acceptance and key-image conflicts
+    inside the block are checked once, here; workers run the membership,
+    spend, range and balance checks on their chunk against each input's own
+    root, for the txs not already in cache. Results come back in block order.
+    """
+    t0 = time.perf_counter()
+    current = root(tree)
+    results = [_verify_tx_state(tx, current, spent_tags, roots) for tx in txs]
+    todo = [t for t, ok in enumerate(results) if ok]
+    check = partial(
+        map_chunks,
+        partial(_verify_txs_crypto, pp),
+        workers=workers,
+        chunksize=chunksize,
+        executor=executor,
+    )
+    pending = [txs[t] for t in todo]
+    if cache is None:
+        checked = check(pending)
+    else:
+        checked = cache.check_many([tx_hash(tx) for tx in pending], pending, check)
+    for t, ok in zip(todo, checked):
+        results[t] = ok
+    mark_conflicts([[txin.I for txin in tx.inputs] for tx in txs], results)
+    return BlockResult(results, time.perf_counter() - t0)
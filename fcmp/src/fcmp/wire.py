@@ -0,0 +1,141 @@
+"""
+Versioned binary encoding for FCMP transactions.
+
+Layout (v1):
+    b"FCTX" | version u8 | fee u64 | ctx blob | n_in u16 | n_in key images
+    | n_out u16 | n_in input bodies (blob each) | n_out outputs
+
+    input body:  P | C | root | spend proof (A1, A2, z) | zk proof blob
+    output:      P | C | range proof blob
+
+Key images and the fee sit at fixed offsets in front of the bodies, so a
+TxView can reject double-spends before touching any proofs.
+"""
+
+import hashlib
+
+from common.wire import (
+    SCALAR_SIZE,
+    BaseTxView,
+    Buffer,
+    DecodeError,
+    Reader,
+    Writer,
+    read_spend_proof,
+    scalars,
+    write_header,
+    write_spend_proof,
+)
+from common import SpendProof
+from fcmp.tx import RangeProof, Tx, TxIn, TxOut
+from fcmp.zkproof import ZKProof
+
+MAGIC = b"FCTX"
+VERSION = 1
+
+
+def _write_txin_body(w: Writer, txin: TxIn) -> None:
+    w.scalar(txin.P).scalar(txin.C).scalar(txin.root)
+    write_spend_proof(w, txin.spend_proof)
+    w.blob(txin.zk_proof.blob)
+
+
+def _write_txout(w: Writer, txout: TxOut) -> None:
+    w.scalar(txout.P).scalar(txout.C).blob(txout.range_proof.blob)
+
+
+def _read_txout(r: Reader) -> TxOut:
+    P, C = r.scalar(), r.scalar()
+    return TxOut(P, C, RangeProof(bytes(r.blob())))
+
+
+def encode_tx(tx: Tx) -> bytes:
+    w = Writer()
+    write_header(w, MAGIC, VERSION)
+    w.u64(tx.fee).blob(tx.ctx)
+    w.u16(len(tx.inputs))
+    for txin in tx.inputs:
+        w.scalar(txin.I)
+    w.u16(len(tx.outputs))
+    for txin in tx.inputs:
+        body = Writer()
+        _write_txin_body(body, txin)
+        w.blob(body.buf)
+    for txout in tx.outputs:
+        _write_txout(w, txout)
+    return w.getvalue()
+
+
+def tx_hash(tx: Tx) -> bytes:
+    """
+    Canonical tx hash: sha256 of the encoding, the mempool's tx-id. It covers
+    each input's root, so a cached result is tied to the roots it was
+    checked against.
+    """
+    return hashlib.sha256(encode_tx(tx)).digest()
+
+
+class TxInView:
+    """Lazily decoded input body; fields are parsed on first access."""
+
+    # Offsets of the fixed-width fields inside the body
+    _P = 0
+    _C = SCALAR_SIZE
+    _ROOT = 2 * SCALAR_SIZE
+    _SPEND = 3 * SCALAR_SIZE
+    _ZK = 6 * SCALAR_SIZE
+
+    def __init__(self, I: int, body: memoryview):
+        if len(body) < self._ZK + 4:
+            raise DecodeError("Truncated input")
+        self.I = I
+        self._body = body
+
+    @property
+    def P(self) -> int:
+        return Reader(self._body, self._P).scalar()
+
+    @property
+    def C(self) -> int:
+        return Reader(self._body, self._C).scalar()
+
+    @property
+    def root(self) -> int:
+        return Reader(self._body, self._ROOT).scalar()
+
+    @property
+    def spend_proof(self) -> SpendProof:
+        return read_spend_proof(Reader(self._body, self._SPEND))
+
+    @property
+    def zk_proof(self) -> ZKProof:
+        r = Reader(self._body, self._ZK)
+        blob = bytes(r.blob())
+        if not r.at_end():
+            raise DecodeError("Trailing bytes in input")
+        return ZKProof(blob)
+
+    def to_txin(self) -> TxIn:
+        P, C, root_val = scalars(self._body, 3)
+        return TxIn(
+            P=P,
+            I=self.I,
+            C=C,
+            root=root_val,
+            spend_proof=self.spend_proof,
+            zk_proof=self.zk_proof,
+        )
+
+
+class TxView(BaseTxView[TxInView, TxOut, Tx]):
+    """Zero-copy view over an encoded Tx; see common.wire.BaseTxView."""
+
+    MAGIC = MAGIC
+    VERSION = VERSION
+    TXIN_VIEW = TxInView
+    TX = Tx
+    read_txout = staticmethod(_read_txout)
+
+
+def decode_tx(data: Buffer) -> Tx:
+    return TxView(data).to_tx()
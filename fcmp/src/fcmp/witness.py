@@ -0,0 +1,175 @@
+"""
+Wallet-side witnesses: Merkle paths for a few of our own leaves, kept current
+from the stream of appended leaves alone.
+
+A WitnessTracker stores the right frontier of the tree (the last group of
+each layer) plus, for each tracked leaf, the nodes of the groups on its path.
+Each append rehashes the frontier and copies any changed node a tracked path
+needs: O(log n) per append, per witness. The tracker is a Tree, so root(),
+path() and zkproof.prove work on it for tracked leaves.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Set, Tuple, Union
+from common import CryptoParams
+from fcmp.tree import Tree, _check_arity, hash_children, pad
+
+
+class _WitnessLayer(Sequence[int]):
+    """Layer d as seen through the tracker: only known nodes can be read."""
+
+    __slots__ = ("_t", "_d")
+
+    def __init__(self, tracker: "WitnessTracker", d: int):
+        self._t = tracker
+        self._d = d
+
+    def __len__(self) -> int:
+        return self._t._lens[self._d]
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[int, List[int]]:
+        n = len(self)
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("Layer index out of range")
+        return self._t._node(self._d, i)
+
+
+class WitnessTracker(Tree):
+    """
+    Right frontier of the tree plus the paths of tracked leaves. Feed it every
+    appended leaf, in order; start it empty, or from a full tree with
+    from_tree(). Leaves can be tracked as they are appended (append(...,
+    track=True)) or while their path is still on the frontier (track()).
+    """
+
+    def __init__(self, pp: CryptoParams, arity: int = 2):
+        _check_arity(arity)
+        super().__init__(layers=[], arity=arity)
+        self.pp = pp
+        self._lens: List[int] = []
+        self._frontier: List[List[int]] = []
+        self._tracked: Set[int] = set()
+        # Per layer, the groups (parent indices) holding a tracked path node
+        self._groups: List[Set[int]] = []
+        self._nodes: Dict[Tuple[int, int], int] = {}
+
+    @classmethod
+    def from_tree(
+        cls, pp: CryptoParams, tree: Tree, track: Iterable[int] = ()
+    ) -> "WitnessTracker":
+        """Seed a tracker with tree's frontier and the paths of track."""
+        t = cls(pp, tree.arity)
+        for d, layer in enumerate(tree.layers):
+            t._add_layer()
+            n = t._lens[d] = len(layer)
+            t._frontier[d] = list(layer[t._base(d) : n])
+        for idx in track:
+            t._track(idx, tree)
+        return t
+
+    def __len__(self) -> int:
+        return self._lens[0] if self._lens else 0
+
+    @property
+    def tracked(self) -> Set[int]:
+        return set(self._tracked)
+
+    def append(self, leaf: int, track: bool = False) -> int:
+        """Append the next leaf of the stream and return its index."""
+        pp, a = self.pp, self.arity
+        pos, val, d = len(self), leaf, 0
+        while True:
+            self._set(d, pos, val)
+            n = self._lens[d]
+            if n == 1:
+                break
+            base, group = self._base(d), list(self._frontier[d])
+            group.extend(pad(pp, d + 1, base + j - 1) for j in range(len(group), a))
+            val = hash_children(pp, group)
+            pos //= a
+            d += 1
+        if track:
+            # The newest leaf's path is all on the frontier
+            self._track(len(self) - 1, self)
+        return len(self) - 1
+
+    def extend(self, leaves: Iterable[int]) -> None:
+        for leaf in leaves:
+            self.append(leaf)
+
+    def track(self, idx: int) -> None:
+        """Start tracking a leaf whose whole path is still on the frontier."""
+        self._track(idx, self)
+
+    def untrack(self, idx: int) -> None:
+        self._tracked.discard(idx)
+        self._rebuild_groups()
+        a = self.arity
+        self._nodes = {
+            (d, i): v for (d, i), v in self._nodes.items() if i // a in self._groups[d]
+        }
+
+    def _track(self, idx: int, source: Tree) -> None:
+        if not 0 <= idx < len(self):
+            raise IndexError("Bad leaf index")
+        a, layers = self.arity, source.layers
+        nodes, i = {}, idx
+        try:
+            for d in range(len(self._lens)):
+                base = i - i % a
+                for j in range(base, min(base + a, self._lens[d])):
+                    nodes[(d, j)] = layers[d][j]
+                i //= a
+        except LookupError:
+            raise ValueError(f"Path of leaf {idx} is no longer on the frontier")
+        self._watch(idx)
+        self._nodes.update(nodes)
+
+    def _watch(self, idx: int) -> None:
+        self._tracked.add(idx)
+        a = self.arity
+        for d, groups in enumerate(self._groups):
+            groups.add(idx // a ** (d + 1))
+
+    def _rebuild_groups(self) -> None:
+        a = self.arity
+        self._groups = [
+            {i // a ** (d + 1) for i in self._tracked} for d in range(len(self._lens))
+        ]
+
+    def _add_layer(self) -> None:
+        d = len(self._lens)
+        self._lens.append(0)
+        self._frontier.append([])
+        self._groups.append({i // self.arity ** (d + 1) for i in self._tracked})
+        self.layers.append(_WitnessLayer(self, d))
+
+    def _base(self, d: int) -> int:
+        """Index of the first node of layer d's last group."""
+        last = max(self._lens[d] - 1, 0)
+        return last - last % self.arity
+
+    def _set(self, d: int, pos: int, val: int) -> None:
+        if d == len(self._lens):
+            self._add_layer()
+        if pos == self._lens[d]:
+            self._lens[d] += 1
+            if pos % self.arity == 0:
+                self._frontier[d] = []
+            self._frontier[d].append(val)
+        else:
+            self._frontier[d][pos - self._base(d)] = val
+        if pos // self.arity in self._groups[d]:
+            self._nodes[(d, pos)] = val
+
+    def _node(self, d: int, i: int) -> int:
+        val = self._nodes.get((d, i))
+        if val is not None:
+            return val
+        base = self._base(d)
+        if i >= base:
+            return self._frontier[d][i - base]
+        raise LookupError(f"Node {i} of layer {d} is not tracked")
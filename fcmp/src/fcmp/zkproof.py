@@ -1,8 +1,24 @@
 import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Tuple
+from itertools import islice
+from typing import Callable, Container, Dict, List, Optional, Sequence, Tuple
 from common import CryptoParams, to_bytes
-from fcmp.tree import Tree, root, path, hash_leaf, hash_node
+from common.wire import DecodeError, Reader, Writer, scalars
+from fcmp.tree import (
+    MAX_ARITY,
+    Tree,
+    root,
+    path,
+    pad,
+    hash_leaf,
+    hash_children,
+    hash_node,
+)
+
+# Deepest tree a multiproof may claim: leaf indices are u64, so binary trees
+# never need more levels
+MAX_DEPTH = 64
 
 
 @dataclass
@@ -17,11 +33,14 @@ def _pack(
     siblings: List[int],
     dirs: List[int],
     ctx: bytes,
+    arity: int = 2,
 ) -> bytes:
-    depth = len(siblings)
+    depth = len(dirs)
     sib_data = b"".join(to_bytes(s) for s in siblings)
     dir_data = bytes(dirs)
-    path_data = depth.to_bytes(2, "big") + sib_data + dir_data
+    path_data = (
+        depth.to_bytes(2, "big") + arity.to_bytes(2, "big") + sib_data + dir_data
+    )
     binding = hashlib.sha256(
         b"ZK|bind|"
         + ctx
@@ -29,13 +48,17 @@ def _pack(
         + to_bytes(leaf)
         + hashlib.sha256(path_data).digest()
     ).digest()
-    return b"ZKv1|" + binding + b"|" + path_data
+    return b"ZKv2|" + binding + b"|" + path_data
 
 
 def _unpack(blob: bytes) -> Tuple[bytes, bytes]:
-    assert blob.startswith(b"ZKv1|")
-    rest = blob[len(b"ZKv1|") :]
-    binding, sep, path_data = rest.partition(b"|")
+    if not blob.startswith(b"ZKv2|"):
+        raise DecodeError("Not a ZKv2 proof")
+    rest = blob[len(b"ZKv2|") :]
+    # The binding is a raw SHA256 digest and may itself contain b"|"
+    binding, sep, path_data = rest[:32], rest[32:33], rest[33:]
+    if sep != b"|":
+        raise DecodeError("Bad ZKv2 framing")
     return binding, path_data
 
 
@@ -45,35 +68,118 @@ def prove(
     root_val = root(tree)
     leaf, siblings, dirs = path(pp, tree, idx)
     assert leaf == hash_leaf(pp, P, C), "Leaf mismatch"
-    blob = _pack(pp, root_val, leaf, siblings, dirs, ctx)
+    blob = _pack(pp, root_val, leaf, siblings, dirs, ctx, tree.arity)
     return ZKProof(blob)
 
 
+@dataclass
+class MemoStats:
+    walks: int = 0  # proofs checked with a memo
+    hits: int = 0  # walks stopped early at a known node
+    saved: int = 0  # node hashes skipped
+
+
+class NodeMemo:
+    """
+    Per-root record of (level, position) -> node values already proven to hash
+    up to that root. A path walk that reaches a matching node can stop there.
+    Bounded to max_roots roots (least recently used dropped first) and
+    nodes_per_root entries each (oldest dropped first); call retain() as roots
+    leave the accepted set. Not thread-safe.
+    """
+
+    def __init__(self, max_roots: int = 8, nodes_per_root: int = 1 << 14):
+        self.max_roots = max_roots
+        self.nodes_per_root = nodes_per_root
+        self._roots: "OrderedDict[int, Dict[int, int]]" = OrderedDict()
+        self._stats = MemoStats()
+
+    def __len__(self) -> int:
+        return len(self._roots)
+
+    def __contains__(self, root_val: int) -> bool:
+        return root_val in self._roots
+
+    @staticmethod
+    def _key(level: int, pos: int) -> int:
+        return level << 64 | pos
+
+    def nodes(self, root_val: int) -> Dict[int, int]:
+        """The node table for root_val (keyed by _key), created on first use."""
+        nodes = self._roots.get(root_val)
+        if nodes is None:
+            nodes = self._roots[root_val] = {}
+            while len(self._roots) > self.max_roots:
+                self._roots.popitem(last=False)
+        else:
+            self._roots.move_to_end(root_val)
+        return nodes
+
+    def get(self, root_val: int, level: int, pos: int) -> Optional[int]:
+        nodes = self._roots.get(root_val)
+        return None if nodes is None else nodes.get(self._key(level, pos))
+
+    def record(self, root_val: int, entries: Dict[int, int]) -> None:
+        """Add proven nodes (keyed by _key), dropping the oldest over the bound."""
+        nodes = self.nodes(root_val)
+        nodes.update(entries)
+        if len(nodes) > self.nodes_per_root:
+            for k in list(islice(nodes, len(nodes) - self.nodes_per_root)):
+                del nodes[k]
+
+    def drop(self, root_val: int) -> None:
+        self._roots.pop(root_val, None)
+
+    def retain(self, accepted: Container[int]) -> None:
+        """Drop the memo of every root not in accepted (e.g. a RootHistory)."""
+        for r in [r for r in self._roots if r not in accepted]:
+            del self._roots[r]
+
+    def stats(self) -> MemoStats:
+        s = self._stats
+        return MemoStats(s.walks, s.hits, s.saved)
+
+
 def verify(
-    pp: CryptoParams, root_val: int, P: int, C: int, proof: ZKProof, ctx: bytes
+    pp: CryptoParams,
+    root_val: int,
+    P: int,
+    C: int,
+    proof: ZKProof,
+    ctx: bytes,
+    memo: Optional[NodeMemo] = None,
 ) -> bool:
+    """
+    Check a membership proof. With a memo, the walk stops at the first node
+    already proven under root_val, and the nodes of a valid path, siblings
+    included, are recorded.
+    """
+    try:
+        binding, path_data = _unpack(proof.blob)
+    except DecodeError:
+        return False
     leaf = hash_leaf(pp, P, C)
-    binding, path_data = _unpack(proof.blob)
 
-    assert len(path_data) >= 2
+    if len(path_data) < 4:
+        return False
     depth = int.from_bytes(path_data[:2], "big")
-    body = path_data[2:]
-    sib_len = 32 * depth
-    assert len(body) == sib_len + depth
+    arity = int.from_bytes(path_data[2:4], "big")
+    if not 2 <= arity <= MAX_ARITY:
+        return False
+    body = path_data[4:]
+    n_sib = depth * (arity - 1)
+    sib_len = 32 * n_sib
+    if len(body) != sib_len + depth:
+        return False
 
     sib_data = body[:sib_len]
     dir_data = body[sib_len:]
     siblings = [
-        int.from_bytes(sib_data[i * 32 : (i + 1) * 32], "big") for i in range(depth)
+        int.from_bytes(sib_data[i * 32 : (i + 1) * 32], "big") for i in range(n_sib)
     ]
     dirs = list(dir_data)
-
-    cur = leaf
-    for i in range(depth):
-        if dirs[i] == 0:
-            cur = hash_node(pp, cur, siblings[i])
-        else:
-            cur = hash_node(pp, siblings[i], cur)
+    if any(pos >= arity for pos in dirs):
+        return False
 
     exp_binding = hashlib.sha256(
         b"ZK|bind|"
@@ -82,4 +188,197 @@ def verify(
         + to_bytes(leaf)
         + hashlib.sha256(path_data).digest()
     ).digest()
-    return (binding == exp_binding) and (cur == root_val)
+    if binding != exp_binding:
+        return False
+
+    known = memo.nodes(root_val) if memo is not None else None
+    idx = 0
+    for pos in reversed(dirs):
+        idx = idx * arity + pos
+
+    if idx >> 64:
+        known = None  # Positions would alias across levels in NodeMemo._key
+
+    cur, walked = leaf, {}
+    for i in range(depth):
+        if known is not None:
+            # NodeMemo._key, inlined
+            if known.get(i << 64 | idx) == cur:
+                memo._stats.hits += 1
+                memo._stats.saved += depth - i
+                break
+        if arity == 2:
+            group = [cur, siblings[i]] if dirs[i] == 0 else [siblings[i], cur]
+            parent = hash_node(pp, group[0], group[1])
+        else:
+            group = siblings[i * (arity - 1) : (i + 1) * (arity - 1)]
+            group.insert(dirs[i], cur)
+            parent = hash_children(pp, group)
+        if known is not None:
+            # The siblings are proven too, once the path is
+            key = i << 64 | (idx - dirs[i])
+            for j, x in enumerate(group):
+                walked[key + j] = x
+        cur, idx = parent, idx // arity
+    else:
+        if cur != root_val:
+            return False
+
+    if known is not None:
+        memo._stats.walks += 1
+        memo.record(root_val, walked)
+    return True
+
+
+@dataclass
+class MultiProof:
+    """Membership of several leaves under one root, with shared siblings once."""
+
+    blob: bytes
+
+
+def _walk(
+    pp: CryptoParams,
+    known: Dict[int, int],
+    depth: int,
+    arity: int,
+    sibling: Callable[[int, int], int],
+) -> Dict[int, int]:
+    """
+    Hash the known nodes of each layer up to the root, computing each shared
+    ancestor once. Missing children come from sibling(layer, index), which is
+    called in a fixed order: parents ascending, then children ascending.
+    """
+    nodes = sorted(known.items())
+    for d in range(depth):
+        parents, k, n = [], 0, len(nodes)
+        if arity == 2:
+            while k < n:
+                i, v = nodes[k]
+                k += 1
+                if i & 1:
+                    node = hash_node(pp, sibling(d, i - 1), v)
+                elif k < n and nodes[k][0] == i + 1:
+                    node = hash_node(pp, v, nodes[k][1])
+                    k += 1
+                else:
+                    node = hash_node(pp, v, sibling(d, i + 1))
+                parents.append((i >> 1, node))
+        while k < n:
+            base = nodes[k][0] - nodes[k][0] % arity
+            group = []
+            for c in range(base, base + arity):
+                if k < n and nodes[k][0] == c:
+                    group.append(nodes[k][1])
+                    k += 1
+                else:
+                    group.append(sibling(d, c))
+            parents.append((base // arity, hash_children(pp, group)))
+        nodes = parents
+    return dict(nodes)
+
+
+def _multi_binding(
+    root_val: int, leaves: Sequence[int], path_data: bytes, ctx: bytes
+) -> bytes:
+    return hashlib.sha256(
+        b"ZKM|bind|"
+        + ctx
+        + to_bytes(root_val)
+        + hashlib.sha256(b"".join(to_bytes(x) for x in leaves)).digest()
+        + hashlib.sha256(path_data).digest()
+    ).digest()
+
+
+def prove_many(
+    pp: CryptoParams,
+    tree: Tree,
+    outputs: Sequence[Tuple[int, int]],
+    idxs: Sequence[int],
+    ctx: bytes,
+) -> MultiProof:
+    """
+    One proof that outputs[k] = (P, C) is leaf idxs[k] for every k. Siblings
+    needed by several paths are stored once, and directions follow from the
+    indices, so nothing but the indices and the siblings is stored.
+    """
+    if len(outputs) != len(idxs) or not idxs:
+        raise ValueError("Need one index per output")
+    if len(set(idxs)) != len(idxs):
+        raise ValueError("Duplicate leaf index")
+    layers, a = tree.layers, tree.arity
+    known = {}
+    for (P, C), i in zip(outputs, idxs):
+        if not 0 <= i < len(layers[0]):
+            raise IndexError("Bad leaf index")
+        assert layers[0][i] == hash_leaf(pp, P, C), "Leaf mismatch"
+        known[i] = layers[0][i]
+
+    siblings = []
+
+    def sibling(d: int, c: int) -> int:
+        layer = layers[d]
+        siblings.append(layer[c] if c < len(layer) else pad(pp, d + 1, c - 1))
+        return siblings[-1]
+
+    root_val = root(tree)
+    assert _walk(pp, known, len(layers) - 1, a, sibling) == {0: root_val}
+
+    w = Writer().u16(len(layers) - 1).u16(a).u32(len(idxs))
+    for i in idxs:
+        w.u64(i)
+    w.u32(len(siblings))
+    for x in siblings:
+        w.scalar(x)
+    path_data = w.getvalue()
+    binding = _multi_binding(root_val, [known[i] for i in idxs], path_data, ctx)
+    return MultiProof(b"ZKMv1|" + binding + b"|" + path_data)
+
+
+def verify_many(
+    pp: CryptoParams,
+    root_val: int,
+    outputs: Sequence[Tuple[int, int]],
+    proof: MultiProof,
+    ctx: bytes,
+) -> bool:
+    """Check a prove_many() proof; outputs are in the order they were proven."""
+    blob = proof.blob
+    if not blob.startswith(b"ZKMv1|") or blob[38:39] != b"|":
+        return False
+    binding, path_data = blob[6:38], blob[39:]
+    try:
+        r = Reader(path_data)
+        depth, arity, n = r.u16(), r.u16(), r.u32()
+        idxs = [r.u64() for _ in range(n)]
+        m = r.u32()
+        siblings = scalars(r.raw(m * 32), m)
+        if not r.at_end():
+            return False
+    except DecodeError:
+        return False
+    if not 2 <= arity <= MAX_ARITY or depth > MAX_DEPTH:
+        return False
+    if n != len(outputs) or len(set(idxs)) != n:
+        return False
+    n_leaves = arity**depth  # once: at most 256^64
+    if any(i >= n_leaves for i in idxs):
+        return False
+
+    leaves = [hash_leaf(pp, P, C) for P, C in outputs]
+    if binding != _multi_binding(root_val, leaves, path_data, ctx):
+        return False
+
+    it = iter(siblings)
+
+    def sibling(d: int, c: int) -> int:
+        x = next(it, None)
+        if x is None:
+            raise DecodeError("Too few siblings")
+        return x
+
+    try:
+        top = _walk(pp, dict(zip(idxs, leaves)), depth, arity, sibling)
+    except DecodeError:
+        return False
+    return top == {0: root_val} and next(it, None) is None
@@ -0,0 +1,75 @@
+import pytest
+from common import setup
+from fcmp.columns import Column, ColumnView
+from fcmp.tree import build, root
+
+
+def test_column_append_and_index():
+    """Test appends across growth and integer indexing."""
+    col = Column(capacity=2)
+    values = [(1 << 255) - i for i in range(100)]
+    for i, v in enumerate(values):
+        assert col.append(v) == i
+
+    assert len(col) == 100
+    assert col.capacity >= 100
+    assert col[0] == values[0]
+    assert col[-1] == values[-1]
+    assert list(col) == values
+    with pytest.raises(IndexError):
+        col[100]
+
+    col.extend([1, 2, 3])
+    assert list(col)[-3:] == [1, 2, 3]
+
+
+def test_column_view_is_snapshot():
+    """Test that views are zero-copy snapshots unaffected by later growth."""
+    col = Column(capacity=4)
+    col.extend([10, 20, 30])
+    view = col.view()
+    assert isinstance(view, ColumnView)
+
+    for v in range(40, 200, 10):  # forces several reallocations
+        col.append(v)
+    col.clear()
+
+    assert list(view) == [10, 20, 30]
+    assert list(view[1:]) == [20, 30]
+    assert view.buffer().readonly
+    expected = b"".join(v.to_bytes(32, "big") for v in [10, 20, 30])
+    assert bytes(view.buffer()) == expected
+    with pytest.raises(ValueError):
+        view[::2]
+
+
+def test_build_from_column_view():
+    """Test a tree built over a column view matches one built over a list."""
+    pp = setup()
+    leaves = [123, 456, 789, 101112, 131415]
+    col = Column()
+    col.extend(leaves)
+
+    tree = build(pp, col.view())
+    assert root(tree) == root(build(pp, leaves))
+    assert isinstance(tree.layers[0], ColumnView)
+
+
+def test_column_mmap_backed(tmp_path):
+    """Test a file-backed column grows, truncates and clears like one in memory."""
+    f = tmp_path / "col.bin"
+    col = Column(capacity=2, path=str(f))
+    col.extend(range(1, 50))
+    view = col.view()
+    assert list(col) == list(range(1, 50))
+    assert col.nbytes() == 0
+    assert f.stat().st_size >= 49 * 32
+
+    col.truncate(10)
+    assert list(col) == list(range(1, 11))
+    col.append(99)
+    assert col[-1] == 99
+
+    col.clear()
+    assert len(col) == 0
+    assert len(view) == 49 and view[0] == 1
@@ -0,0 +1,57 @@
+import pytest
+from common import SpendProof
+from common.wire import DecodeError
+from fcmp.tx import RangeProof, Tx, TxIn, TxOut
+from fcmp.wire import TxView, encode_tx, decode_tx
+from fcmp.zkproof import ZKProof
+
+
+def make_tx(n_in=2, n_out=2):
+    ins = [
+        TxIn(
+            P=100 + k,
+            I=200 + k,
+            C=300 + k,
+            root=400,
+            spend_proof=SpendProof(A1=1 + k, A2=2 + k, z=(1 << 254) + k),
+            zk_proof=ZKProof(b"ZKv2|" + bytes([k]) * 40),
+        )
+        for k in range(n_in)
+    ]
+    outs = [TxOut(P=500 + k, C=600 + k, range_proof=RangeProof(b"OK")) for k in range(n_out)]
+    return Tx(inputs=ins, outputs=outs, fee=7, ctx=b"FCMP-WIRE")
+
+
+def test_tx_roundtrip():
+    """Test encode/decode round-trip."""
+    tx = make_tx()
+    data = encode_tx(tx)
+    assert decode_tx(data) == tx
+    assert encode_tx(decode_tx(data)) == data
+
+    empty = Tx(inputs=[], outputs=[], fee=0, ctx=b"")
+    assert decode_tx(encode_tx(empty)) == empty
+
+
+def test_tx_view_lazy_fields():
+    """Test header fields and individual input fields decode on demand."""
+    tx = make_tx(n_in=3)
+    view = TxView(encode_tx(tx))
+
+    assert view.fee == 7
+    assert view.key_images == [200, 201, 202]
+    assert view._ins is None
+
+    assert view.inputs[2].root == 400
+    assert view.inputs[2].spend_proof == tx.inputs[2].spend_proof
+    assert view.inputs[0].zk_proof == tx.inputs[0].zk_proof
+    assert view.outputs == tx.outputs
+
+
+def test_tx_decode_errors():
+    """Test truncated or corrupted encodings are rejected."""
+    data = encode_tx(make_tx())
+    with pytest.raises(DecodeError):
+        decode_tx(data[:-1])
+    with pytest.raises(DecodeError):
+        decode_tx(data[:4] + b"\x09" + data[5:])
@@ -0,0 +1,61 @@
+import pytest
+from fcmp.roots import RootHistory, RootStats
+
+
+def test_root_history_window():
+    """Test membership, heights and count-based eviction."""
+    hist = RootHistory(window=3)
+    for r in [10, 20, 30, 40]:
+        hist.push(r)
+
+    assert len(hist) == 3
+    assert 10 not in hist
+    assert 20 in hist
+    assert hist.current == 40
+    assert hist.height == 3
+    assert hist.height_of(20) == 1
+    assert hist.height_of(10) is None
+
+    with pytest.raises(ValueError):
+        RootHistory(window=0)
+
+
+def test_root_history_max_age():
+    """Test height-based eviction and reconfiguration."""
+    hist = RootHistory(window=100, max_age=5)
+    hist.push(1, height=0)
+    hist.push(2, height=4)
+    hist.push(3, height=10)
+    assert 1 not in hist and 2 not in hist
+    assert 3 in hist
+
+    hist = RootHistory(window=10)
+    for r in range(10):
+        hist.push(r)
+    hist.configure(window=4)
+    assert len(hist) == 4
+    hist.configure(max_age=1)
+    assert list(r for r in range(10) if r in hist) == [8, 9]
+
+
+def test_root_history_check_metrics():
+    """Test current/stale/rejected accounting."""
+    hist = RootHistory(window=2)
+    hist.push(100)
+    hist.push(200)
+
+    assert hist.check(200)
+    assert hist.check(100)
+    assert not hist.check(50)
+    assert hist.check(300, current=300)  # tree ahead of the history
+    assert hist.stats() == RootStats(current=2, stale=1, rejected=1)
+
+
+def test_root_history_pop():
+    """Test pop forgets the newest root only."""
+    h = RootHistory(window=3)
+    assert h.pop() is None
+    for r in (10, 11, 12):
+        h.push(r)
+    assert h.pop() == 12
+    assert h.current == 11 and h.height == 1 and 10 in h and 12 not in h
@@ -1,6 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from common import setup
-from fcmp.tree import build, root, path, hash_leaf, hash_node, Tree
+from fcmp.columns import Column
+from fcmp.tree import (
+    build,
+    root,
+    path,
+    hash_leaf,
+    hash_node,
+    Tree,
+    IncrementalTree,
+    packed_layers,
+    PrunedTree,
+    build_parallel,
+    hash_children,
+)
 
 
 def test_tree_build():
@@ -102,3 +116,198 @@ def test_tree_reconstruction():
                 cur = hash_node(pp, sibling, cur)
 
         assert cur == original_root
+
+
+def fold_path(pp, leaf, siblings, dirs):
+    cur = leaf
+    for sibling, direction in zip(siblings, dirs):
+        if direction == 0:
+            cur = hash_node(pp, cur, sibling)
+        else:
+            cur = hash_node(pp, sibling, cur)
+    return cur
+
+
+def test_tree_path_with_padding():
+    """Test paths through padded nodes fold back to the root."""
+    pp = setup()
+    for n in [3, 5, 6, 7, 11]:
+        leaves = list(range(1000, 1000 + n))
+        tree = build(pp, leaves)
+        for i in range(n):
+            assert fold_path(pp, *path(pp, tree, i)) == root(tree)
+
+
+def test_incremental_tree_matches_build():
+    """Test appends reproduce build() roots and paths at every size."""
+    pp = setup()
+    leaves = [hash_leaf(pp, i, i + 1) for i in range(40)]
+    inc = IncrementalTree(pp)
+    for n, leaf in enumerate(leaves, start=1):
+        assert inc.append(leaf) == n - 1
+        full = build(pp, leaves[:n])
+        assert inc.layers == full.layers
+        assert root(inc) == root(full)
+    for i in range(len(leaves)):
+        assert path(pp, inc, i) == path(pp, build(pp, leaves), i)
+
+
+def test_incremental_tree_extend():
+    """Test batched extends match build() and single appends."""
+    pp = setup()
+    leaves = list(range(1, 100))
+    inc = IncrementalTree(pp, leaves[:10])
+    inc.extend(leaves[10:37])
+    inc.extend([])
+    inc.extend(leaves[37:])
+    assert len(inc) == len(leaves)
+    assert inc.layers == build(pp, leaves).layers
+
+
+@pytest.mark.parametrize("arity", [2, 3])
+@pytest.mark.parametrize("kind", ["list", "packed", "pruned"])
+def test_incremental_tree_truncate(kind, arity):
+    """Test truncating then re-extending matches build() at every cut."""
+    pp = setup()
+    leaves = list(range(1, 60))
+    for n in [0, 1, 2, 7, 32, 33, 58, 59, 80]:
+        if kind == "pruned":
+            tree = PrunedTree(pp, leaves, k=2, arity=arity)
+        else:
+            storage = packed_layers() if kind == "packed" else None
+            tree = IncrementalTree(pp, leaves, storage=storage, arity=arity)
+        tree.truncate(n)
+        assert len(tree) == min(n, len(leaves))
+        if n:
+            ref = build(pp, leaves[:n], arity=arity)
+            assert [list(layer) for layer in tree.layers] == ref.layers
+        else:
+            assert [list(layer) for layer in tree.layers] == [[]]
+        tree.extend(leaves[n:])
+        assert root(tree) == root(build(pp, leaves, arity=arity))
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_packed_layers_match_lists(tmp_path, mapped):
+    """Test packed and memory-mapped layers give the same roots and paths."""
+    pp = setup()
+    storage = packed_layers(str(tmp_path) if mapped else None)
+    leaves = [hash_leaf(pp, i, 2 * i) for i in range(37)]
+    ref = build(pp, leaves)
+    tree = build(pp, leaves, storage=storage)
+    assert [list(layer) for layer in tree.layers] == ref.layers
+    assert root(tree) == root(ref)
+    for i in range(len(leaves)):
+        assert path(pp, tree, i) == path(pp, ref, i)
+    if mapped:
+        assert (tmp_path / "layer-00.bin").exists()
+
+
+def test_incremental_tree_packed(tmp_path):
+    """Test appends into memory-mapped layers track build()."""
+    pp = setup()
+    leaves = list(range(1, 70))
+    inc = IncrementalTree(pp, leaves[:5], storage=packed_layers(str(tmp_path)))
+    for n in range(6, len(leaves) + 1):
+        inc.append(leaves[n - 1])
+        assert root(inc) == root(build(pp, leaves[:n]))
+    assert [list(layer) for layer in inc.layers] == build(pp, leaves).layers
+
+
+@pytest.mark.parametrize("cls", [IncrementalTree, PrunedTree])
+def test_incremental_tree_over_shared_leaves(cls):
+    """Test a tree over an existing column uses it as layer 0 and writes to it."""
+    pp = setup()
+    leaves = list(range(1, 50))
+    col = Column()
+    col.extend(leaves[:20])
+    tree = cls.over(pp, col, storage=packed_layers(), arity=3)
+    assert tree.layers[0] is col
+    assert root(tree) == root(build(pp, leaves[:20], arity=3))
+    tree.extend(leaves[20:])
+    assert len(col) == len(leaves)
+    assert root(tree) == root(build(pp, leaves, arity=3))
+    tree.truncate(7)
+    assert len(col) == 7 and root(tree) == root(build(pp, leaves[:7], arity=3))
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5])
+def test_pruned_tree_matches_build(k):
+    """Test pruned trees give build()'s roots and paths while storing fewer nodes."""
+    pp = setup()
+    leaves = list(range(1, 300))
+    tree = PrunedTree(pp, leaves[:3], k=k)
+    for n in range(4, len(leaves) + 1):
+        tree.append(leaves[n - 1])
+        if n % 37 == 0:
+            assert root(tree) == root(build(pp, leaves[:n]))
+    ref = build(pp, leaves)
+    assert root(tree) == root(ref)
+    for i in range(len(leaves)):
+        assert path(pp, tree, i) == path(pp, ref, i)
+    full = sum(len(layer) for layer in ref.layers)
+    assert tree.stored_nodes() == full if k == 1 else tree.stored_nodes() < full
+
+
+def test_pruned_tree_rejects_bad_k():
+    pp = setup()
+    with pytest.raises(ValueError, match="k must be"):
+        PrunedTree(pp, k=0)
+
+
+@pytest.mark.parametrize("n", [2, 3, 17, 64, 100, 257])
+def test_build_parallel_matches_build(n):
+    """Test subtree builds reproduce build() layers, padding included."""
+    pp = setup()
+    leaves = [hash_leaf(pp, i, i) for i in range(n)]
+    ref = build(pp, leaves)
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        for log in range(0, 5):
+            tree = build_parallel(pp, leaves, subtree_log=log, executor=ex)
+            assert tree.layers == ref.layers
+
+
+def test_build_parallel_process_pool():
+    """Test the default process pool path and packed storage."""
+    pp = setup()
+    leaves = list(range(1, 1000))
+    tree = build_parallel(pp, leaves, workers=2, storage=packed_layers())
+    assert root(tree) == root(build(pp, leaves))
+    assert path(pp, tree, 998) == path(pp, build(pp, leaves), 998)
+
+
+@pytest.mark.parametrize("arity", [3, 4, 16])
+def test_k_ary_tree(arity):
+    """Test k-ary builds: paths fold to the root, and every builder agrees."""
+    pp = setup()
+    for n in [1, 2, arity, arity + 1, 50]:
+        leaves = list(range(500, 500 + n))
+        tree = build(pp, leaves, arity=arity)
+        for i in range(n):
+            leaf, siblings, dirs = path(pp, tree, i)
+            assert len(siblings) == len(dirs) * (arity - 1)
+            cur = leaf
+            for d, pos in enumerate(dirs):
+                group = siblings[d * (arity - 1) : (d + 1) * (arity - 1)]
+                group.insert(pos, cur)
+                cur = hash_children(pp, group)
+            assert cur == root(tree)
+
+        inc = IncrementalTree(pp, arity=arity)
+        for leaf in leaves:
+            inc.append(leaf)
+        assert inc.layers == tree.layers
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            par = build_parallel(pp, leaves, subtree_log=1, executor=ex, arity=arity)
+        assert par.layers == tree.layers
+        pruned = PrunedTree(pp, leaves, k=2, arity=arity)
+        assert [path(pp, pruned, i) for i in range(n)] == [
+            path(pp, tree, i) for i in range(n)
+        ]
+
+
+def test_hash_children_binary_and_bad_arity():
+    pp = setup()
+    assert hash_children(pp, [5, 7]) == hash_node(pp, 5, 7)
+    with pytest.raises(ValueError, match="Arity"):
+        build(pp, [1, 2], arity=1)
@@ -0,0 +1,241 @@
+import secrets
+from dataclasses import replace
+
+import pytest
+from common import setup, commit, gen_key, VerifyCache
+from fcmp.roots import RootHistory, RootStats
+from fcmp.tree import IncrementalTree, build, hash_leaf, root
+from fcmp.tx import Tx, TxOut, prove_range
+from fcmp.zkproof import NodeMemo, ZKProof
+from fcmp.mempool import new_mempool, root_filter
+from fcmp.chain import ChainState
+from fcmp.wire import tx_hash
+from fcmp.verify import (
+    UTXO_LEAVES,
+    add_utxo,
+    build_tree,
+    live_tree,
+    prove_input,
+    verify_block,
+    verify_tx,
+    verify_txs,
+)
+
+
+def make_block(pp, n_txs, ctx=b"TEST-BLOCK", arity=2):
+    """Build a tree of n_txs spendable outputs and one balanced tx per output."""
+    keys = [gen_key(pp) for _ in range(n_txs)]
+    values = [10 * (i + 1) for i in range(n_txs)]
+    blinds = [secrets.randbelow(pp.q - 1) + 1 for _ in range(n_txs)]
+    commits = [commit(pp, values[i], blinds[i]) for i in range(n_txs)]
+    leaves = [hash_leaf(pp, keys[i].P, commits[i]) for i in range(n_txs)]
+    tree = build(pp, leaves, arity=arity)
+
+    txs = []
+    for i in range(n_txs):
+        fee = 1
+        v1 = values[i] // 2
+        v2 = values[i] - v1 - fee
+        r1 = secrets.randbelow(pp.q - 1) + 1
+        r2 = (blinds[i] - r1) % pp.q
+        txin = prove_input(pp, tree, keys[i], commits[i], i, ctx)
+        outs = [
+            TxOut(gen_key(pp).P, commit(pp, v1, r1), prove_range(v1)),
+            TxOut(gen_key(pp).P, commit(pp, v2, r2), prove_range(v2)),
+        ]
+        txs.append(Tx([txin], outs, fee, ctx))
+    return tree, txs
+
+
+def test_verify_tx():
+    """Test single transaction verification and double-spend rejection."""
+    pp = setup()
+    tree, txs = make_block(pp, 4)
+    for tx in txs:
+        assert verify_tx(pp, tx, tree, set())
+    assert not verify_tx(pp, txs[0], tree, {txs[0].inputs[0].I})
+
+
+@pytest.mark.parametrize("arity", [3, 4, 16])
+def test_verify_tx_k_ary(arity):
+    """Test proofs against k-ary trees carry k - 1 siblings per level and verify."""
+    pp = setup()
+    tree, txs = make_block(pp, 7, arity=arity)
+    assert verify_txs(pp, txs, tree, set()) == [True] * 7
+    binary, _ = make_block(pp, 7)
+    assert len(tree.layers) < len(binary.layers)
+
+
+def test_verify_txs_with_node_memo():
+    """Test a node memo keeps results, skips hashes and tracks accepted roots."""
+    pp = setup()
+    tree, txs = make_block(pp, 8)
+    memo = NodeMemo()
+    assert verify_txs(pp, txs, tree, set(), memo=memo) == [True] * 8
+    assert memo.stats().hits == 7 and memo.stats().saved > 0
+    assert root(tree) in memo
+
+    grown = IncrementalTree(pp, tree.layers[0])
+    grown.append(hash_leaf(pp, 1, 2))
+    assert verify_tx(pp, txs[0], grown, set(), memo=memo) is False
+    assert root(tree) not in memo
+
+
+def test_verify_txs_matches_verify_tx():
+    """Test block-level verification flags exactly the bad transactions."""
+    pp = setup()
+    tree, txs = make_block(pp, 8)
+    assert verify_txs(pp, txs, tree, set()) == [True] * 8
+
+    # Bad spend proof, bad balance, already-spent key image
+    txs[1].inputs[0].spend_proof.z = (txs[1].inputs[0].spend_proof.z + 1) % pp.q
+    txs[3].fee += 1
+    spent = {txs[4].inputs[0].I}
+
+    expected = [verify_tx(pp, tx, tree, spent) for tx in txs]
+    assert expected == [True, False, True, False, False, True, True, True]
+    assert verify_txs(pp, txs, tree, spent) == expected
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_block(workers):
+    """Test block verification in a process pool matches serial results."""
+    pp = setup()
+    tree, txs = make_block(pp, 8)
+    txs[2].fee += 1
+    spent = {txs[5].inputs[0].I}
+    block = txs + [txs[0]]  # replays tx 0 inside the block
+
+    res = verify_block(pp, block, tree, spent, workers=workers, chunksize=3)
+    assert res.results == [True, True, False, True, True, False, True, True, False]
+    assert not res.ok
+    assert res.tx_per_sec > 0
+
+
+def test_live_tree_tracks_add_utxo():
+    """Test the live tree follows add_utxo on the shared leaf column."""
+    pp = setup()
+    add_utxo(pp, gen_key(pp).P, commit(pp, 1, 2))
+    snap = build_tree(pp)
+    tree = live_tree(pp)
+    assert tree.layers[0] is UTXO_LEAVES
+    for _ in range(5):
+        add_utxo(pp, gen_key(pp).P, commit(pp, 1, 2))
+        assert live_tree(pp) is tree
+        assert root(tree) == root(build(pp, list(UTXO_LEAVES)))
+    # Snapshots keep their leaves
+    assert len(snap.layers[0]) == len(UTXO_LEAVES) - 5
+    assert root(build_tree(pp)) == root(tree)
+    with pytest.raises(ValueError):
+        live_tree(pp, arity=3)
+
+
+def test_verify_tx_against_stale_root():
+    """Test proofs stay valid after the tree grows if their root is in history."""
+    pp = setup()
+    tree, txs = make_block(pp, 4)
+    inc = IncrementalTree(pp, tree.layers[0])
+    roots = RootHistory(window=4)
+    roots.push(root(inc))
+
+    inc.append(hash_leaf(pp, 1, 2))
+    roots.push(root(inc))
+
+    assert not verify_tx(pp, txs[0], inc, set())
+    assert verify_tx(pp, txs[0], inc, set(), roots)
+    assert verify_txs(pp, txs, inc, set(), roots) == [True] * 4
+    assert verify_block(pp, txs, inc, set(), roots=roots).ok
+    assert roots.stats().stale == 9
+
+    for k in range(4):
+        inc.append(hash_leaf(pp, k, k))
+        roots.push(root(inc))
+    assert not verify_tx(pp, txs[0], inc, set(), roots)
+    assert roots.stats().rejected == 1
+
+
+def test_mempool_drops_txs_on_stale_roots():
+    """Test pooled txs leave once their root falls out of the history."""
+    pp = setup()
+    tree, txs = make_block(pp, 4)
+    inc = IncrementalTree(pp, tree.layers[0])
+    roots = RootHistory(window=2)
+    roots.push(root(inc))
+    txs[3].fee += 1  # unbalanced
+
+    pool = new_mempool(pp, inc, {txs[2].inputs[0].I}, roots)
+    assert pool.add_many(txs) == [True, True, False, False]
+
+    inc.append(hash_leaf(pp, 1, 2))
+    roots.push(root(inc))
+    pool.on_roots(root_filter(inc, roots))
+    assert len(pool) == 2
+
+    for k in range(2):
+        inc.append(hash_leaf(pp, k, k))
+        roots.push(root(inc))
+    pool.on_roots(root_filter(inc, roots))
+    assert len(pool) == 0 and pool.stats().stale_root == 2
+    # Pool filtering is not proof verification: the counters stay untouched
+    assert roots.stats() == RootStats()
+
+
+def test_mempool_rejects_malformed_proof_in_batch():
+    """Test a badly framed proof fails only its own tx, not the whole batch."""
+    pp = setup()
+    tree, txs = make_block(pp, 3)
+    txin = txs[1].inputs[0]
+    bad = replace(txin, zk_proof=ZKProof(b"ZKv2|" + b"x" * 40))
+    txs[1] = replace(txs[1], inputs=[bad])
+
+    pool = new_mempool(pp, tree, set())
+    assert pool.add_many(txs) == [True, False, True]
+    assert pool.stats().invalid == 1
+
+
+def test_chain_state_apply_and_undo():
+    """Test blocks extend the live tree once and undo restores its roots."""
+    pp = setup()
+    for _ in range(3):
+        add_utxo(pp, gen_key(pp).P, commit(pp, 1, 2))
+    roots = RootHistory(window=8)
+    chain = ChainState(pp, roots=roots)
+    root0, n0 = roots.current, len(UTXO_LEAVES)
+    assert root0 == root(build_tree(pp))
+
+    _, txs = make_block(pp, 3)
+    chain.apply_block(txs[:2])
+    chain.apply_block(txs[2:])
+    assert len(UTXO_LEAVES) == n0 + 6 and len(roots) == 3
+    assert root(chain.tree) == root(build(pp, list(UTXO_LEAVES)))
+    assert live_tree(pp) is chain.tree
+    assert chain.spent == {tx.inputs[0].I for tx in txs}
+
+    chain.undo_block()
+    assert root(chain.tree) == root(build(pp, list(UTXO_LEAVES)))
+    chain.undo_block()
+    assert len(UTXO_LEAVES) == n0 and roots.current == root0 == root(chain.tree)
+    assert len(roots) == 1 and chain.spent == set()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_cache(workers):
+    """Test cached txs only get their state checks, in every entry point."""
+    pp = setup()
+    tree, txs = make_block(pp, 4)
+    txs[3].fee += 1  # unbalanced
+    cache = VerifyCache()
+    assert verify_txs(pp, txs, tree, set(), cache=cache) == [True] * 3 + [False]
+    assert cache.stats().misses == 4 and len(cache) == 3
+
+    res = verify_block(pp, txs, tree, set(), workers=workers, cache=cache)
+    assert res.results == [True] * 3 + [False]
+    assert verify_tx(pp, txs[1], tree, set(), cache=cache)
+    assert not verify_tx(pp, txs[1], tree, {txs[1].inputs[0].I}, cache=cache)
+    s = cache.stats()
+    assert (s.hits, s.misses) == (4, 5) and s.saved > 0
+
+    # Cache keys cover the roots inputs were proven against
+    moved = Tx(list(txs[0].inputs), txs[0].outputs, txs[0].fee, txs[0].ctx)
+    moved.inputs[0] = replace(moved.inputs[0], root=moved.inputs[0].root + 1)
+    assert tx_hash(moved) != tx_hash(txs[0]) and tx_hash(moved) not in cache
@@ -0,0 +1,46 @@
+import pytest
+from common import setup, commit, gen_key
+from fcmp.tree import build, hash_leaf, path, root
+from fcmp.witness import WitnessTracker
+from fcmp.zkproof import prove, verify
+
+
+@pytest.mark.parametrize("arity", [2, 3])
+def test_witness_paths_follow_appends(arity):
+    """Test tracked paths match a full rebuild after every append."""
+    pp = setup()
+    leaves = [hash_leaf(pp, i, i + 1) for i in range(60)]
+    mine = {0, 5, 17, 18, 41}
+    wt = WitnessTracker(pp, arity)
+    for n, leaf in enumerate(leaves, start=1):
+        assert wt.append(leaf, track=n - 1 in mine) == n - 1
+        full = build(pp, leaves[:n], arity=arity)
+        assert root(wt) == root(full)
+        for i in mine:
+            if i < n:
+                assert path(pp, wt, i) == path(pp, full, i)
+    assert wt.tracked == mine
+
+
+def test_witness_from_tree_and_prove():
+    """Test seeding from a tree, tracking off the frontier and proving."""
+    pp = setup()
+    key, C = gen_key(pp), commit(pp, 3, 4)
+    leaves = list(range(1, 21)) + [hash_leaf(pp, key.P, C)]
+    wt = WitnessTracker.from_tree(pp, build(pp, leaves), track=[2])
+    wt.track(20)
+    with pytest.raises(ValueError, match="frontier"):
+        wt.track(7)
+    with pytest.raises(LookupError):
+        path(pp, wt, 7)
+
+    wt.extend(range(100, 130))
+    full = build(pp, leaves + list(range(100, 130)))
+    assert path(pp, wt, 2) == path(pp, full, 2)
+    proof = prove(pp, wt, key.P, C, 20, b"ctx")
+    assert verify(pp, root(full), key.P, C, proof, b"ctx")
+
+    wt.untrack(2)
+    wt.append(7)
+    with pytest.raises(LookupError):
+        path(pp, wt, 2)
@@ -0,0 +1,123 @@
+import pytest
+from common import setup, commit, gen_key
+from common.wire import Writer
+from fcmp.tree import MAX_ARITY, build, hash_leaf, root
+from fcmp.zkproof import (
+    MAX_DEPTH,
+    MultiProof,
+    NodeMemo,
+    ZKProof,
+    prove,
+    prove_many,
+    verify,
+    verify_many,
+)
+
+
+def make_tree(pp, n, arity=2):
+    outputs = [(gen_key(pp).P, commit(pp, i + 1, i + 2)) for i in range(n)]
+    tree = build(pp, [hash_leaf(pp, P, C) for P, C in outputs], arity=arity)
+    return tree, outputs
+
+
+@pytest.mark.parametrize("arity", [2, 3, 4])
+def test_multiproof_roundtrip(arity):
+    """Test multiproofs verify for any subset, including padded leaves."""
+    pp = setup()
+    tree, outputs = make_tree(pp, 13, arity)
+    for idxs in [[0], [12], [3, 4], [11, 0, 5], list(range(13))]:
+        outs = [outputs[i] for i in idxs]
+        proof = prove_many(pp, tree, outs, idxs, b"ctx")
+        assert verify_many(pp, root(tree), outs, proof, b"ctx")
+        assert not verify_many(pp, root(tree), outs, proof, b"other")
+        assert not verify_many(pp, root(tree) + 1, outs, proof, b"ctx")
+        if len(idxs) > 1:
+            assert not verify_many(pp, root(tree), outs[::-1], proof, b"ctx")
+
+
+def test_multiproof_shares_siblings():
+    """Test a multiproof is smaller than independent proofs of the same leaves."""
+    pp = setup()
+    tree, outputs = make_tree(pp, 64)
+    idxs = list(range(0, 64, 4))
+    outs = [outputs[i] for i in idxs]
+    multi = prove_many(pp, tree, outs, idxs, b"ctx")
+    single = sum(
+        len(prove(pp, tree, P, C, i, b"ctx").blob) for (P, C), i in zip(outs, idxs)
+    )
+    assert len(multi.blob) < single / 2
+
+
+def test_multiproof_rejects_tampering():
+    pp = setup()
+    tree, outputs = make_tree(pp, 9)
+    outs = [outputs[1], outputs[7]]
+    blob = prove_many(pp, tree, outs, [1, 7], b"ctx").blob
+    for bad in [blob[:-1], blob + b"\0" * 32, blob[:-5] + b"\1" + blob[-4:]]:
+        assert not verify_many(pp, root(tree), outs, MultiProof(bad), b"ctx")
+    with pytest.raises(ValueError, match="Duplicate"):
+        prove_many(pp, tree, outs, [1, 1], b"ctx")
+
+
+def test_multiproof_rejects_deep_headers():
+    """Test headers claiming huge trees are rejected before any hashing."""
+    pp = setup()
+    n = 2000
+    outs = [(1, 2)] * n
+    for depth in [MAX_DEPTH + 1, 0xFFFF]:
+        w = Writer().u16(depth).u16(MAX_ARITY).u32(n)
+        for i in range(n):
+            w.u64(i)
+        w.u32(0)
+        blob = b"ZKMv1|" + b"\0" * 32 + b"|" + w.getvalue()
+        assert not verify_many(pp, 7, outs, MultiProof(blob), b"ctx")
+
+
+def test_single_proof_rejects_bad_lengths():
+    """Test truncated or padded path data fails verification, not an assert."""
+    pp = setup()
+    tree, outputs = make_tree(pp, 9, arity=3)
+    (P, C), r = outputs[4], root(tree)
+    blob = prove(pp, tree, P, C, 4, b"ctx").blob
+    head = blob[: len(b"ZKv2|") + 33]
+    for bad in [blob[:-1], blob + b"\0", head + b"\0\1", head]:
+        assert not verify(pp, r, P, C, ZKProof(bad), b"ctx")
+
+
+def test_node_memo_stops_walks_early():
+    """Test memoised walks give the same answers while skipping hashes."""
+    pp = setup()
+    tree, outputs = make_tree(pp, 32)
+    proofs = [prove(pp, tree, P, C, i, b"ctx") for i, (P, C) in enumerate(outputs)]
+    memo = NodeMemo()
+    for (P, C), prf in zip(outputs, proofs):
+        assert verify(pp, root(tree), P, C, prf, b"ctx", memo)
+    stats = memo.stats()
+    assert stats.walks == 32 and stats.hits == 31
+    # Leaf i is first known at level ctz(i): a sibling proven by leaf i - 1's path
+    assert stats.saved == sum(5 - ((i & -i).bit_length() - 1) for i in range(1, 32))
+
+    # Rechecking a proven leaf skips its whole path
+    P, C = outputs[3]
+    assert verify(pp, root(tree), P, C, proofs[3], b"ctx", memo)
+    assert memo.stats().saved == stats.saved + 5
+
+    # Known nodes never make a bad proof pass
+    assert not verify(pp, root(tree), P + 1, C, proofs[3], b"ctx", memo)
+    assert not verify(pp, root(tree), P, C, proofs[4], b"ctx", memo)
+    blob = bytearray(proofs[3].blob)
+    blob[50] ^= 1
+    assert not verify(pp, root(tree), P, C, ZKProof(bytes(blob)), b"ctx", memo)
+
+
+def test_node_memo_bounds():
+    pp = setup()
+    memo = NodeMemo(max_roots=2, nodes_per_root=4)
+    for r in [1, 2, 3]:
+        memo.record(r, {NodeMemo._key(0, 0): r})
+    assert 1 not in memo and len(memo) == 2
+    memo.record(3, {NodeMemo._key(1, k): k for k in range(10)})
+    assert len(memo.nodes(3)) == 4
+    assert memo.get(3, 1, 9) == 9 and memo.get(3, 0, 0) is None
+    memo.retain({3})
+    assert 2 not in memo and 3 in memo
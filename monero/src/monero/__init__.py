@@ -1,16 +1,48 @@
 """Monero RingCT implementation."""
 
-from monero.ring import ring_prove, ring_verify, RingSig
+from monero.ring import (
+    ring_prove,
+    ring_verify,
+    ring_verify_many,
+    RingSig,
+    ring_enc_cache_clear,
+    ring_enc_cache_stats,
+)
 from monero.zklink import zklink_prove, zklink_verify, ZKLink
 from monero.range_proof import range_prove_stub, verify_range_stub, RangeProofStub
-from monero.utxo import UTXO, add_utxo, get_utxo, get_utxo_count, clear_utxos
-from monero.transaction import TxIn, TxOut, Tx, prove_input, verify_tx
+from monero.utxo import (
+    UTXO,
+    UtxoStore,
+    open_utxos,
+    add_utxo,
+    get_utxo,
+    get_utxo_count,
+    clear_utxos,
+)
+from monero.decoys import DecoySelector, gamma_age, DECOYS
+from monero.transaction import (
+    TxIn,
+    TxOut,
+    Tx,
+    prove_input,
+    prove_inputs,
+    verify_tx,
+    verify_tx_crypto,
+    verify_txs_crypto,
+    verify_block,
+)
+from monero.wire import TxView, encode_tx, decode_tx, tx_hash
+from monero.mempool import new_mempool
+from monero.chain import ChainState, RingBlockUndo
 
 __all__ = [
     # Ring signatures
     "ring_prove",
     "ring_verify",
+    "ring_verify_many",
     "RingSig",
+    "ring_enc_cache_clear",
+    "ring_enc_cache_stats",
     # ZK links
     "zklink_prove",
     "zklink_verify",
@@ -21,14 +53,34 @@ __all__ = [
     "RangeProofStub",
     # UTXOs
     "UTXO",
+    "UtxoStore",
+    "open_utxos",
     "add_utxo",
     "get_utxo",
     "get_utxo_count",
     "clear_utxos",
+    # Decoy selection
+    "DecoySelector",
+    "gamma_age",
+    "DECOYS",
     # Transactions
     "TxIn",
     "TxOut",
     "Tx",
     "prove_input",
+    "prove_inputs",
     "verify_tx",
+    "verify_tx_crypto",
+    "verify_txs_crypto",
+    "verify_block",
+    # Wire format
+    "TxView",
+    "encode_tx",
+    "decode_tx",
+    "tx_hash",
+    # Transaction pool
+    "new_mempool",
+    # Chain state
+    "ChainState",
+    "RingBlockUndo",
 ]
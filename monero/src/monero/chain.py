@@ -0,0 +1,63 @@
+"""Chain state for ring transactions: UTXO store, spent images, decoy index."""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence, Tuple
+from common import SpentSet
+from common.chain import BaseChainState, BlockUndo
+from monero.decoys import DECOYS, DecoySelector
+from monero.transaction import Tx
+from monero.utxo import GLOBAL, UTXO, UtxoStore
+
+
+@dataclass(frozen=True)
+class RingBlockUndo(BlockUndo):
+    decoy_height: int  # decoy index blocks before this one
+
+
+class ChainState(BaseChainState[Tx]):
+    """
+    Applies blocks to a UtxoStore (default: the global one) with one batched
+    append per block. Each block is also a block of the decoy index, so ring
+    sampling sees real block boundaries and timestamps.
+    """
+
+    def __init__(
+        self,
+        utxos: Optional[UtxoStore] = None,
+        spent: Optional[SpentSet] = None,
+        decoys: Optional[DecoySelector] = None,
+        max_undo: Optional[int] = 128,
+    ):
+        super().__init__(spent, max_undo)
+        self.utxos = utxos if utxos is not None else GLOBAL
+        self.decoys = decoys if decoys is not None else DECOYS
+        self._timestamp: Optional[float] = None
+
+    def apply_block(
+        self, txs: Sequence[Tx], timestamp: Optional[float] = None
+    ) -> BlockUndo:
+        """Apply verified txs; timestamp defaults to one block time on."""
+        self._timestamp = timestamp
+        return super().apply_block(txs)
+
+    def _undo_record(self, images: Tuple[int, ...]) -> BlockUndo:
+        return RingBlockUndo(
+            self.height, len(self.utxos), images, decoy_height=self.decoys.height
+        )
+
+    def _key_images(self, tx: Tx) -> Iterable[int]:
+        return (tin.I for tin in tx.ins)
+
+    def _n_outputs(self) -> int:
+        return len(self.utxos)
+
+    def _append_outputs(self, txs: Sequence[Tx]) -> None:
+        # Only the public part of an output is known to the chain
+        outs = [UTXO(P=o.P, C=o.C, v=0, r=0, sk=0) for tx in txs for o in tx.outs]
+        self.decoys.new_block(self._timestamp)
+        self.utxos.extend(outs)
+        self.decoys.add_output(len(outs))
+
+    def _truncate_outputs(self, undo: BlockUndo) -> None:
+        self.utxos.truncate(undo.n_outputs)
+        self.decoys.rewind(undo.decoy_height, undo.n_outputs)
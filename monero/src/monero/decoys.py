@@ -0,0 +1,197 @@
+"""
+Decoy selection by output age.
+
+Ring members are drawn like Monero's wallet does: sample an age in seconds
+from a distribution (by default exp of a gamma, as fitted to real spends),
+find the block that was the tip that long ago by bisecting block timestamps,
+then pick a uniform output in that block through a cumulative output count
+per block. Each draw is O(log blocks); adding outputs or blocks is O(1).
+"""
+
+import math
+import os
+import random
+from array import array
+from bisect import bisect_right
+from typing import Callable, List, Optional, Sequence, Set
+
+BLOCK_TIME = 120  # seconds
+
+# Monero's fit of log(spent output age in seconds)
+GAMMA_SHAPE = 19.28
+GAMMA_SCALE = 1 / 1.61
+
+# Gamma draws allowed per ring member before sample_ring fills uniformly
+DRAWS_PER_MEMBER = 4
+
+# Draws an output age in seconds
+AgeSampler = Callable[[random.Random], float]
+
+
+def gamma_age(shape: float = GAMMA_SHAPE, scale: float = GAMMA_SCALE) -> AgeSampler:
+    """Ages whose logarithm is gamma(shape, scale) distributed."""
+
+    def age(rng: random.Random) -> float:
+        return math.exp(rng.gammavariate(shape, scale))
+
+    return age
+
+
+class DecoySelector:
+    """
+    Cumulative index of outputs per block, with age-based ring sampling.
+
+    Outputs are global indices 0..len-1 in creation order; add_output() puts
+    them in the current block and new_block() starts the next one. Draws that
+    land before the first block or in an empty block are retried, and after
+    max_tries misses a uniform output is used instead, so young chains still
+    get full rings.
+    """
+
+    def __init__(
+        self,
+        age: Optional[AgeSampler] = None,
+        block_time: float = BLOCK_TIME,
+        rng: Optional[random.Random] = None,
+        max_tries: int = 64,
+    ):
+        self.age = age or gamma_age()
+        self.block_time = block_time
+        self.rng = rng or random.Random(os.urandom(32))
+        self.max_tries = max_tries
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._cum[-1] if self._cum else 0
+
+    @property
+    def height(self) -> int:
+        """Number of blocks so far."""
+        return len(self._cum)
+
+    def clear(self) -> None:
+        self._cum = array("Q")  # outputs created up to and including block h
+        self._times = array("d")  # block h's timestamp
+
+    def new_block(self, timestamp: Optional[float] = None) -> None:
+        """Start a block; timestamps default to block_time after the last one."""
+        if timestamp is None:
+            timestamp = self._times[-1] + self.block_time if self._times else 0.0
+        elif self._times and timestamp < self._times[-1]:
+            raise ValueError("Block timestamps must not decrease")
+        self._cum.append(len(self))
+        self._times.append(timestamp)
+
+    def add_output(self, count: int = 1) -> None:
+        """Record count new outputs in the current block."""
+        if not self._cum:
+            self.new_block()
+        self._cum[-1] += count
+
+    def sync(self, n: int, per_block: Optional[int] = None) -> None:
+        """
+        Match an output set of n entries: add missing ones, or restart. With
+        per_block, the missing outputs fill the current block up to per_block
+        outputs and then go into new blocks of that size.
+        """
+        if n < len(self):
+            self.clear()
+        missing = n - len(self)
+        if per_block is None:
+            if missing > 0:
+                self.add_output(missing)
+            return
+        if per_block < 1:
+            raise ValueError("per_block must be positive")
+        cum = self._cum
+        while missing > 0:
+            room = per_block - (cum[-1] - cum[-2] if len(cum) > 1 else len(self))
+            if not cum or room <= 0:
+                self.new_block()
+                room = per_block
+            k = min(room, missing)
+            self.add_output(k)
+            missing -= k
+
+    def rewind(self, height: int, n: int) -> None:
+        """Keep the first height blocks and the first n outputs (undo blocks)."""
+        del self._cum[height:]
+        del self._times[height:]
+        cum = self._cum
+        for h in range(len(cum) - 1, -1, -1):
+            if cum[h] <= n:
+                break
+            cum[h] = n
+
+    def sample(self) -> int:
+        """One decoy index."""
+        return self._draw(self.rng)
+
+    def sample_ring(self, real: int, ring_size: int) -> List[int]:
+        """Sorted, distinct ring indices: real plus ring_size - 1 decoys."""
+        n = len(self)
+        if not 0 <= real < n:
+            raise IndexError("Bad output index")
+        ring_size = max(1, min(ring_size, n))
+        members = {real}
+        # Age-based draws first, a bounded number of them: on short chains,
+        # or with rings near the output count, they keep hitting outputs
+        # already picked. Whatever is left is filled uniformly.
+        draw, rng = self._draw_once, self.rng
+        # With every block at one timestamp all ages fall before the chain
+        draws = DRAWS_PER_MEMBER * ring_size if self._span() > 0 else 0
+        for _ in range(draws):
+            if len(members) == ring_size:
+                break
+            i = draw(rng)
+            if i is not None:
+                members.add(i)
+        members.update(self._uniform(ring_size - len(members), members))
+        return sorted(members)
+
+    def sample_rings(self, reals: Sequence[int], ring_size: int) -> List[List[int]]:
+        """sample_ring for many inputs in one call."""
+        return [self.sample_ring(real, ring_size) for real in reals]
+
+    def _span(self) -> float:
+        """Seconds from the first block to the last."""
+        return self._times[-1] - self._times[0] if self._times else 0.0
+
+    def _draw(self, rng: random.Random) -> int:
+        for _ in range(self.max_tries if self._span() > 0 else 0):
+            i = self._draw_once(rng)
+            if i is not None:
+                return i
+        return rng.randrange(len(self))
+
+    def _draw_once(self, rng: random.Random) -> Optional[int]:
+        """One age sample; None if it lands before the chain or in an empty block."""
+        times = self._times
+        t = times[-1] - self.age(rng)
+        if t < times[0]:
+            return None
+        cum = self._cum
+        h = bisect_right(times, t) - 1
+        lo = cum[h - 1] if h else 0
+        if cum[h] > lo:
+            return lo + rng.randrange(cum[h] - lo)
+        return None
+
+    def _uniform(self, k: int, taken: Set[int]) -> List[int]:
+        """k distinct outputs not in taken, uniformly."""
+        if k <= 0:
+            return []
+        n, rng = len(self), self.rng
+        if 2 * k >= n - len(taken):
+            # Dense: pick from the explicit complement
+            return rng.sample([i for i in range(n) if i not in taken], k)
+        out: Set[int] = set()
+        while len(out) < k:
+            i = rng.randrange(n)
+            if i not in taken:
+                out.add(i)
+        return list(out)
+
+
+# Selector over the global UTXO set, kept in step by monero.utxo
+DECOYS = DecoySelector()
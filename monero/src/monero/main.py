@@ -1,7 +1,7 @@
 import secrets
-from typing import Set
 from common import setup, keygen, commit
-from monero.transaction import Tx, TxOut, prove_input, verify_tx
+from monero.chain import ChainState
+from monero.transaction import Tx, TxOut, prove_inputs, verify_tx
 from monero.range_proof import range_prove_stub
 from monero.utxo import UTXO, add_utxo
 
@@ -17,33 +17,31 @@ def main() -> None:
         C = commit(pp, vals[i], blinds[i])
         add_utxo(UTXO(P=kp.P, C=C, v=vals[i], r=blinds[i], sk=kp.sk))
 
-    # Spend one input with a ring of size 8, create two outputs
-    spend_idx = 3
+    # Spend two inputs with rings of size 8, create two outputs
+    spend_idxs = [3, 5]
     ring_size = 8
     fee = 3
     ctx = b"MONERO-RINGCT-TOY"
 
-    # Prove input + get r_pseudo so we can balance output blindings
-    txin, r_pseudo = prove_input(pp, ctx, spend_idx, ring_size)
-
-    # Choose output amounts (must satisfy v1 + v2 + fee = v_in)
+    # Choose output amounts (must satisfy v1 + v2 + fee = sum of inputs)
     from .utxo import GLOBAL
 
-    v_in = GLOBAL[spend_idx].v
+    v_in = sum(GLOBAL[i].v for i in spend_idxs)
     v1 = 17
     v2 = v_in - v1 - fee
     assert v2 >= 0
 
-    # Choose output blindings so r1 + r2 == r_pseudo (mod q)
+    # Output blindings are free; prove_inputs picks pseudo blindings to match
     r1 = secrets.randbelow(pp.q - 1) + 1
-    r2 = (r_pseudo - r1) % pp.q
+    r2 = secrets.randbelow(pp.q - 1) + 1
+    ins, _ = prove_inputs(pp, ctx, spend_idxs, ring_size, out_blinds=[r1, r2])
 
     dest1, dest2 = keygen(pp), keygen(pp)
     C1 = commit(pp, v1, r1)
     C2 = commit(pp, v2, r2)
 
     tx = Tx(
-        ins=[txin],
+        ins=ins,
         outs=[
             TxOut(dest1.P, C1, range_prove_stub(v1)),
             TxOut(dest2.P, C2, range_prove_stub(v2)),
@@ -52,19 +50,16 @@ def main() -> None:
         ctx=ctx,
     )
 
-    # Verify + apply
-    spent_images: Set[int] = set()
-    ok = verify_tx(pp, tx, spent_images)
+    # Verify + apply as a one-tx block
+    chain = ChainState()
+    ok = verify_tx(pp, tx, chain.spent)
     print("TX verifies?", ok)
 
     if ok:
-        spent_images.add(txin.I)
-        # append outputs to GLOBAL UTXO (for completeness of the toy)
-        add_utxo(UTXO(P=dest1.P, C=C1, v=v1, r=r1, sk=0))
-        add_utxo(UTXO(P=dest2.P, C=C2, v=v2, r=r2, sk=0))
+        chain.apply_block([tx])
 
     # Double-spend attempt (same tx again)
-    ok2 = verify_tx(pp, tx, spent_images)
+    ok2 = verify_tx(pp, tx, chain.spent)
     print("Double-spend blocked?", not ok2)
 
 
@@ -0,0 +1,33 @@
+"""Mempool for ring transactions: ring, link, range and balance checks on entry."""
+
+from functools import partial
+from typing import List, Optional
+from common import CryptoParams, SpentSet, VerifyCache
+from common.mempool import DEFAULT_MAX_BYTES, Mempool
+from monero.transaction import Tx, verify_txs_crypto
+from monero.wire import encode_tx
+
+
+def _key_images(tx: Tx) -> List[int]:
+    return [tin.I for tin in tx.ins]
+
+
+def new_mempool(
+    pp: CryptoParams,
+    spent_images: SpentSet,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    cache: Optional[VerifyCache] = None,
+) -> Mempool[Tx]:
+    """
+    Pool admitting txs that pass verify_tx against spent_images. Rings name
+    outputs by value, so only new key images (on_spent / on_block) can make
+    a pooled tx invalid. Passing the cache given to verify_block lets blocks
+    of pooled txs skip their crypto checks.
+    """
+    return Mempool(
+        encode_tx,
+        _key_images,
+        partial(verify_txs_crypto, pp, cache=cache),
+        spent=spent_images,
+        max_bytes=max_bytes,
+    )
@@ -1,7 +1,7 @@
 import secrets
 from dataclasses import dataclass
-from typing import List
-from common import CryptoParams, Keypair, Hp, to_bytes, hash_mod
+from typing import Dict, List, Optional, Sequence, Tuple
+from common import CacheStats, CryptoParams, Keypair, Hp, LRUCache, Transcript, to_bytes
 
 
 @dataclass
@@ -22,21 +22,61 @@ def ring_chal(
     R: int,
 ) -> int:
     """Compute ring signature challenge."""
-    return (
-        hash_mod(
-            b"LSAG",
-            ctx,
-            to_bytes(I),
-            b"".join(to_bytes(p) for p in ring_P),
-            b"".join(to_bytes(c) for c in ring_C),
-            to_bytes(L),
-            to_bytes(R),
-            mod=pp.q,
-        )
-        or 1
+    tr = ring_transcript(ctx, I, ring_P, ring_C)
+    return tr.challenge(to_bytes(L), to_bytes(R), mod=pp.q) or 1
+
+
+def encode_ring(ring_P: List[int], ring_C: List[int]) -> bytes:
+    """Canonical ring encoding: all keys, then all commitments, 32 bytes each."""
+    return b"".join(to_bytes(p) for p in ring_P) + b"".join(
+        to_bytes(c) for c in ring_C
     )
 
 
+# encode_ring results keyed on the ring members. The key is rebuilt from the
+# current members on every lookup, so a ring changed in place is re-encoded;
+# txs that reuse the same decoys share one encoding.
+RING_ENC_CACHE: LRUCache = LRUCache(maxsize=1 << 14)
+
+
+def ring_enc_cached(ring_P: Sequence[int], ring_C: Sequence[int]) -> bytes:
+    key = (tuple(ring_P), tuple(ring_C))
+    enc = RING_ENC_CACHE.get(key)
+    if enc is None:
+        enc = encode_ring(ring_P, ring_C)
+        RING_ENC_CACHE.put(key, enc)
+    return enc
+
+
+def ring_enc_prime(ring_P: Sequence[int], ring_C: Sequence[int], enc: bytes) -> None:
+    """Store an encoding already at hand, e.g. the bytes a ring was decoded from."""
+    RING_ENC_CACHE.put((tuple(ring_P), tuple(ring_C)), enc)
+
+
+def ring_enc_cache_clear() -> None:
+    RING_ENC_CACHE.clear()
+
+
+def ring_enc_cache_stats() -> CacheStats:
+    return RING_ENC_CACHE.stats()
+
+
+def ring_transcript(
+    ctx: bytes,
+    I: int,
+    ring_P: List[int],
+    ring_C: List[int],
+    ring_enc: Optional[bytes] = None,
+) -> Transcript:
+    """
+    Absorb the fixed part of the ring challenge (everything but L, R) once.
+    ring_enc, if given, must equal encode_ring(ring_P, ring_C).
+    """
+    if ring_enc is None:
+        ring_enc = encode_ring(ring_P, ring_C)
+    return Transcript(b"LSAG", ctx, to_bytes(I), ring_enc)
+
+
 def ring_prove(
     pp: CryptoParams,
     ctx: bytes,
@@ -45,10 +85,12 @@ def ring_prove(
     real_idx: int,
     kp: Keypair,
     I: int,
+    ring_enc: Optional[bytes] = None,
 ) -> RingSig:
     """Generate a ring signature."""
     n = len(ring_P)
     Hp_list = [Hp(pp, P) for P in ring_P]
+    tr = ring_transcript(ctx, I, ring_P, ring_C, ring_enc)
     s = [0] * n
 
     alpha = secrets.randbelow(pp.q - 1) + 1
@@ -57,7 +99,9 @@ def ring_prove(
 
     # Start challenge after the real index
     c = [0] * (n + 1)
-    c[(real_idx + 1) % n] = ring_chal(pp, ctx, I, ring_P, ring_C, L_real, R_real)
+    c[(real_idx + 1) % n] = (
+        tr.challenge(to_bytes(L_real), to_bytes(R_real), mod=pp.q) or 1
+    )
 
     # Walk the ring
     i = (real_idx + 1) % n
@@ -65,7 +109,7 @@ def ring_prove(
         s[i] = secrets.randbelow(pp.q - 1) + 1
         L_i = (pp.G * s[i] + c[i] * ring_P[i]) % pp.q
         R_i = (Hp_list[i] * s[i] + c[i] * I) % pp.q
-        c[(i + 1) % n] = ring_chal(pp, ctx, I, ring_P, ring_C, L_i, R_i)
+        c[(i + 1) % n] = tr.challenge(to_bytes(L_i), to_bytes(R_i), mod=pp.q) or 1
         i = (i + 1) % n
 
     # Close ring at real index
@@ -82,13 +126,84 @@ def ring_verify(
     ring_C: List[int],
     I: int,
     sig: RingSig,
+    ring_enc: Optional[bytes] = None,
 ) -> bool:
     """Verify a ring signature."""
     n = len(ring_P)
     Hp_list = [Hp(pp, P) for P in ring_P]
+    tr = ring_transcript(ctx, I, ring_P, ring_C, ring_enc)
     c = sig.c0
     for i in range(n):
         L_i = (pp.G * sig.s[i] + c * ring_P[i]) % pp.q
         R_i = (Hp_list[i] * sig.s[i] + c * I) % pp.q
-        c = ring_chal(pp, ctx, I, ring_P, ring_C, L_i, R_i)
+        c = tr.challenge(to_bytes(L_i), to_bytes(R_i), mod=pp.q) or 1
     return c == sig.c0  # must loop back to c0
+
+
+# (ctx, ring_P, ring_C, I, sig)
+RingJob = Tuple[bytes, List[int], List[int], int, RingSig]
+
+
+def ring_verify_many(
+    pp: CryptoParams,
+    jobs: List[RingJob],
+    ring_encs: Optional[List[bytes]] = None,
+) -> List[bool]:
+    """
+    Verify many ring signatures, advancing all challenge chains in lockstep.
+
+    Transcript prefixes are absorbed once per job, Hp is computed once per
+    distinct ring member across the whole batch, and each step of the walk is
+    a single pass over every chain still running. Returns one result per job,
+    equal to ring_verify for well-formed jobs; empty rings and length
+    mismatches are rejected. ring_encs optionally supplies encode_ring for
+    each job.
+    """
+    q, G = pp.q, pp.G
+    results = [False] * len(jobs)
+    hp: Dict[int, int] = {}
+
+    # Longest rings first, so the chains still running are always a prefix
+    order = [
+        j
+        for j, (_, ring_P, ring_C, _, sig) in enumerate(jobs)
+        if 0 < len(ring_P) == len(ring_C) == len(sig.s)
+    ]
+    order.sort(key=lambda j: len(jobs[j][1]), reverse=True)
+
+    trs, rings, hps, ss, imgs, cs = [], [], [], [], [], []
+    for j in order:
+        ctx, ring_P, ring_C, I, sig = jobs[j]
+        Hp_list = []
+        for P in ring_P:
+            h = hp.get(P)
+            if h is None:
+                h = hp[P] = Hp(pp, P)
+            Hp_list.append(h)
+        enc = ring_encs[j] if ring_encs is not None else None
+        trs.append(ring_transcript(ctx, I, ring_P, ring_C, enc))
+        rings.append(ring_P)
+        hps.append(Hp_list)
+        ss.append(sig.s)
+        imgs.append(I)
+        cs.append(sig.c0)
+
+    m, i = len(order), 0
+    while m:
+        cs = [
+            tr.challenge(
+                to_bytes((G * s[i] + c * ring_P[i]) % q),
+                to_bytes((Hp_list[i] * s[i] + c * I) % q),
+                mod=q,
+            )
+            or 1
+            for tr, ring_P, Hp_list, s, I, c in zip(trs, rings, hps, ss, imgs, cs)
+        ]
+        i += 1
+        # Close every chain whose ring has been fully walked
+        while m and len(rings[m - 1]) == i:
+            m -= 1
+            j = order[m]
+            results[j] = cs[m] == jobs[j][4].c0
+        del trs[m:], rings[m:], hps[m:], ss[m:], imgs[m:], cs[m:]
+    return results
@@ -1,12 +1,17 @@
 import secrets
+import time
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import List, Set, Tuple
+from functools import partial
+from typing import List, Optional, Sequence, Tuple
 from common import CryptoParams, Keypair, key_image, commit
+from common import BlockResult, SpentSet, VerifyCache, map_chunks, mark_conflicts
 
-from monero.ring import RingSig, ring_prove, ring_verify
+from monero.ring import RingSig, ring_enc_cached, ring_prove, ring_verify_many
 from monero.zklink import ZKLink, zklink_prove, zklink_verify
 from monero.range_proof import RangeProofStub, verify_range_stub
-from monero.utxo import UTXO, GLOBAL
+from monero.utxo import OUTPUTS_PER_BLOCK, UTXO, GLOBAL
+from monero.decoys import DECOYS
 
 
 @dataclass
@@ -20,6 +25,16 @@ class TxIn:
     C_pseudo: int  # Pseudo-input commitment
     link_proof: ZKLink  # ZK link proof
 
+    @property
+    def ring_enc(self) -> bytes:
+        """
+        Canonical ring encoding shared by the ring signature and link proof.
+        Looked up by the current ring members in a cache shared by all
+        inputs, so it follows in-place edits and rings reused across txs
+        are encoded once.
+        """
+        return ring_enc_cached(self.ring_P, self.ring_C)
+
 
 @dataclass
 class TxOut:
@@ -41,7 +56,10 @@ class Tx:
 
 
 def build_ring_indices(n: int, real_idx: int, ring_size: int) -> List[int]:
-    """Build ring indices around a real index."""
+    """
+    Build ring indices around a real index. A contiguous window gives the real
+    output away; prove_input samples rings with DECOYS instead.
+    """
     ring_size = max(1, min(ring_size, n))
     # Naive: take a window around real_idx (wrap if needed)
     half = ring_size // 2
@@ -52,53 +70,147 @@ def build_ring_indices(n: int, real_idx: int, ring_size: int) -> List[int]:
     return idxs
 
 
-def prove_input(
-    pp: CryptoParams, ctx: bytes, utxo_index: int, ring_size: int
-) -> Tuple[TxIn, int]:
-    """
-    Create a transaction input by proving ownership of a UTXO.
-    Returns the TxIn and the pseudo-input blinding factor.
-    """
+# Everything a worker needs to prove one input, gathered from GLOBAL up front:
+# (ring_P, ring_C, real_pos, sk, v, r, r_pseudo)
+InputJob = Tuple[List[int], List[int], int, int, int, int, int]
+
+
+def _input_job(
+    pp: CryptoParams, utxo_index: int, ring_size: int, r_pseudo: Optional[int] = None
+) -> InputJob:
     u = GLOBAL[utxo_index]
-    # Ring selection & materials
-    idxs = build_ring_indices(len(GLOBAL), utxo_index, ring_size)
-    ring_P = [GLOBAL[i].P for i in idxs]
-    ring_C = [GLOBAL[i].C for i in idxs]
+    # Ring selection (age-based decoys) & materials
+    DECOYS.sync(len(GLOBAL), OUTPUTS_PER_BLOCK)
+    idxs = DECOYS.sample_ring(utxo_index, ring_size)
+    ring_P, ring_C = GLOBAL.ring(idxs)
     real_pos = idxs.index(utxo_index)
+    if r_pseudo is None:
+        r_pseudo = secrets.randbelow(pp.q - 1) + 1
+    return ring_P, ring_C, real_pos, u.sk, u.v, u.r, r_pseudo
+
+
+def _prove_job(pp: CryptoParams, ctx: bytes, job: InputJob) -> TxIn:
+    ring_P, ring_C, real_pos, sk, v, r, r_pseudo = job
 
     # Key image for real key
-    kp = Keypair(u.sk, u.P)
+    kp = Keypair(sk, ring_P[real_pos])
     I = key_image(pp, kp)
 
     # Pseudo-input: same amount, fresh blinding r_pseudo
-    r_pseudo = secrets.randbelow(pp.q - 1) + 1
-    C_pseudo = commit(pp, u.v, r_pseudo)
+    C_pseudo = commit(pp, v, r_pseudo)
 
     # Relation to real input for dummy link
-    r_diff = (u.r - r_pseudo) % pp.q  # => C_real - C_pseudo = r_diff * Gc
+    r_diff = (r - r_pseudo) % pp.q  # => C_real - C_pseudo = r_diff * Gc
 
     # LSAG ring sig
-    sig = ring_prove(pp, ctx, ring_P, ring_C, real_pos, kp, I)
+    ring_enc = ring_enc_cached(ring_P, ring_C)
+    sig = ring_prove(pp, ctx, ring_P, ring_C, real_pos, kp, I, ring_enc)
 
     # Dummy ZK link binds pseudo to same ring index
-    link = zklink_prove(pp, ctx, ring_P, ring_C, I, C_pseudo, real_pos, r_diff)
+    link = zklink_prove(
+        pp, ctx, ring_P, ring_C, I, C_pseudo, real_pos, r_diff, ring_enc
+    )
+
+    return TxIn(ring_P, ring_C, I, sig, C_pseudo, link)
+
+
+def _prove_jobs(pp: CryptoParams, ctx: bytes, jobs: List[InputJob]) -> List[TxIn]:
+    return [_prove_job(pp, ctx, job) for job in jobs]
+
+
+def prove_input(
+    pp: CryptoParams, ctx: bytes, utxo_index: int, ring_size: int
+) -> Tuple[TxIn, int]:
+    """
+    Create a transaction input by proving ownership of a UTXO.
+    Returns the TxIn and the pseudo-input blinding factor.
+    """
+    job = _input_job(pp, utxo_index, ring_size)
+    return _prove_job(pp, ctx, job), job[-1]
+
 
-    return TxIn(ring_P, ring_C, I, sig, C_pseudo, link), r_pseudo
+def prove_inputs(
+    pp: CryptoParams,
+    ctx: bytes,
+    utxo_indices: Sequence[int],
+    ring_size: int,
+    out_blinds: Optional[Sequence[int]] = None,
+    workers: int = 1,
+    chunksize: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Tuple[List[TxIn], List[int]]:
+    """
+    prove_input for many UTXOs, with the ring and Schnorr proofs fanned out
+    to workers (see map_chunks). Rings and pseudo blindings are chosen here,
+    in input order, before any proving starts.
 
+    With out_blinds (the output commitments' blinding factors), the last
+    pseudo blinding is picked so the pseudo inputs balance the outputs:
+    sum(r_pseudo) == sum(out_blinds) mod q.
+    Returns the TxIns and their pseudo blindings, in input order.
+    """
+    if not utxo_indices:
+        return [], []
+    r_pseudos = [secrets.randbelow(pp.q - 1) + 1 for _ in utxo_indices]
+    if out_blinds is not None:
+        r_pseudos[-1] = (sum(out_blinds) - sum(r_pseudos[:-1])) % pp.q
+    jobs = [
+        _input_job(pp, idx, ring_size, r) for idx, r in zip(utxo_indices, r_pseudos)
+    ]
+    ins = map_chunks(
+        partial(_prove_jobs, pp, ctx),
+        jobs,
+        workers=workers,
+        chunksize=chunksize,
+        executor=executor,
+    )
+    return ins, r_pseudos
 
-def verify_tx(pp: CryptoParams, tx: Tx, spent_images: Set[int]) -> bool:
-    """Verify a transaction."""
+
+def verify_tx(
+    pp: CryptoParams,
+    tx: Tx,
+    spent_images: SpentSet,
+    cache: Optional[VerifyCache] = None,
+) -> bool:
+    """
+    Verify a transaction. With a cache, the crypto checks are skipped for a
+    tx that already passed them.
+    """
     # 0) Double-spend check
     for tin in tx.ins:
         if tin.I in spent_images:
             return False
+    if cache is None:
+        return verify_tx_crypto(pp, tx)
+    return cache.check(_tx_hash(tx), partial(verify_tx_crypto, pp, tx))
+
+
+def _tx_hash(tx: Tx) -> bytes:
+    # monero.wire imports this module
+    from monero.wire import tx_hash
+
+    return tx_hash(tx)
+
+
+def verify_tx_crypto(pp: CryptoParams, tx: Tx) -> bool:
+    """The state-independent part of verify_tx (everything but double-spends)."""
+    return _verify_chunk(pp, [tx])[0]
+
 
-    # 1) Ring + link per input
+def _verify_rest(pp: CryptoParams, tx: Tx) -> bool:
+    """verify_tx_crypto after the ring signatures: links, ranges, balance."""
+    # 1) Link per input
     for tin in tx.ins:
-        if not ring_verify(pp, tx.ctx, tin.ring_P, tin.ring_C, tin.I, tin.sig):
-            return False
         if not zklink_verify(
-            pp, tx.ctx, tin.ring_P, tin.ring_C, tin.I, tin.C_pseudo, tin.link_proof
+            pp,
+            tx.ctx,
+            tin.ring_P,
+            tin.ring_C,
+            tin.I,
+            tin.C_pseudo,
+            tin.link_proof,
+            tin.ring_enc,
         ):
             return False
 
@@ -120,3 +232,70 @@ def verify_tx(pp: CryptoParams, tx: Tx, spent_images: Set[int]) -> bool:
         return False
 
     return True
+
+
+def _verify_chunk(pp: CryptoParams, txs: List[Tx]) -> List[bool]:
+    """
+    verify_tx_crypto over txs. The ring signatures of every input of every tx
+    go through one ring_verify_many call, so Hp and the lockstep walk are
+    shared across the whole chunk; txs whose rings pass get the other checks.
+    """
+    jobs, encs, owners = [], [], []
+    for t, tx in enumerate(txs):
+        for tin in tx.ins:
+            jobs.append((tx.ctx, tin.ring_P, tin.ring_C, tin.I, tin.sig))
+            encs.append(tin.ring_enc)
+            owners.append(t)
+    ok = [True] * len(txs)
+    for t, good in zip(owners, ring_verify_many(pp, jobs, encs)):
+        if not good:
+            ok[t] = False
+    return [ok[t] and _verify_rest(pp, tx) for t, tx in enumerate(txs)]
+
+
+def verify_txs_crypto(
+    pp: CryptoParams, txs: List[Tx], cache: Optional[VerifyCache] = None
+) -> List[bool]:
+    """verify_tx_crypto over txs, skipping those the cache has seen pass."""
+    if cache is None:
+        return _verify_chunk(pp, txs)
+    keys = [_tx_hash(tx) for tx in txs]
+    return cache.check_many(keys, txs, partial(_verify_chunk, pp))
+
+
+def verify_block(
+    pp: CryptoParams,
+    txs: List[Tx],
+    spent_images: SpentSet,
+    workers: int = 1,
+    chunksize: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    cache: Optional[VerifyCache] = None,
+) -> BlockResult:
+    """
+    Verify a block of transactions, fanning the crypto checks out to workers.
+
+    Double-spends against spent_images and key-image conflicts inside the
+    block are checked once, here; only the per-tx ring, link, range and
+    balance checks run in the pool, and only for txs not already in cache
+    (e.g. from the mempool). Results come back in block order.
+    """
+    t0 = time.perf_counter()
+    results = [all(tin.I not in spent_images for tin in tx.ins) for tx in txs]
+    todo = [t for t, ok in enumerate(results) if ok]
+    check = partial(
+        map_chunks,
+        partial(_verify_chunk, pp),
+        workers=workers,
+        chunksize=chunksize,
+        executor=executor,
+    )
+    pending = [txs[t] for t in todo]
+    if cache is None:
+        checked = check(pending)
+    else:
+        checked = cache.check_many([_tx_hash(tx) for tx in pending], pending, check)
+    for t, ok in zip(todo, checked):
+        results[t] = ok
+    mark_conflicts([[tin.I for tin in tx.ins] for tx in txs], results)
+    return BlockResult(results, time.perf_counter() - t0)
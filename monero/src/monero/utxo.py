@@ -1,5 +1,11 @@
+import mmap
+import os
+import struct
+import tempfile
 from dataclasses import dataclass
-from typing import List
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+
+from monero.decoys import DECOYS
 
 
 @dataclass
@@ -13,14 +19,200 @@ class UTXO:
     sk: int  # Secret key (stored for demo wallet)
 
 
+class UtxoStore:
+    """
+    File-backed UTXO set of fixed-width records, accessed through mmap.
+
+    Header (16 bytes): b"MXUT" | version u8 | flags u8 | 2 pad | count u64
+    Record:            P (32) | C (32) [| v (8) | r (32) | sk (32) if wallet]
+
+    Random access by global index is a slice of the mapping, so lookups do
+    not allocate per stored record and reopening a store only reads the
+    header. Without a path the store lives in an anonymous temporary file.
+    Wallet-side fields (v, r, sk) are optional; without them they read as 0.
+    """
+
+    MAGIC = b"MXUT"
+    VERSION = 1
+    _HEADER = struct.Struct(">4sBB2xQ")
+    _COUNT = struct.Struct(">Q")
+    _COUNT_OFF = 8
+    _WALLET = 0x01
+    _BASE = 64  # P, C
+    _EXTRA = struct.Struct(">Q32s32s")  # v, r, sk
+
+    def __init__(self, path: Optional[str] = None, wallet: bool = True):
+        self._f: Optional[BinaryIO] = None
+        self._mm: Optional[mmap.mmap] = None
+        self.open(path, wallet)
+
+    def open(self, path: Optional[str] = None, wallet: bool = True) -> None:
+        """(Re)target the store at path, creating it if needed."""
+        self.close()
+        if path is None:
+            self._f = tempfile.TemporaryFile()
+        elif os.path.exists(path):
+            self._f = open(path, "r+b")
+        else:
+            self._f = open(path, "w+b")
+        self.path = path
+
+        header = self._f.read(self._HEADER.size)
+        if header:
+            magic, version, flags, count = self._HEADER.unpack(header)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"Not a UTXO store: {path}")
+            self.wallet = bool(flags & self._WALLET)
+            self._count = count
+        else:
+            self.wallet = wallet
+            self._count = 0
+        self.record_size = self._BASE + (self._EXTRA.size if self.wallet else 0)
+        self._map(max(self._capacity_for(self._count), 1024))
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self.flush()
+            self._mm.close()
+            self._mm = None
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def flush(self) -> None:
+        self._write_header()
+        self._mm.flush()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> UTXO:
+        off = self._offset(i)
+        mm = self._mm
+        P = int.from_bytes(mm[off : off + 32], "big")
+        C = int.from_bytes(mm[off + 32 : off + 64], "big")
+        if not self.wallet:
+            return UTXO(P=P, C=C, v=0, r=0, sk=0)
+        v, r, sk = self._EXTRA.unpack_from(mm, off + self._BASE)
+        return UTXO(
+            P=P, C=C, v=v, r=int.from_bytes(r, "big"), sk=int.from_bytes(sk, "big")
+        )
+
+    def P(self, i: int) -> int:
+        off = self._offset(i)
+        return int.from_bytes(self._mm[off : off + 32], "big")
+
+    def C(self, i: int) -> int:
+        off = self._offset(i) + 32
+        return int.from_bytes(self._mm[off : off + 32], "big")
+
+    def ring(self, idxs: List[int]) -> Tuple[List[int], List[int]]:
+        """Public keys and commitments for a list of global indices."""
+        return [self.P(i) for i in idxs], [self.C(i) for i in idxs]
+
+    def append(self, utxo: UTXO) -> int:
+        idx = self._count
+        self._reserve(idx + 1)
+        self._write(idx, utxo)
+        self._set_count(idx + 1)
+        return idx
+
+    def extend(self, utxos: Sequence[UTXO]) -> int:
+        """
+        Append many records, growing the mapping and publishing the new count
+        once; return the index of the first.
+        """
+        start = self._count
+        self._reserve(start + len(utxos))
+        for i, utxo in enumerate(utxos, start=start):
+            self._write(i, utxo)
+        self._set_count(start + len(utxos))
+        return start
+
+    def truncate(self, n: int) -> None:
+        """Drop the records from index n on."""
+        self._set_count(max(0, min(n, self._count)))
+
+    def clear(self) -> None:
+        self._count = 0
+        self._map(1024, shrink=True)
+
+    def _reserve(self, count: int) -> None:
+        need = self._HEADER.size + count * self.record_size
+        if need > len(self._mm):
+            cap = (len(self._mm) - self._HEADER.size) // self.record_size
+            self._map(max(2 * cap, self._capacity_for(count)))
+
+    def _write(self, idx: int, utxo: UTXO) -> None:
+        off = self._HEADER.size + idx * self.record_size
+        self._mm[off : off + 32] = utxo.P.to_bytes(32, "big")
+        self._mm[off + 32 : off + 64] = utxo.C.to_bytes(32, "big")
+        if self.wallet:
+            self._EXTRA.pack_into(
+                self._mm,
+                off + self._BASE,
+                utxo.v,
+                utxo.r.to_bytes(32, "big"),
+                utxo.sk.to_bytes(32, "big"),
+            )
+
+    def _set_count(self, count: int) -> None:
+        self._count = count
+        # Keep the on-disk count current so an unclean exit loses nothing
+        self._COUNT.pack_into(self._mm, self._COUNT_OFF, count)
+
+    def _offset(self, i: int) -> int:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("UTXO index out of range")
+        return self._HEADER.size + i * self.record_size
+
+    def _capacity_for(self, count: int) -> int:
+        cap = 1
+        while cap < count:
+            cap *= 2
+        return cap
+
+    def _map(self, capacity: int, shrink: bool = False) -> None:
+        """Size the file for capacity records and (re)map it."""
+        if self._mm is not None:
+            self._mm.close()
+        size = self._HEADER.size + capacity * self.record_size
+        cur = os.fstat(self._f.fileno()).st_size
+        if size > cur or shrink:
+            self._f.truncate(size)
+        self._mm = mmap.mmap(self._f.fileno(), 0)
+        self._write_header()
+
+    def _write_header(self) -> None:
+        flags = self._WALLET if self.wallet else 0
+        self._HEADER.pack_into(
+            self._mm, 0, self.MAGIC, self.VERSION, flags, self._count
+        )
+
+
 # Global UTXO set (for demonstration purposes)
-GLOBAL: List[UTXO] = []
+GLOBAL = UtxoStore()
+
+# Outputs that add_utxo and open_utxos put in each decoy block. They carry no
+# block of their own, so each gets one, block_time apart: without boundaries
+# every age draw would land before the chain and rings would be uniform.
+OUTPUTS_PER_BLOCK = 1
+
+
+def open_utxos(path: Optional[str] = None, wallet: bool = True) -> None:
+    """Point the global UTXO set at a store file (None: temporary, in-process)."""
+    GLOBAL.open(path, wallet)
+    DECOYS.clear()
+    DECOYS.sync(len(GLOBAL), OUTPUTS_PER_BLOCK)
 
 
 def add_utxo(utxo: UTXO) -> int:
-    """Add a UTXO to the global set and return its index."""
-    GLOBAL.append(utxo)
-    return len(GLOBAL) - 1
+    """Add a UTXO to the global set and the decoy index; return its index."""
+    idx = GLOBAL.append(utxo)
+    DECOYS.sync(idx + 1, OUTPUTS_PER_BLOCK)
+    return idx
 
 
 def get_utxo(index: int) -> UTXO:
@@ -36,3 +228,4 @@ def get_utxo_count() -> int:
 def clear_utxos() -> None:
     """Clear all UTXOs (for testing)."""
     GLOBAL.clear()
+    DECOYS.clear()
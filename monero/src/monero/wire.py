@@ -0,0 +1,145 @@
+"""
+Versioned binary encoding for monero transactions.
+
+Layout (v1):
+    b"MXTX" | version u8 | fee u64 | ctx blob | n_in u16 | n_in key images
+    | n_out u16 | n_in input bodies (blob each) | n_out outputs
+
+    input body:  n u16 | ring_P (n) | ring_C (n) | c0 | s (n) | C_pseudo | link blob
+    output:      P | C | range proof blob
+
+Key images and the fee sit at fixed offsets in front of the bodies, so a
+TxView can reject double-spends before touching rings or proofs.
+"""
+
+import hashlib
+from typing import List
+
+from common.wire import (
+    SCALAR_SIZE,
+    BaseTxView,
+    Buffer,
+    DecodeError,
+    Reader,
+    Writer,
+    scalars,
+    write_header,
+)
+from monero.range_proof import RangeProofStub
+from monero.ring import RingSig, ring_enc_prime
+from monero.transaction import Tx, TxIn, TxOut
+from monero.zklink import ZKLink
+
+MAGIC = b"MXTX"
+VERSION = 1
+
+
+def _write_txin_body(w: Writer, tin: TxIn) -> None:
+    n = len(tin.ring_P)
+    if len(tin.ring_C) != n or len(tin.sig.s) != n:
+        raise ValueError("Ring and signature sizes differ")
+    w.u16(n)
+    w.raw(tin.ring_enc)
+    w.scalar(tin.sig.c0)
+    for s in tin.sig.s:
+        w.scalar(s)
+    w.scalar(tin.C_pseudo)
+    w.blob(tin.link_proof.blob)
+
+
+def _write_txout(w: Writer, tout: TxOut) -> None:
+    w.scalar(tout.P).scalar(tout.C).blob(tout.rp.blob)
+
+
+def _read_txout(r: Reader) -> TxOut:
+    P, C = r.scalar(), r.scalar()
+    return TxOut(P, C, RangeProofStub(bytes(r.blob())))
+
+
+def encode_tx(tx: Tx) -> bytes:
+    w = Writer()
+    write_header(w, MAGIC, VERSION)
+    w.u64(tx.fee).blob(tx.ctx)
+    w.u16(len(tx.ins))
+    for tin in tx.ins:
+        w.scalar(tin.I)
+    w.u16(len(tx.outs))
+    for tin in tx.ins:
+        body = Writer()
+        _write_txin_body(body, tin)
+        w.blob(body.buf)
+    for tout in tx.outs:
+        _write_txout(w, tout)
+    return w.getvalue()
+
+
+def tx_hash(tx: Tx) -> bytes:
+    """Canonical tx hash: sha256 of the encoding, the mempool's tx-id."""
+    return hashlib.sha256(encode_tx(tx)).digest()
+
+
+class TxInView:
+    """Lazily decoded input body; fields are parsed on first access."""
+
+    def __init__(self, I: int, body: memoryview):
+        self.I = I
+        self._body = body
+        r = Reader(body)
+        self.n = r.u16()
+        self._ring_off = r.pos
+        self._sig_off = self._ring_off + 2 * self.n * SCALAR_SIZE
+        self._tail_off = self._sig_off + (self.n + 1) * SCALAR_SIZE
+        if self._tail_off + SCALAR_SIZE > len(body):
+            raise DecodeError("Truncated input")
+
+    @property
+    def ring_enc(self) -> memoryview:
+        """The encode_ring bytes, sliced straight out of the buffer."""
+        return self._body[self._ring_off : self._sig_off]
+
+    @property
+    def ring_P(self) -> List[int]:
+        return scalars(self._body[self._ring_off :], self.n)
+
+    @property
+    def ring_C(self) -> List[int]:
+        return scalars(self._body[self._ring_off + self.n * SCALAR_SIZE :], self.n)
+
+    @property
+    def sig(self) -> RingSig:
+        vals = scalars(self._body[self._sig_off :], self.n + 1)
+        return RingSig(c0=vals[0], s=vals[1:])
+
+    @property
+    def C_pseudo(self) -> int:
+        return Reader(self._body, self._tail_off).scalar()
+
+    @property
+    def link_proof(self) -> ZKLink:
+        r = Reader(self._body, self._tail_off + SCALAR_SIZE)
+        blob = bytes(r.blob())
+        if not r.at_end():
+            raise DecodeError("Trailing bytes in input")
+        return ZKLink(blob)
+
+    def to_txin(self) -> TxIn:
+        ring_P, ring_C = self.ring_P, self.ring_C
+        # The wire bytes are the encoding; spare TxIn.ring_enc the work
+        ring_enc_prime(ring_P, ring_C, bytes(self.ring_enc))
+        return TxIn(ring_P, ring_C, self.I, self.sig, self.C_pseudo, self.link_proof)
+
+
+class TxView(BaseTxView[TxInView, TxOut, Tx]):
+    """Zero-copy view over an encoded Tx; see common.wire.BaseTxView."""
+
+    MAGIC = MAGIC
+    VERSION = VERSION
+    TXIN_VIEW = TxInView
+    TX = Tx
+    IN_FIELD = "ins"
+    OUT_FIELD = "outs"
+    read_txout = staticmethod(_read_txout)
+
+
+def decode_tx(data: Buffer) -> Tx:
+    return TxView(data).to_tx()
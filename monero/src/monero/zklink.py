@@ -1,7 +1,8 @@
 import hashlib
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 from common import CryptoParams, to_bytes
+from monero.ring import encode_ring
 
 
 @dataclass
@@ -20,12 +21,13 @@ def zklink_prove(
     C_pseudo: int,
     real_idx: int,
     r_diff: int,
+    ring_enc: Optional[bytes] = None,
 ) -> ZKLink:
     """
     Prove that ring_C[real_idx] - C_pseudo == r_diff * Gc.
     Binds to ring transcript & key image I.
     """
-    path = b"".join(to_bytes(p) for p in ring_P) + b"".join(to_bytes(c) for c in ring_C)
+    path = ring_enc if ring_enc is not None else encode_ring(ring_P, ring_C)
     binding = hashlib.sha256(
         b"LINK|bind|"
         + ctx
@@ -48,6 +50,7 @@ def zklink_verify(
     I: int,
     C_pseudo: int,
     prf: ZKLink,
+    ring_enc: Optional[bytes] = None,
 ) -> bool:
     """Verify ZK link proof."""
     if not prf.blob.startswith(b"LINKv1|"):
@@ -67,7 +70,7 @@ def zklink_verify(
     rhs = (pp.Gc * r_diff) % pp.q
     if lhs != rhs:
         return False
-    path = b"".join(to_bytes(p) for p in ring_P) + b"".join(to_bytes(c) for c in ring_C)
+    path = ring_enc if ring_enc is not None else encode_ring(ring_P, ring_C)
     exp = hashlib.sha256(
         b"LINK|bind|"
         + ctx
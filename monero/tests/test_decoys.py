@@ -0,0 +1,133 @@
+import random
+
+import pytest
+from common import setup, keygen, commit
+from monero import UTXO, add_utxo, clear_utxos, get_utxo, prove_input
+from monero.decoys import DECOYS, DecoySelector
+
+
+def make_selector(blocks, per_block, age=None):
+    sel = DecoySelector(age=age, rng=random.Random(7))
+    for _ in range(blocks):
+        sel.new_block()
+        sel.add_output(per_block)
+    return sel
+
+
+def test_sample_ring_shape():
+    """Test rings are sorted, distinct, contain the real index and batch."""
+    sel = make_selector(2000, 5)
+    rings = sel.sample_rings([0, 17, 9999], 16)
+    for real, ring in zip([0, 17, 9999], rings):
+        assert len(ring) == 16 and real in ring
+        assert ring == sorted(set(ring))
+        assert all(0 <= i < len(sel) for i in ring)
+    with pytest.raises(IndexError):
+        sel.sample_ring(len(sel), 16)
+
+
+def test_sampling_follows_age():
+    """Test draws land in the block the sampled age points to."""
+    # Every draw is exactly 10 blocks old
+    sel = make_selector(100, 3, age=lambda rng: 10 * 120)
+    for _ in range(50):
+        assert 3 * 89 <= sel.sample() < 3 * 90
+
+    # The default gamma favours recent outputs over a uniform pick
+    sel = make_selector(20000, 2)
+    recent = sum(sel.sample() >= len(sel) // 2 for _ in range(2000))
+    assert recent > 1200
+
+
+def test_incremental_index_and_fallback():
+    """Test the index grows incrementally and young chains still fill rings."""
+    sel = make_selector(0, 0)
+    sel.add_output(3)
+    assert len(sel) == 3 and sel.height == 1
+    assert sel.sample_ring(1, 10) == [0, 1, 2]
+    sel.new_block(timestamp=500.0)
+    sel.add_output()
+    assert len(sel) == 4
+    with pytest.raises(ValueError):
+        sel.new_block(timestamp=1.0)
+    sel.sync(2)
+    assert len(sel) == 2 and sel.height == 1
+
+
+def test_full_rings_on_old_sparse_chain():
+    """Test rings near the output count fill without redrawing forever."""
+    # Nearly every gamma age falls in the newest few of 2000 blocks
+    sel = make_selector(2000, 1)
+    assert sel.sample_ring(5, 2000) == list(range(2000))
+    ring = sel.sample_ring(1999, 1990)
+    assert len(ring) == 1990 and ring == sorted(set(ring)) and 1999 in ring
+
+
+def test_add_utxo_updates_global_selector():
+    clear_utxos()
+    pp = setup()
+    for _ in range(6):
+        kp = keygen(pp)
+        add_utxo(UTXO(P=kp.P, C=commit(pp, 1, 2), v=1, r=2, sk=kp.sk))
+    assert len(DECOYS) == 6
+    txin, _ = prove_input(pp, b"ctx", 3, 4)
+    assert len(txin.ring_P) == 4
+    clear_utxos()
+    assert len(DECOYS) == 0
+
+
+def test_sync_per_block_and_single_block_chains():
+    """Test sync() starts blocks of per_block outputs; flat chains skip ages."""
+    calls = []
+
+    def age(rng):
+        calls.append(1)
+        return 0.0
+
+    sel = DecoySelector(age=age, rng=random.Random(3))
+    sel.sync(3)
+    assert sel.height == 1 and sel.sample_ring(0, 3) == [0, 1, 2]
+    assert not calls  # one timestamp: every age would fall before the chain
+    sel.sync(10, per_block=4)
+    assert (sel.height, len(sel)) == (3, 10) and list(sel._cum) == [4, 8, 10]
+    sel.sample_ring(0, 3)
+    assert calls
+    with pytest.raises(ValueError):
+        sel.sync(11, per_block=0)
+
+
+def test_prove_input_rings_follow_age(monkeypatch):
+    """Test add_utxo gives the global index blocks, so rings skew recent."""
+    clear_utxos()
+    pp = setup()
+    n = 300
+    for _ in range(n):
+        kp = keygen(pp)
+        add_utxo(UTXO(P=kp.P, C=commit(pp, 1, 2), v=1, r=2, sk=kp.sk))
+    assert DECOYS.height == n
+    # Default gamma ages reach back into a chain of 300 blocks
+    assert any(DECOYS._draw_once(DECOYS.rng) is not None for _ in range(50))
+
+    # Ages of at most 10 blocks: decoys come from the newest outputs
+    monkeypatch.setattr(DECOYS, "age", lambda rng: rng.uniform(0, 10) * 120)
+    txin, _ = prove_input(pp, b"ctx", 0, 8)
+    members = {get_utxo(i).P: i for i in range(n)}
+    idxs = sorted(members[P] for P in txin.ring_P)
+    assert idxs[0] == 0 and all(i >= n - 11 for i in idxs[1:])
+    clear_utxos()
+
+
+def test_rewind():
+    """Test rewinding drops later blocks and caps the last kept one."""
+    sel = DecoySelector(rng=random.Random(5))
+    for k in (3, 0, 4, 2):
+        sel.new_block()
+        sel.add_output(k)
+    sel.rewind(3, 5)
+    assert (sel.height, len(sel)) == (3, 5)
+    assert list(sel._cum) == [3, 3, 5]
+    sel.rewind(3, 2)
+    assert list(sel._cum) == [2, 2, 2]
+    sel.new_block(10_000.0)
+    sel.add_output()
+    assert len(sel) == 3 and sel.height == 4
@@ -0,0 +1,81 @@
+import secrets
+
+import pytest
+from common import setup, keygen, commit
+from common.wire import DecodeError
+from monero import (
+    add_utxo,
+    clear_utxos,
+    UTXO,
+    prove_input,
+    verify_tx,
+    Tx,
+    TxOut,
+    range_prove_stub,
+)
+from monero.wire import TxView, encode_tx, decode_tx
+
+
+def make_tx(pp, n_in=2):
+    clear_utxos()
+    for _ in range(6):
+        kp = keygen(pp)
+        blind = secrets.randbelow(pp.q - 1) + 1
+        add_utxo(UTXO(P=kp.P, C=commit(pp, 10, blind), v=10, r=blind, sk=kp.sk))
+
+    ins, r_total = [], 0
+    for k in range(n_in):
+        txin, r_pseudo = prove_input(pp, b"WIRE", k, 4)
+        ins.append(txin)
+        r_total = (r_total + r_pseudo) % pp.q
+    v = 10 * n_in - 1
+    out = TxOut(keygen(pp).P, commit(pp, v, r_total), range_prove_stub(v))
+    return Tx(ins=ins, outs=[out], fee=1, ctx=b"WIRE")
+
+
+def test_tx_roundtrip():
+    """Test that a decoded tx equals the original and still verifies."""
+    pp = setup()
+    tx = make_tx(pp)
+    data = encode_tx(tx)
+
+    tx2 = decode_tx(data)
+    assert tx2 == tx
+    assert tx2.ins[0].ring_enc == tx.ins[0].ring_enc
+    assert verify_tx(pp, tx2, set())
+    assert encode_tx(tx2) == data
+
+    clear_utxos()  # Clean up
+
+
+def test_tx_view_lazy_header():
+    """Test that fee and key images are readable without decoding bodies."""
+    pp = setup()
+    tx = make_tx(pp, n_in=3)
+    view = TxView(memoryview(encode_tx(tx)))
+
+    assert view.fee == tx.fee
+    assert view.ctx == tx.ctx
+    assert view.key_images == [tin.I for tin in tx.ins]
+    assert view._ins is None  # bodies untouched so far
+
+    assert view.ins[1].ring_P == tx.ins[1].ring_P
+    assert view.ins[1].sig == tx.ins[1].sig
+    assert view.outs == tx.outs
+
+    clear_utxos()  # Clean up
+
+
+def test_tx_decode_errors():
+    """Test truncated or corrupted encodings are rejected."""
+    pp = setup()
+    data = encode_tx(make_tx(pp, n_in=1))
+
+    with pytest.raises(DecodeError):
+        decode_tx(data[:-5])
+    with pytest.raises(DecodeError):
+        decode_tx(data + b"\x00")
+    with pytest.raises(DecodeError):
+        decode_tx(b"XXXX" + data[4:])
+
+    clear_utxos()  # Clean up
@@ -2,7 +2,15 @@ import pytest
 from common import setup
 from common import keygen, key_image
 from common import commit
-from monero.ring import ring_prove, ring_verify
+from common import hash_mod, to_bytes
+from monero.ring import (
+    RingSig,
+    ring_prove,
+    ring_verify,
+    ring_verify_many,
+    ring_chal,
+    ring_transcript,
+)
 import secrets
 
 
@@ -71,3 +79,74 @@ def test_ring_signature_wrong_key_image():
 
     # Should fail with wrong key image
     assert not ring_verify(pp, ctx, ring_P, ring_C, wrong_I, sig)
+
+
+def test_ring_transcript_matches_ring_chal():
+    """Test that the incremental transcript reproduces the full challenge hash."""
+    pp = setup()
+    ring_P = [keygen(pp).P for _ in range(4)]
+    ring_C = [commit(pp, 10, secrets.randbelow(pp.q - 1) + 1) for _ in range(4)]
+    I, L, R = 111, 222, 333
+
+    tr = ring_transcript(b"ctx", I, ring_P, ring_C)
+    expected = (
+        hash_mod(
+            b"LSAG",
+            b"ctx",
+            to_bytes(I),
+            b"".join(to_bytes(p) for p in ring_P),
+            b"".join(to_bytes(c) for c in ring_C),
+            to_bytes(L),
+            to_bytes(R),
+            mod=pp.q,
+        )
+        or 1
+    )
+    assert tr.challenge(to_bytes(L), to_bytes(R), mod=pp.q) == expected
+    assert ring_chal(pp, b"ctx", I, ring_P, ring_C, L, R) == expected
+
+
+def test_ring_verify_many():
+    """Test batched verification matches ring_verify per job."""
+    pp = setup()
+    jobs = []
+    for n in [1, 3, 5, 2, 4]:
+        keys = [keygen(pp) for _ in range(n)]
+        ring_P = [kp.P for kp in keys]
+        ring_C = [commit(pp, 10, secrets.randbelow(pp.q - 1) + 1) for _ in range(n)]
+        real_idx = n - 1
+        I = key_image(pp, keys[real_idx])
+        ctx = b"ctx-%d" % n
+        sig = ring_prove(pp, ctx, ring_P, ring_C, real_idx, keys[real_idx], I)
+        jobs.append((ctx, ring_P, ring_C, I, sig))
+
+    assert ring_verify_many(pp, jobs) == [True] * 5
+    assert ring_verify_many(pp, []) == []
+
+    # Tamper with one signature and one key image
+    ctx, ring_P, ring_C, I, sig = jobs[1]
+    sig.s[0] = (sig.s[0] + 1) % pp.q
+    ctx, ring_P, ring_C, I, sig = jobs[3]
+    jobs[3] = (ctx, ring_P, ring_C, I + 1, sig)
+
+    expected = [ring_verify(pp, *job) for job in jobs]
+    assert expected == [True, False, True, False, True]
+    assert ring_verify_many(pp, jobs) == expected
+
+
+def test_ring_verify_many_malformed():
+    """Test that malformed jobs are rejected without affecting the others."""
+    pp = setup()
+    keys = [keygen(pp) for _ in range(3)]
+    ring_P = [kp.P for kp in keys]
+    ring_C = [commit(pp, 10, secrets.randbelow(pp.q - 1) + 1) for _ in range(3)]
+    I = key_image(pp, keys[0])
+    sig = ring_prove(pp, b"ctx", ring_P, ring_C, 0, keys[0], I)
+
+    short = RingSig(c0=sig.c0, s=sig.s[:2])
+    jobs = [
+        (b"ctx", ring_P, ring_C, I, sig),
+        (b"ctx", ring_P, ring_C, I, short),
+        (b"ctx", [], [], I, RingSig(c0=sig.c0, s=[])),
+    ]
+    assert ring_verify_many(pp, jobs) == [True, False, False]
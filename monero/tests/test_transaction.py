@@ -1,16 +1,42 @@
 import pytest
 import secrets
-from common import setup, keygen, commit
+from dataclasses import replace
+from common import setup, keygen, commit, KeyImageStore, VerifyCache
 from monero import (
     add_utxo,
     clear_utxos,
     UTXO,
     prove_input,
+    prove_inputs,
     verify_tx,
+    verify_block,
+    new_mempool,
+    ChainState,
+    get_utxo_count,
     Tx,
     TxOut,
     range_prove_stub,
 )
+import monero.transaction as mt
+from monero.decoys import DECOYS
+from monero.ring import encode_ring
+from monero.wire import decode_tx, encode_tx
+
+
+def fund_utxos(pp, values):
+    """Add one UTXO per value, owned by a fresh key with a random blinding."""
+    for v in values:
+        kp = keygen(pp)
+        blind = secrets.randbelow(pp.q - 1) + 1
+        add_utxo(UTXO(P=kp.P, C=commit(pp, v, blind), v=v, r=blind, sk=kp.sk))
+
+
+@pytest.fixture
+def fund():
+    """fund_utxos, with the global UTXO set cleared before and after the test."""
+    clear_utxos()
+    yield fund_utxos
+    clear_utxos()
 
 
 def test_transaction_flow():
@@ -111,3 +137,181 @@ def test_transaction_invalid_balance():
     assert not verify_tx(pp, tx, set())
 
     clear_utxos()  # Clean up
+
+
+def test_txin_ring_encoding_cached(fund):
+    """Test ring encodings are shared by ring members and follow edits."""
+    pp = setup()
+    fund(pp, [5] * 4)
+
+    txin, _ = prove_input(pp, b"TEST", 1, 4)
+    enc = txin.ring_enc
+    assert enc == encode_ring(txin.ring_P, txin.ring_C)
+    assert len(enc) == 32 * 2 * len(txin.ring_P)
+    assert txin.ring_enc is enc
+
+    # Another input over the same decoys reuses the encoding
+    other, _ = prove_input(pp, b"OTHER", 2, 4)
+    assert other.ring_P == txin.ring_P and other.ring_enc is enc
+
+    # An in-place edit is re-encoded, and so reaches the wire
+    txin.ring_P[0] += 1
+    assert txin.ring_enc == encode_ring(txin.ring_P, txin.ring_C) != enc
+    tx = Tx(ins=[txin], outs=[], fee=0, ctx=b"TEST")
+    assert decode_tx(encode_tx(tx)).ins[0].ring_P == txin.ring_P
+
+
+def make_spend(pp, utxo_index, ring_size, ctx):
+    """Build a balanced single-input tx spending a 10-coin UTXO."""
+    txin, r_pseudo = prove_input(pp, ctx, utxo_index, ring_size)
+    r1 = secrets.randbelow(pp.q - 1) + 1
+    r2 = (r_pseudo - r1) % pp.q
+    outs = [
+        TxOut(keygen(pp).P, commit(pp, 4, r1), range_prove_stub(4)),
+        TxOut(keygen(pp).P, commit(pp, 5, r2), range_prove_stub(5)),
+    ]
+    return Tx(ins=[txin], outs=outs, fee=1, ctx=ctx)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_block(workers, fund):
+    """Test block verification in a process pool matches serial results."""
+    pp = setup()
+    fund(pp, [10] * 6)
+
+    txs = [make_spend(pp, i, 3, b"BLOCK") for i in range(6)]
+    txs[1].fee += 1  # unbalanced
+    spent = {txs[4].ins[0].I}
+    block = txs + [txs[0]]  # replays tx 0 inside the block
+
+    res = verify_block(pp, block, spent, workers=workers, chunksize=2)
+    assert res.results == [True, False, True, True, False, True, False]
+    assert res.results[:6] == [verify_tx(pp, tx, spent) for tx in txs]
+
+
+def test_verify_block_batches_rings_across_txs(fund, monkeypatch):
+    """Test a block's ring signatures go through one batch, mapped to txs."""
+    pp = setup()
+    fund(pp, [10] * 5)
+    txs = [make_spend(pp, i, 3, b"BATCH") for i in range(5)]
+    sig = txs[2].ins[0].sig
+    txs[2].ins[0].sig = replace(sig, c0=sig.c0 + 1)  # bad ring signature
+
+    calls = []
+    batch = mt.ring_verify_many
+
+    def spy(pp, jobs, encs=None):
+        calls.append(len(jobs))
+        return batch(pp, jobs, encs)
+
+    monkeypatch.setattr(mt, "ring_verify_many", spy)
+    res = verify_block(pp, txs, set())
+    assert res.results == [True, True, False, True, True]
+    assert calls == [5]
+
+
+def test_verify_tx_with_key_image_store(tmp_path, fund):
+    """Test that a KeyImageStore can stand in for the spent set."""
+    pp = setup()
+    fund(pp, [10] * 3)
+    tx = make_spend(pp, 0, 3, b"STORE")
+
+    with KeyImageStore(str(tmp_path)) as store:
+        assert verify_tx(pp, tx, store)
+        store.add(tx.ins[0].I)
+        assert not verify_tx(pp, tx, store)
+        assert verify_block(pp, [tx], store).results == [False]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_prove_inputs_balances_outputs(workers, fund):
+    """Test pooled proving returns inputs in order with balancing blindings."""
+    pp = setup()
+    fund(pp, [10, 20, 30, 40, 50])
+
+    spend = [4, 0, 2]
+    r1, r2 = 11, 22
+    ins, r_pseudos = prove_inputs(
+        pp, b"MULTI", spend, 3, out_blinds=[r1, r2], workers=workers, chunksize=1
+    )
+    assert sum(r_pseudos) % pp.q == (r1 + r2) % pp.q
+    for tin, idx, r in zip(ins, spend, r_pseudos):
+        assert tin.C_pseudo == commit(pp, [10, 20, 30, 40, 50][idx], r)
+
+    outs = [
+        TxOut(keygen(pp).P, commit(pp, 40, r1), range_prove_stub(40)),
+        TxOut(keygen(pp).P, commit(pp, 48, r2), range_prove_stub(48)),
+    ]
+    assert verify_tx(pp, Tx(ins=ins, outs=outs, fee=2, ctx=b"MULTI"), set())
+    assert prove_inputs(pp, b"MULTI", [], 3) == ([], [])
+
+
+def test_mempool_admits_verified_txs(fund):
+    """Test the pool takes what verify_tx accepts and follows the spent set."""
+    pp = setup()
+    fund(pp, [10] * 4)
+    txs = [make_spend(pp, i, 3, b"POOL") for i in range(4)]
+    txs[1].fee += 1  # unbalanced
+    spent = {txs[2].ins[0].I}
+
+    pool = new_mempool(pp, spent)
+    assert pool.add_many(txs) == [verify_tx(pp, tx, spent) for tx in txs]
+    assert sorted(map(id, pool.block_template())) == sorted(map(id, [txs[0], txs[3]]))
+    pool.on_block([txs[0]])
+    assert pool.block_template() == [txs[3]]
+
+
+def test_chain_state_apply_and_undo(fund):
+    """Test a block's outputs and key images go in together and come back out."""
+    pp = setup()
+    fund(pp, [10] * 4)
+    txs = [make_spend(pp, i, 3, b"CHAIN") for i in range(3)]
+
+    chain = ChainState(spent=set())
+    chain.apply_block(txs[:2], timestamp=1000.0)
+    # One decoy block per funded output, then one per applied block
+    assert get_utxo_count() == 8 and DECOYS.height == 5
+    assert not verify_tx(pp, txs[0], chain.spent)
+    with pytest.raises(ValueError):
+        chain.apply_block([txs[2], txs[1]])
+    chain.apply_block([txs[2]])
+    assert get_utxo_count() == 10 and len(DECOYS) == 10
+
+    chain.undo_blocks(2)
+    assert get_utxo_count() == 4 and len(DECOYS) == 4 and DECOYS.height == 4
+    assert chain.spent == set() and verify_tx(pp, txs[0], chain.spent)
+
+
+def test_verify_cache_from_mempool_to_block(fund):
+    """Test txs checked on pool entry skip their crypto checks in the block."""
+    pp = setup()
+    fund(pp, [10] * 4)
+    txs = [make_spend(pp, i, 3, b"CACHE") for i in range(4)]
+    txs[3].fee += 1  # unbalanced
+
+    cache = VerifyCache()
+    pool = new_mempool(pp, set(), cache=cache)
+    assert pool.add_many(txs[:3]) == [True, True, True]
+    assert cache.stats().misses == 3
+
+    res = verify_block(pp, txs, set(), cache=cache)
+    assert res.results == [True, True, True, False]
+    s = cache.stats()
+    assert (s.hits, s.misses) == (3, 4) and s.saved > 0
+    # State checks still run on a hit
+    assert not verify_tx(pp, txs[0], {txs[0].ins[0].I}, cache)
+    assert verify_tx(pp, txs[0], set(), cache) and cache.stats().hits == 4
+
+
+def test_verify_cache_keys_follow_ring_edits(fund):
+    """Test a tx edited in place after passing is checked again, not a hit."""
+    pp = setup()
+    fund(pp, [10] * 3)
+    tx = make_spend(pp, 0, 3, b"EDIT")
+    cache = VerifyCache()
+    assert verify_tx(pp, tx, set(), cache)
+
+    tx.ins[0].ring_P[0] += 1
+    assert not verify_tx(pp, tx, set())
+    assert not verify_tx(pp, tx, set(), cache)
+    assert cache.stats().hits == 0
@@ -0,0 +1,79 @@
+import pytest
+from monero.utxo import UTXO, UtxoStore
+
+
+def make_utxo(i):
+    return UTXO(P=(1 << 254) + i, C=(1 << 253) + i, v=10 * i, r=i + 1, sk=i + 2)
+
+
+def test_store_append_get():
+    """Test records round-trip through the mapping, including growth."""
+    store = UtxoStore()
+    for i in range(3000):  # crosses the initial capacity
+        assert store.append(make_utxo(i)) == i
+
+    assert len(store) == 3000
+    assert store[1234] == make_utxo(1234)
+    assert store[-1] == make_utxo(2999)
+    assert store.P(7) == make_utxo(7).P
+    assert store.C(7) == make_utxo(7).C
+    ring_P, ring_C = store.ring([3, 1])
+    assert ring_P == [make_utxo(3).P, make_utxo(1).P]
+    assert ring_C == [make_utxo(3).C, make_utxo(1).C]
+
+    with pytest.raises(IndexError):
+        store[3000]
+
+    store.clear()
+    assert len(store) == 0
+    store.close()
+
+
+def test_store_without_wallet_fields():
+    """Test that wallet-side fields are optional."""
+    store = UtxoStore(wallet=False)
+    store.append(make_utxo(5))
+    u = store[0]
+    assert (u.P, u.C) == (make_utxo(5).P, make_utxo(5).C)
+    assert (u.v, u.r, u.sk) == (0, 0, 0)
+    assert store.record_size == 64
+    store.close()
+
+
+def test_store_reopen(tmp_path):
+    """Test that a file-backed store reopens with its records and layout."""
+    path = str(tmp_path / "utxos.bin")
+    store = UtxoStore(path)
+    for i in range(10):
+        store.append(make_utxo(i))
+    store.close()
+
+    reopened = UtxoStore(path, wallet=False)  # flags come from the file
+    assert reopened.wallet
+    assert len(reopened) == 10
+    assert reopened[9] == make_utxo(9)
+    reopened.append(make_utxo(10))
+    assert len(reopened) == 11
+    reopened.close()
+
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"NOPE" + bytes(12))
+    with pytest.raises(ValueError):
+        UtxoStore(str(bad))
+
+
+def test_store_extend_truncate(tmp_path):
+    """Test batched appends and truncation, across a growth and a reopen."""
+    path = str(tmp_path / "utxo.bin")
+    store = UtxoStore(path)
+    store.append(UTXO(P=1, C=2, v=3, r=4, sk=5))
+    utxos = [UTXO(P=i, C=i + 1, v=i, r=0, sk=0) for i in range(10, 3000)]
+    assert store.extend(utxos) == 1
+    assert len(store) == 2991 and store[2990] == utxos[-1]
+    store.truncate(100)
+    assert len(store) == 100 and store[99] == utxos[98]
+    with pytest.raises(IndexError):
+        store[100]
+    assert store.extend([]) == 100
+    store.close()
+    assert len(UtxoStore(path)) == 100